@@ -8,6 +8,8 @@ from src.routers.tts_router import router as tts_router
 from src.routers.health_router import router as health_router
 from src.routers.queue_router import router as queue_router
 from src.queue import start_consumer, stop_consumer
+from src.tts.xtts.engine.inference_engine import start_engine, stop_engine
+from src.tts.xtts.engine.speaker_watcher import start_speaker_watcher, stop_speaker_watcher
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
@@ -19,14 +21,24 @@ async def lifespan(app: FastAPI):
     print(f"lifespan instance id: {id(tts_manager)}")
     print("Model loaded")
 
+    print("Starting inference engine...")
+    start_engine()
+    print("Inference engine started")
+
+    if start_speaker_watcher():
+        print("Speaker directory watcher started")
+
     print("Starting queue consumer...")
     start_consumer()
     print("Queue consumer started")
 
     yield
 
+    stop_speaker_watcher()
     print("Stopping queue consumer...")
     stop_consumer()
+    print("Stopping inference engine...")
+    stop_engine()
     print("Stopping app")
     print("App finished")
 
@@ -0,0 +1,71 @@
+"""Benchmark the in-process encoders against the previous pydub/ffmpeg path.
+
+The previous path is what `convert_audio` used to do: load the WAV with
+pydub and export it through an ffmpeg process. Both encode the same
+synthetic speech-like signal; the script reports the best time and output
+size per format. The legacy path is skipped when ffmpeg is not installed.
+
+Usage:
+    python scripts/benchmarks/encoder_benchmark.py --seconds 30 --repeat 5
+"""
+import argparse
+import io
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.audio.buffer import AudioBuffer  # noqa: E402
+from src.audio.converter import encode_audio  # noqa: E402
+from src.audio.encoders import encoder_backends  # noqa: E402
+
+from postprocess_benchmark import SAMPLE_RATE, best_of, make_speech_like  # noqa: E402
+
+FORMATS = ["mp3", "ogg", "opus", "flac"]
+
+LEGACY_EXPORT = {
+    "mp3": {"format": "mp3", "bitrate": "192k"},
+    "ogg": {"format": "ogg", "codec": "libvorbis"},
+    "opus": {"format": "opus", "codec": "libopus"},
+    "flac": {"format": "flac"},
+}
+
+
+def legacy_encode(wav_bytes: bytes, output_format: str) -> bytes:
+    """WAV -> pydub -> ffmpeg process, as `convert_audio` did before."""
+    from pydub import AudioSegment
+
+    buffer = io.BytesIO()
+    AudioSegment.from_wav(io.BytesIO(wav_bytes)).export(buffer, **LEGACY_EXPORT[output_format])
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of the test signal")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    audio = AudioBuffer(make_speech_like(args.seconds / 60), SAMPLE_RATE)
+    wav_bytes = encode_audio(audio, "wav")
+    legacy_available = shutil.which("ffmpeg") is not None
+    backends = encoder_backends()
+    print(f"Signal: {audio.duration_seconds:.1f}s at {SAMPLE_RATE} Hz")
+    if not legacy_available:
+        print("ffmpeg not found: legacy path skipped")
+
+    print(f"{'format':<6} {'encoder':<18} {'time':>10} {'size':>10} {'legacy':>10} {'size':>10} {'speedup':>8}")
+    for output_format in FORMATS:
+        size = len(encode_audio(audio, output_format))
+        elapsed = best_of(lambda: encode_audio(audio, output_format), args.repeat)
+        line = f"{output_format:<6} {backends[output_format]:<18} {elapsed * 1000:8.1f}ms {size / 1024:8.1f}KB"
+        if legacy_available:
+            legacy_size = len(legacy_encode(wav_bytes, output_format))
+            legacy_time = best_of(lambda: legacy_encode(wav_bytes, output_format), args.repeat)
+            line += f" {legacy_time * 1000:8.1f}ms {legacy_size / 1024:8.1f}KB {legacy_time / elapsed:7.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
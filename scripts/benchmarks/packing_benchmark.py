@@ -0,0 +1,147 @@
+"""Benchmark clause packing: inference calls per paragraph and wall-clock time.
+
+Each paragraph is split into clauses exactly as `AudioSynthesizer` does, then
+packed up to the language's XTTS character limit. The script always reports
+how many `model.inference` calls each paragraph needs with and without
+packing. With `--speaker`, it also loads the XTTS model configured for the
+API and times the synthesis of every paragraph both ways (same seed), so the
+wall-clock change includes the real per-call overhead of the model.
+
+Usage:
+    python scripts/benchmarks/packing_benchmark.py --lang pt
+    python scripts/benchmarks/packing_benchmark.py --lang en --speaker voices/sample.wav --repeat 2
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.tokenizer.packing import DEFAULT_CHAR_LIMIT, char_limit, pack_clauses, unpacked  # noqa: E402
+from src.tokenizer.splitter import SentenceSplitter  # noqa: E402
+
+from postprocess_benchmark import best_of  # noqa: E402
+
+PARAGRAPHS = {
+    "en": [
+        "The station opened in 1887, and for decades it was the busiest in the region. Trains left every few "
+        "minutes, carrying workers, students, and merchants to the city. When the new line arrived, however, "
+        "traffic dropped sharply; by 1960, only two trains a day stopped there.",
+        "Preheat the oven to 200 degrees. Meanwhile, peel the potatoes, cut them into thin slices, and season "
+        "them with salt, pepper, and a little olive oil. Bake for forty minutes, turning once, until golden.",
+        "Hello! Thank you for calling. Your call is important to us, so please stay on the line; an agent will "
+        "be with you shortly.",
+    ],
+    "pt": [
+        "A estação foi inaugurada em 1887 e, por décadas, foi a mais movimentada da região. Os trens partiam a "
+        "cada poucos minutos, levando operários, estudantes e comerciantes para a cidade. Com a chegada da nova "
+        "linha, porém, o movimento caiu bastante; em 1960, apenas dois trens por dia paravam ali.",
+        "Preaqueça o forno a 200 graus. Enquanto isso, descasque as batatas, corte em fatias finas e tempere "
+        "com sal, pimenta e um fio de azeite. Asse por quarenta minutos, virando uma vez, até dourar.",
+        "Olá! Obrigado por ligar. Sua ligação é importante para nós, então, por favor, aguarde na linha; um "
+        "atendente falará com você em instantes.",
+    ],
+}
+
+
+def prepare(text: str) -> str:
+    """The trailing comma `AudioSynthesizer` appends to every chunk."""
+    return text if text.endswith(",") else text + ","
+
+
+def load_model(speaker: str):
+    from src.tts.xtts.wrapper.model.model_manager import XttsModelManager
+
+    manager = XttsModelManager()
+    if not manager.load_model():
+        raise SystemExit("Could not load the XTTS model")
+    model = manager.get_model()
+    gpt_cond_latent, speaker_embedding = model.get_conditioning_latents(audio_path=[speaker])
+    return model, gpt_cond_latent, speaker_embedding
+
+
+def synthesize(model, latents, texts, lang: str, splitting: bool) -> None:
+    from src.tts.xtts.wrapper.audio.batch_inference import SentenceJob, infer_single
+
+    gpt_cond_latent, speaker_embedding = latents
+    for text in texts:
+        infer_single(model, SentenceJob(
+            text=prepare(text),
+            language=lang,
+            gpt_cond_latent=gpt_cond_latent,
+            speaker_embedding=speaker_embedding,
+            temperature=0.65,
+            length_penalty=1.0,
+            repetition_penalty=12.0,
+            top_k=35,
+            top_p=0.75,
+            do_sample=True,
+            speed=0.95,
+            enable_text_splitting=splitting,
+            seed=1234,
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lang", default="en", choices=sorted(PARAGRAPHS), help="Language of the sample paragraphs")
+    parser.add_argument("--text-file", help="Use the paragraphs of this file (blank-line separated) instead")
+    parser.add_argument("--speaker", help="Speaker WAV; loads the XTTS model and times real synthesis")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per paragraph and mode (best is reported)")
+    args = parser.parse_args()
+
+    if args.text_file:
+        text = Path(args.text_file).read_text(encoding="utf-8")
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    else:
+        paragraphs = PARAGRAPHS[args.lang]
+
+    model = latents = None
+    if args.speaker:
+        model, *latents = load_model(args.speaker)
+        limit = char_limit(model, args.lang)
+    else:
+        try:
+            from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer  # type: ignore
+
+            limit = VoiceBpeTokenizer().char_limits.get(args.lang, DEFAULT_CHAR_LIMIT)
+        except ImportError:
+            limit = DEFAULT_CHAR_LIMIT
+            print(f"TTS not installed: using the default limit of {limit} characters")
+    print(f"Language: {args.lang}, character limit: {limit}")
+
+    splitter = SentenceSplitter()
+    header = f"{'#':>2} {'chars':>6} {'calls':>6} {'packed':>7}"
+    if model is not None:
+        header += f" {'time':>9} {'packed':>9} {'speedup':>8}"
+    print(header)
+
+    total_calls = total_packed = 0
+    total_time = total_packed_time = 0.0
+    for index, paragraph in enumerate(paragraphs, 1):
+        clauses = splitter.split_clauses(paragraph, args.lang)
+        # The same budget as `AudioSynthesizer.pack_sentences`.
+        plain = unpacked(clauses, limit - 1)
+        packed = pack_clauses(clauses, limit - 1)
+        total_calls += len(plain)
+        total_packed += len(packed)
+        line = f"{index:>2} {len(paragraph):>6} {len(plain):>6} {len(packed):>7}"
+
+        if model is not None:
+            elapsed = best_of(lambda: synthesize(
+                model, latents, [chunk.text for chunk in plain], args.lang, True), args.repeat)
+            packed_elapsed = best_of(lambda: synthesize(
+                model, latents, [chunk.text for chunk in packed], args.lang, False), args.repeat)
+            total_time += elapsed
+            total_packed_time += packed_elapsed
+            line += f" {elapsed:8.2f}s {packed_elapsed:8.2f}s {elapsed / packed_elapsed:7.2f}x"
+        print(line)
+
+    count = len(paragraphs)
+    print(f"Calls per paragraph: {total_calls / count:.1f} -> {total_packed / count:.1f}")
+    if model is not None:
+        print(f"Wall-clock: {total_time:.2f}s -> {total_packed_time:.2f}s ({total_time / total_packed_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark the single-pass post-processor against the legacy chain.
+
+The legacy chain is what `AudioProcessor.apply_silences` used to run:
+librosa split + silence capping, librosa trim, a WAV round-trip and pydub
+`detect_nonsilent` edge trimming. Both run on the same synthetic speech-like
+signal (voiced bursts separated by pauses of varying length) and the script
+reports timings plus how far the outputs differ.
+
+Usage:
+    python scripts/benchmarks/postprocess_benchmark.py --minutes 3 --repeat 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.audio.postprocess import postprocess  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def make_speech_like(minutes: float, seed: int = 0) -> np.ndarray:
+    """Voiced bursts (harmonics + noise) separated by 20-600 ms pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    position = int(0.3 * SAMPLE_RATE)
+    while position < total:
+        length = int(rng.uniform(0.2, 2.5) * SAMPLE_RATE)
+        t = np.arange(min(length, total - position)) / SAMPLE_RATE
+        pitch = rng.uniform(90, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * t / max(t[-1], 1e-3)) if len(t) > 1 else np.ones_like(t)
+        burst = 0.3 * envelope * voiced + 0.01 * rng.standard_normal(len(t))
+        audio[position:position + len(t)] = burst
+        position += length + int(rng.uniform(0.02, 0.6) * SAMPLE_RATE)
+    audio += 0.0005 * rng.standard_normal(total).astype(np.float32)
+    return audio
+
+
+def legacy_postprocess(audio: np.ndarray, start_end_silence: int = 150) -> np.ndarray:
+    """The previous librosa + pydub chain, kept here as the reference."""
+    import librosa
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent
+
+    max_silence_samples = int(0.030 * SAMPLE_RATE)
+    intervals = librosa.effects.split(audio, top_db=55)
+    parts = []
+    for i, (start, end) in enumerate(intervals):
+        parts.append(audio[start:end])
+        if i < len(intervals) - 1:
+            gap = min(intervals[i + 1][0] - end, max_silence_samples)
+            parts.append(np.zeros(gap, dtype=audio.dtype))
+    capped = np.concatenate(parts) if parts else audio
+
+    trimmed = librosa.effects.trim(capped, top_db=60)[0]
+    pcm = (np.clip(trimmed, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+    segment = AudioSegment(data=pcm, sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+    ranges = detect_nonsilent(segment, min_silence_len=100, silence_thresh=-50)
+    if ranges:
+        segment = segment[ranges[0][0]:ranges[-1][1]]
+    silence = AudioSegment.silent(duration=start_end_silence, frame_rate=SAMPLE_RATE)
+    padded = silence + segment + silence
+    return np.array(padded.get_array_of_samples(), dtype=np.float32) / 32767.0
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=3.0, help="Length of the test signal")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    audio = make_speech_like(args.minutes)
+    print(f"Signal: {len(audio) / SAMPLE_RATE:.1f}s at {SAMPLE_RATE} Hz")
+
+    new = postprocess(audio, SAMPLE_RATE)
+    new_time = best_of(lambda: postprocess(audio, SAMPLE_RATE), args.repeat)
+    print(f"single-pass : {new_time * 1000:8.1f} ms")
+
+    try:
+        old = legacy_postprocess(audio)
+    except ImportError as e:
+        print(f"legacy chain skipped ({e})")
+        return
+    old_time = best_of(lambda: legacy_postprocess(audio), args.repeat)
+    print(f"legacy chain: {old_time * 1000:8.1f} ms")
+    print(f"speedup     : {old_time / new_time:8.1f}x")
+
+    length_diff_ms = (len(new) - len(old)) / SAMPLE_RATE * 1000
+    common = min(len(new), len(old))
+    rms_diff = float(np.sqrt(np.mean((new[:common] - old[:common]) ** 2)))
+    print(f"length diff : {length_diff_ms:+8.1f} ms")
+    print(f"rms diff    : {rms_diff:8.5f}")
+
+
+if __name__ == "__main__":
+    main()
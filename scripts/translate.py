@@ -28,6 +28,10 @@ import random
 import pysubs2
 
 import deepl
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.audio.accumulator import AudioAccumulator
 from xtts_webui import deepl_auth_key_textbox,deepl_api_key
 
 from pydub import AudioSegment
@@ -95,13 +99,18 @@ def local_generation(xtts, text, speaker_wav, language, output_file, options={})
 
 
 def combine_wav_files(file_list, output_filename):
-    combined = AudioSegment.empty()
+    combined = None
 
     for file in file_list:
-        sound = AudioSegment.from_wav(file)
-        combined += sound
-
-    combined.export(output_filename, format='wav')
+        sound, sample_rate = sf.read(file, dtype='float32')
+        if sound.ndim > 1:
+            sound = sound.mean(axis=1)
+        if combined is None:
+            combined = AudioAccumulator(sample_rate=sample_rate)
+        combined.append(sound)
+
+    if combined is not None:
+        sf.write(output_filename, combined.to_array(), combined.sample_rate, subtype='PCM_16')
 
 
 def removeTempFiles(file_list):
@@ -1,7 +1,7 @@
 import os
 import re
 import textwrap
-from functools import cached_property
+from functools import cached_property, lru_cache
 
 import pypinyin
 import torch
@@ -32,14 +32,20 @@ def get_spacy_lang(lang):
         return English()
 
 
+@lru_cache(maxsize=None)
+def get_sentencizer(lang):
+    """spaCy pipeline with a sentencizer for lang, built once per language."""
+    nlp = get_spacy_lang(lang)
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
 def split_sentence(text, lang, text_split_length=250):
     """Preprocess the input text"""
     text_splits = []
     if text_split_length is not None and len(text) >= text_split_length:
         text_splits.append("")
-        nlp = get_spacy_lang(lang)
-        nlp.add_pipe("sentencizer")
-        doc = nlp(text)
+        doc = get_sentencizer(lang)(text)
         for sentence in doc.sents:
             if len(text_splits[-1]) + len(str(sentence)) <= text_split_length:
                 # if the last sentence + the current sentence is less than the text_split_length
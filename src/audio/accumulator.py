@@ -0,0 +1,73 @@
+"""Linear-time stitching of audio chunks.
+
+Concatenating into a growing array inside a loop copies everything gathered so
+far on every step, which is quadratic for long texts. `AudioAccumulator`
+keeps references to the chunks and copies each sample exactly once, into one
+preallocated float32 array, when the result is requested.
+"""
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from src.audio.buffer import AudioBuffer
+
+
+@lru_cache(maxsize=64)
+def silence_block(samples: int) -> np.ndarray:
+    """A read-only float32 block of `samples` zeros, shared between callers."""
+    block = np.zeros(max(0, samples), dtype=np.float32)
+    block.setflags(write=False)
+    return block
+
+
+class AudioAccumulator:
+    """Growable mono float32 audio buffer.
+
+    Appended arrays are referenced, not copied, so they must not be modified
+    afterwards (read-only cached arrays are fine).
+    """
+
+    def __init__(self, sample_rate: int = 24000):
+        self.sample_rate = sample_rate
+        self._chunks: List[np.ndarray] = []
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def duration_seconds(self) -> float:
+        return self._length / self.sample_rate
+
+    def append(self, audio: np.ndarray) -> None:
+        """Append samples; converted to float32 only if needed."""
+        chunk = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if len(chunk):
+            self._chunks.append(chunk)
+            self._length += len(chunk)
+
+    def append_silence(self, milliseconds: Optional[float] = None, samples: Optional[int] = None) -> None:
+        """Append silence, given either in milliseconds or in samples."""
+        if samples is None:
+            samples = int((milliseconds or 0) * self.sample_rate / 1000)
+        if samples > 0:
+            self._chunks.append(silence_block(samples))
+            self._length += samples
+
+    def to_array(self) -> np.ndarray:
+        """Return all samples as one contiguous float32 array."""
+        if len(self._chunks) == 1 and self._chunks[0].flags.writeable:
+            return self._chunks[0]
+        output = np.empty(self._length, dtype=np.float32)
+        position = 0
+        for chunk in self._chunks:
+            output[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        # Later appends and calls reuse the stitched array.
+        self._chunks = [output]
+        return output
+
+    def to_buffer(self) -> AudioBuffer:
+        """Return all samples as an AudioBuffer."""
+        return AudioBuffer(self.to_array(), sample_rate=self.sample_rate)
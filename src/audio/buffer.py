@@ -0,0 +1,26 @@
+"""In-memory PCM audio passed between synthesis, post-processing and encoding."""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class AudioBuffer:
+    """Mono float32 PCM samples in [-1, 1] and their sample rate.
+
+    This is the internal audio contract: synthesis produces it, post-processing
+    works on its array, and it is encoded to a container (WAV, MP3, ...) only
+    once, at the output.
+    """
+    samples: np.ndarray
+    sample_rate: int = 24000
+
+    def __post_init__(self):
+        self.samples = np.asarray(self.samples, dtype=np.float32).reshape(-1)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / self.sample_rate
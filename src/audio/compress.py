@@ -1,10 +1,11 @@
 from src.core.application import Application
 import contextlib
 import io
-import librosa
 import soundfile as sf
 import numpy as np
 
+from src.audio.resample import resample
+
 app = Application()
 
 def compress_audio(data: bytes, audio_factor: float, sample_rate: int = 8000, bit_rate: int = 128000, subtype='ALAW') -> bytes:
@@ -13,8 +14,12 @@ def compress_audio(data: bytes, audio_factor: float, sample_rate: int = 8000, bi
     print("audio_factor: ", audio_factor, " ~ sample_rate: ", sample_rate, " ~ bit_rate: ", bit_rate, " ~ subtype: ", subtype)
     app.logger.info(f"\n\nCompressing wav data with audio factor {audio_factor}")
 
-    # Carregar o áudio
-    audio_data, sr = librosa.load(io.BytesIO(data), sr=sample_rate, mono=True)
+    # Carregar o áudio e reamostrar com o resampler polifásico (kernel em cache)
+    audio_data, source_rate = sf.read(io.BytesIO(data), dtype='float32')
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1)
+    audio_data = resample(audio_data, source_rate, sample_rate)
+    sr = sample_rate
 
     # Calcular o volume atual do áudio
     max_val = np.max(np.abs(audio_data))
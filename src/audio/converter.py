@@ -1,11 +1,16 @@
 """Audio format converter utilities."""
 import io
-from typing import Literal
-from pydub import AudioSegment
+from typing import Literal, Optional
 
-AudioFormat = Literal["wav", "mp3", "ogg", "flac"]
+import soundfile as sf
 
-SUPPORTED_FORMATS = ["wav", "mp3", "ogg", "flac"]
+from src.audio.buffer import AudioBuffer
+from src.audio.encoders import get_encoder
+from src.audio.profiles import get_profile
+
+AudioFormat = Literal["wav", "mp3", "ogg", "opus", "flac"]
+
+SUPPORTED_FORMATS = ["wav", "mp3", "ogg", "opus", "flac"]
 
 
 def convert_audio(
@@ -17,7 +22,7 @@ def convert_audio(
 
     Args:
         audio_bytes: Input audio as WAV bytes
-        output_format: Target format (wav, mp3, ogg, flac)
+        output_format: Target format (wav, mp3, ogg, opus, flac)
         sample_rate: Sample rate of the input audio
 
     Returns:
@@ -26,21 +31,38 @@ def convert_audio(
     if output_format == "wav":
         return audio_bytes
 
-    audio = AudioSegment.from_wav(io.BytesIO(audio_bytes))
+    pcm, rate = sf.read(io.BytesIO(audio_bytes), dtype="int16")
+    if pcm.ndim > 1:
+        pcm = pcm.mean(axis=1).astype("int16")
+    return get_encoder(output_format).encode(pcm, rate or sample_rate)
+
+
+def encode_audio(
+    audio: AudioBuffer,
+    output_format: AudioFormat = "wav",
+    profile: Optional[str] = None
+) -> bytes:
+    """Encode float32 PCM audio to the specified format.
 
-    buffer = io.BytesIO()
+    This is the single encoding step of the synthesis pipeline: samples are
+    quantized to 16-bit once and written straight to the target container by
+    an in-process encoder (see `src.audio.encoders`), without decoding an
+    intermediate WAV.
 
-    export_params = {}
-    if output_format == "mp3":
-        export_params = {"format": "mp3", "bitrate": "192k"}
-    elif output_format == "ogg":
-        export_params = {"format": "ogg", "codec": "libvorbis"}
-    elif output_format == "flac":
-        export_params = {"format": "flac"}
+    Args:
+        audio: PCM audio to encode
+        output_format: Target format (wav, mp3, ogg, opus, flac)
+        profile: Optional output profile name (see `src.audio.profiles`)
 
-    audio.export(buffer, **export_params)
-    buffer.seek(0)
-    return buffer.read()
+    Returns:
+        Encoded audio bytes
+    """
+    output_profile = get_profile(profile, output_format)
+    companding = None
+    if output_profile is not None:
+        audio = output_profile.apply(audio)
+        companding = output_profile.companding
+    return get_encoder(output_format, companding).encode_float(audio.samples, audio.sample_rate)
 
 
 def get_mime_type(audio_format: AudioFormat) -> str:
@@ -49,6 +71,7 @@ def get_mime_type(audio_format: AudioFormat) -> str:
         "wav": "audio/wav",
         "mp3": "audio/mpeg",
         "ogg": "audio/ogg",
+        "opus": "audio/ogg",
         "flac": "audio/flac"
     }
     return mime_types.get(audio_format, "audio/wav")
@@ -0,0 +1,346 @@
+"""Audio encoders for the output formats.
+
+WAV is written with the standard library. FLAC, OGG (Vorbis), Opus and MP3
+are encoded in-process by libsndfile through soundfile: no process spawn and
+no intermediate WAV, just 16-bit PCM into the target container. MP3 needs
+libsndfile >= 1.1 and Opus >= 1.0.29; when the installed library lacks one of
+them, that format falls back to an ffmpeg process fed raw PCM over a pipe,
+with at most `FFMPEG_MAX_PROCESSES` of them running at once.
+
+G.711 (A-law / μ-law) audio of the telephony output profiles is companded
+with numpy lookup tables and written as WAV.
+
+Stream encoders (`get_stream_encoder`) encode audio chunk by chunk as
+sentences finish and return the container bytes (WAV data, Ogg pages, MP3
+frames) as soon as the encoder produces them.
+"""
+import io
+import shutil
+import subprocess
+import threading
+import wave
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from src.audio.g711 import Companding, encode_g711, g711_wav_header
+from src.audio.profiles import OutputProfile
+from src.audio.resample import resample
+from src.audio.streaming import float_to_pcm16, wav_stream_header
+
+# Concurrent ffmpeg processes allowed for fallback encoding.
+FFMPEG_MAX_PROCESSES = 2
+
+
+class AudioEncoder(ABC):
+    """Encodes mono 16-bit PCM into one container format."""
+
+    format: str
+
+    @abstractmethod
+    def encode(self, pcm: np.ndarray, sample_rate: int) -> bytes:
+        """Encode int16 samples."""
+
+    def encode_float(self, samples: np.ndarray, sample_rate: int) -> bytes:
+        """Encode float32 samples in [-1, 1]."""
+        return self.encode(np.frombuffer(float_to_pcm16(samples), dtype=np.int16), sample_rate)
+
+
+class WavEncoder(AudioEncoder):
+    """16-bit PCM WAV."""
+
+    format = "wav"
+
+    def encode(self, pcm: np.ndarray, sample_rate: int) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+
+class G711WavEncoder(AudioEncoder):
+    """8-bit G.711 A-law or μ-law WAV."""
+
+    format = "wav"
+
+    def __init__(self, companding: Companding):
+        self.companding = companding
+
+    def encode(self, pcm: np.ndarray, sample_rate: int) -> bytes:
+        data = encode_g711(pcm, self.companding)
+        padding = b"\x00" if len(data) % 2 else b""
+        return g711_wav_header(sample_rate, self.companding, len(data)) + data + padding
+
+
+class SoundFileEncoder(AudioEncoder):
+    """In-process encoder backed by libsndfile."""
+
+    def __init__(self, format: str, sf_format: str, subtype: str, **options):
+        self.format = format
+        self.sf_format = sf_format
+        self.subtype = subtype
+        self.options = options
+
+    @property
+    def available(self) -> bool:
+        """Whether the installed libsndfile can write this format."""
+        return sf.check_format(self.sf_format, self.subtype)
+
+    def encode(self, pcm: np.ndarray, sample_rate: int) -> bytes:
+        buffer = io.BytesIO()
+        sf.write(buffer, pcm, sample_rate, format=self.sf_format, subtype=self.subtype, **self.options)
+        return buffer.getvalue()
+
+    def open_stream(self, sample_rate: int) -> "SoundFileStreamEncoder":
+        """Start an incremental encoding."""
+        return SoundFileStreamEncoder(self, sample_rate)
+
+
+class FfmpegEncoder(AudioEncoder):
+    """Fallback encoder: one ffmpeg process per call, reading raw PCM from stdin."""
+
+    _slots = threading.BoundedSemaphore(FFMPEG_MAX_PROCESSES)
+
+    def __init__(self, format: str, arguments: List[str]):
+        self.format = format
+        self.arguments = arguments
+
+    @property
+    def available(self) -> bool:
+        return shutil.which("ffmpeg") is not None
+
+    def encode(self, pcm: np.ndarray, sample_rate: int) -> bytes:
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+            *self.arguments, "pipe:1",
+        ]
+        with self._slots:
+            result = subprocess.run(command, input=pcm.tobytes(), capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to encode {self.format}: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+
+class StreamEncoder(ABC):
+    """Incremental encoder: feed float32 chunks, get container bytes back."""
+
+    @abstractmethod
+    def write(self, samples: np.ndarray) -> bytes:
+        """Encode a chunk; returns the bytes ready so far (may be empty)."""
+
+    @abstractmethod
+    def close(self) -> bytes:
+        """Flush the encoder and return the remaining bytes."""
+
+
+class PcmStreamEncoder(StreamEncoder):
+    """Raw 16-bit little-endian PCM."""
+
+    def write(self, samples: np.ndarray) -> bytes:
+        return float_to_pcm16(samples)
+
+    def close(self) -> bytes:
+        return b""
+
+
+class WavStreamEncoder(PcmStreamEncoder):
+    """16-bit WAV whose header announces an unknown length."""
+
+    def __init__(self, sample_rate: int):
+        self._header: Optional[bytes] = wav_stream_header(sample_rate=sample_rate)
+
+    def write(self, samples: np.ndarray) -> bytes:
+        header, self._header = self._header or b"", None
+        return header + float_to_pcm16(samples)
+
+    def close(self) -> bytes:
+        header, self._header = self._header or b"", None
+        return header
+
+
+class G711StreamEncoder(StreamEncoder):
+    """G.711 samples, raw or behind a WAV header announcing an unknown length."""
+
+    def __init__(self, companding: Companding, sample_rate: int, wav_header: bool):
+        self.companding = companding
+        self._header: Optional[bytes] = g711_wav_header(sample_rate, companding) if wav_header else None
+
+    def write(self, samples: np.ndarray) -> bytes:
+        header, self._header = self._header or b"", None
+        return header + encode_g711(np.frombuffer(float_to_pcm16(samples), dtype=np.int16), self.companding)
+
+    def close(self) -> bytes:
+        header, self._header = self._header or b"", None
+        return header
+
+
+class ResamplingStreamEncoder(StreamEncoder):
+    """Resamples each chunk before handing it to another stream encoder.
+
+    Streamed chunks are whole sentences ending in their pause, so resampling
+    them one by one leaves no audible seams.
+    """
+
+    def __init__(self, encoder: StreamEncoder, source_rate: int, target_rate: int):
+        self._encoder = encoder
+        self._source_rate = source_rate
+        self._target_rate = target_rate
+
+    def write(self, samples: np.ndarray) -> bytes:
+        return self._encoder.write(resample(samples, self._source_rate, self._target_rate))
+
+    def close(self) -> bytes:
+        return self._encoder.close()
+
+
+class _ForwardSink:
+    """Write target for libsndfile that hands bytes out as soon as they are written.
+
+    Encoders seek back on close to patch headers (e.g. the MP3 Info frame);
+    bytes already handed out cannot change any more, so such rewrites are
+    dropped. Streams are read until their end, so the stale fields do not
+    matter to players.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+        self._drained = 0
+        self._position = 0
+        self._length = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        start = max(self._position, self._drained)
+        if start < self._position + len(data):
+            kept = data[start - self._position:]
+            offset = start - self._drained
+            if offset > len(self._pending):
+                # Seeked past the end: the gap reads as zeros, as in a file.
+                self._pending.extend(bytes(offset - len(self._pending)))
+            self._pending[offset:offset + len(kept)] = kept
+        self._position += len(data)
+        self._length = max(self._length, self._position)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._length
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        return b""
+
+    def drain(self) -> bytes:
+        data = bytes(self._pending)
+        self._pending.clear()
+        self._drained += len(data)
+        return data
+
+
+class SoundFileStreamEncoder(StreamEncoder):
+    """Incremental libsndfile encoding (Ogg pages, MP3 frames)."""
+
+    def __init__(self, encoder: SoundFileEncoder, sample_rate: int):
+        self._sink = _ForwardSink()
+        self._file = sf.SoundFile(
+            self._sink, "w", sample_rate, 1, encoder.subtype, format=encoder.sf_format, **encoder.options
+        )
+
+    def write(self, samples: np.ndarray) -> bytes:
+        self._file.write(np.frombuffer(float_to_pcm16(samples), dtype=np.int16))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._file.close()
+        return self._sink.drain()
+
+
+_IN_PROCESS: List[SoundFileEncoder] = [
+    SoundFileEncoder("flac", "FLAC", "PCM_16"),
+    SoundFileEncoder("ogg", "OGG", "VORBIS"),
+    SoundFileEncoder("opus", "OGG", "OPUS"),
+    # CBR at the highest bitrate the sample rate allows (160 kbps at 24 kHz).
+    SoundFileEncoder("mp3", "MP3", "MPEG_LAYER_III", bitrate_mode="CONSTANT", compression_level=0.0),
+]
+
+_FALLBACKS: Dict[str, FfmpegEncoder] = {
+    "flac": FfmpegEncoder("flac", ["-f", "flac"]),
+    "ogg": FfmpegEncoder("ogg", ["-c:a", "libvorbis", "-f", "ogg"]),
+    "opus": FfmpegEncoder("opus", ["-c:a", "libopus", "-f", "ogg"]),
+    "mp3": FfmpegEncoder("mp3", ["-c:a", "libmp3lame", "-b:a", "160k", "-f", "mp3"]),
+}
+
+_encoders: Optional[Dict[str, AudioEncoder]] = None
+_encoders_lock = threading.Lock()
+
+
+def _build_encoders() -> Dict[str, AudioEncoder]:
+    encoders: Dict[str, AudioEncoder] = {"wav": WavEncoder()}
+    for encoder in _IN_PROCESS:
+        encoders[encoder.format] = encoder if encoder.available else _FALLBACKS[encoder.format]
+    return encoders
+
+
+def get_encoder(output_format: str, companding: Optional[Companding] = None) -> AudioEncoder:
+    """Encoder for a format, G.711-companded if asked; raises ValueError for unknown formats."""
+    global _encoders
+    if companding is not None:
+        if output_format != "wav":
+            raise ValueError(f"G.711 audio is only available as wav, not {output_format}")
+        return G711WavEncoder(companding)
+    if _encoders is None:
+        with _encoders_lock:
+            if _encoders is None:
+                _encoders = _build_encoders()
+    encoder = _encoders.get(output_format)
+    if encoder is None:
+        raise ValueError(f"Unsupported audio format: {output_format}")
+    return encoder
+
+
+def get_stream_encoder(
+    stream_format: str,
+    sample_rate: int = 24000,
+    profile: Optional[OutputProfile] = None
+) -> StreamEncoder:
+    """Incremental encoder for a streaming format; raises ValueError if unavailable.
+
+    Chunks are fed at `sample_rate`; with `profile` they are converted to the
+    profile's rate and encoding. Compressed formats stream only when
+    libsndfile encodes them in-process.
+    """
+    if profile is not None:
+        if not profile.supports(stream_format):
+            raise ValueError(f"Output profile {profile.name} is not available as {stream_format}")
+        if profile.sample_rate != sample_rate:
+            inner = get_stream_encoder(stream_format, profile.sample_rate, profile)
+            return ResamplingStreamEncoder(inner, sample_rate, profile.sample_rate)
+        if profile.companding is not None:
+            return G711StreamEncoder(profile.companding, sample_rate, wav_header=stream_format == "wav")
+
+    if stream_format == "pcm":
+        return PcmStreamEncoder()
+    if stream_format == "wav":
+        return WavStreamEncoder(sample_rate)
+    encoder = get_encoder(stream_format)
+    if not isinstance(encoder, SoundFileEncoder):
+        raise ValueError(f"Streaming {stream_format} is not supported by the installed libsndfile")
+    return encoder.open_stream(sample_rate)
+
+
+def encoder_backends() -> Dict[str, str]:
+    """Which implementation encodes each format (for diagnostics)."""
+    get_encoder("wav")
+    return {name: type(encoder).__name__ for name, encoder in _encoders.items()}
@@ -0,0 +1,80 @@
+"""G.711 A-law / μ-law companding with numpy lookup tables.
+
+Each law is a 65536-entry table indexed by the 16-bit sample, built once
+from the reference (Sun g711.c) segment algorithm, so encoding a buffer is
+a single vectorized lookup.
+"""
+import struct
+from functools import lru_cache
+from typing import Literal, Optional
+
+import numpy as np
+
+Companding = Literal["alaw", "ulaw"]
+
+_ALAW_SEGMENT_ENDS = np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+_ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159
+
+# WAVE format tags.
+_FORMAT_TAGS = {"alaw": 6, "ulaw": 7}
+# Placeholder used for RIFF/data sizes when the total length is unknown.
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def _alaw_table() -> np.ndarray:
+    value = np.arange(-32768, 32768, dtype=np.int32) >> 3
+    mask = np.where(value >= 0, 0xD5, 0x55)
+    value = np.where(value >= 0, value, -value - 1)
+    segment = np.searchsorted(_ALAW_SEGMENT_ENDS, value)
+    shift = np.where(segment < 2, 1, segment)
+    code = (np.minimum(segment, 7) << 4) | ((value >> shift) & 0x0F)
+    code = np.where(segment >= 8, 0x7F, code)
+    return (code ^ mask).astype(np.uint8)
+
+
+def _ulaw_table() -> np.ndarray:
+    value = np.arange(-32768, 32768, dtype=np.int32) >> 2
+    mask = np.where(value < 0, 0x7F, 0xFF)
+    value = np.minimum(np.abs(value), _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+    segment = np.searchsorted(_ULAW_SEGMENT_ENDS, value)
+    code = (np.minimum(segment, 7) << 4) | ((value >> (segment + 1)) & 0x0F)
+    code = np.where(segment >= 8, 0x7F, code)
+    return (code ^ mask).astype(np.uint8)
+
+
+@lru_cache(maxsize=2)
+def _table(companding: Companding) -> np.ndarray:
+    if companding == "alaw":
+        table = _alaw_table()
+    elif companding == "ulaw":
+        table = _ulaw_table()
+    else:
+        raise ValueError(f"Unknown G.711 law: {companding}")
+    table.setflags(write=False)
+    return table
+
+
+def encode_g711(pcm: np.ndarray, companding: Companding) -> bytes:
+    """Compand int16 samples to 8-bit G.711 codes."""
+    indices = np.asarray(pcm, dtype=np.int16).astype(np.int32) + 32768
+    return _table(companding)[indices].tobytes()
+
+
+def g711_wav_header(sample_rate: int, companding: Companding, frames: Optional[int] = None) -> bytes:
+    """WAV header for mono G.711 data of `frames` samples (unknown length when None)."""
+    if companding not in _FORMAT_TAGS:
+        raise ValueError(f"Unknown G.711 law: {companding}")
+    # Non-PCM formats carry a cbSize field and a fact chunk with the sample count.
+    fmt = struct.pack("<HHIIHHH", _FORMAT_TAGS[companding], 1, sample_rate, sample_rate, 1, 8, 0)
+    fact = struct.pack("<I", frames if frames is not None else _UNKNOWN_SIZE)
+    data_size = frames if frames is not None else _UNKNOWN_SIZE
+    # The data chunk is padded to an even size.
+    riff_size = _UNKNOWN_SIZE if frames is None else 4 + (8 + len(fmt)) + (8 + len(fact)) + 8 + frames + frames % 2
+    return (
+        b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"fact" + struct.pack("<I", len(fact)) + fact
+        + b"data" + struct.pack("<I", data_size)
+    )
@@ -0,0 +1,191 @@
+"""Single-pass NumPy post-processing of synthesized speech.
+
+Replaces the chain of `librosa.effects.split`, `librosa.effects.trim` and
+pydub's `detect_nonsilent` used by `AudioProcessor`. One cumulative sum of the
+squared samples gives every energy those steps need:
+
+- frame RMS with librosa's framing (centered, zero padded), to find the
+  non-silent intervals and cap the silent gaps between them;
+- 1 ms-grid window RMS of the capped signal, to trim its edges with pydub's
+  rule (100 ms windows under -50 dBFS).
+
+The capped, trimmed and padded result is written into one preallocated array.
+"""
+from typing import Callable, Tuple
+
+import numpy as np
+
+EnergyFn = Callable[[np.ndarray], np.ndarray]
+
+
+def postprocess(
+    audio: np.ndarray,
+    sample_rate: int = 24000,
+    start_end_silence: int = 150,
+    max_silence_duration: int = 30,
+    silence_db_threshold: float = 55.0,
+    frame_length: int = 2048,
+    hop_length: int = 512,
+    edge_min_silence_len: int = 100,
+    edge_silence_thresh: float = -50.0,
+) -> np.ndarray:
+    """Cap internal silences, trim the edges and pad with silence.
+
+    Args:
+        audio: Mono float audio; never modified
+        sample_rate: Sample rate of audio
+        start_end_silence: Silence added at the start and end (ms)
+        max_silence_duration: Longest silent gap kept between non-silent intervals (ms)
+        silence_db_threshold: Frames this far below the loudest frame are silent (dB)
+        frame_length: Frame length of the RMS used to find non-silent intervals
+        hop_length: Hop length of the RMS used to find non-silent intervals
+        edge_min_silence_len: Window of the edge trim (ms)
+        edge_silence_thresh: Silence threshold of the edge trim (dBFS)
+
+    Returns:
+        A new float32 array
+    """
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if len(audio) == 0:
+        raise ValueError("Audio data is empty or None")
+
+    energy = np.empty(len(audio) + 1, dtype=np.float64)
+    energy[0] = 0.0
+    np.cumsum(np.square(audio, dtype=np.float64), out=energy[1:])
+
+    segments = nonsilent_intervals(energy, silence_db_threshold, frame_length, hop_length)
+    if len(segments) == 0:
+        segments = np.array([[0, len(audio)]])
+
+    # Layout of the capped signal: segments separated by gaps of at most max_gap zeros.
+    max_gap = int((max_silence_duration / 1000) * sample_rate)
+    lengths = segments[:, 1] - segments[:, 0]
+    gaps = np.minimum(segments[1:, 0] - segments[:-1, 1], max_gap)
+    out_starts = np.concatenate(([0], np.cumsum(lengths[:-1] + gaps)))
+    total = int(out_starts[-1] + lengths[-1])
+
+    start, end = nonsilent_bounds(
+        _capped_energy(energy, segments, out_starts, lengths),
+        total,
+        sample_rate,
+        edge_min_silence_len,
+        edge_silence_thresh,
+    )
+
+    pad = int(start_end_silence * sample_rate / 1000)
+    output = np.zeros(end - start + 2 * pad, dtype=np.float32)
+    for (src_start, _), out_start, length in zip(segments, out_starts, lengths):
+        lo = max(out_start, start)
+        hi = min(out_start + length, end)
+        if lo < hi:
+            output[pad + lo - start:pad + hi - start] = (
+                audio[src_start + lo - out_start:src_start + hi - out_start]
+            )
+    return output
+
+
+def nonsilent_intervals(
+    energy: np.ndarray,
+    top_db: float = 55.0,
+    frame_length: int = 2048,
+    hop_length: int = 512,
+) -> np.ndarray:
+    """Non-silent sample intervals, as `librosa.effects.split` computes them.
+
+    Args:
+        energy: Cumulative sum of squared samples, with a leading 0
+        top_db: Frames this far below the loudest frame are silent (dB)
+
+    Returns:
+        Array of shape (n, 2) with [start, end) sample indices
+    """
+    length = len(energy) - 1
+    centers = np.arange(1 + length // hop_length) * hop_length
+    lo = np.clip(centers - frame_length // 2, 0, length)
+    hi = np.clip(centers + frame_length // 2, 0, length)
+    power = np.maximum(energy[hi] - energy[lo], 0.0) / frame_length
+
+    amin = 1e-20
+    db = 10.0 * np.log10(np.maximum(power, amin)) - 10.0 * np.log10(max(power.max(), amin))
+    non_silent = db > -top_db
+
+    edges = np.flatnonzero(np.diff(non_silent.astype(np.int8))) + 1
+    if non_silent[0]:
+        edges = np.concatenate(([0], edges))
+    if non_silent[-1]:
+        edges = np.concatenate((edges, [len(non_silent)]))
+    return np.minimum(edges * hop_length, length).reshape(-1, 2)
+
+
+def nonsilent_bounds(
+    energy_at: EnergyFn,
+    length: int,
+    sample_rate: int = 24000,
+    min_silence_len: int = 100,
+    silence_thresh: float = -50.0,
+) -> Tuple[int, int]:
+    """Sample bounds of the first to last non-silent region.
+
+    Mirrors `pydub.silence.detect_nonsilent(min_silence_len, silence_thresh)` at
+    1 ms resolution: a window is silent when the integer RMS of its 16-bit
+    samples is at or below the threshold, and silent windows closer than
+    `min_silence_len` merge into one range.
+
+    Args:
+        energy_at: Cumulative energy of the signal at the given sample positions
+        length: Signal length in samples
+    """
+    samples_per_ms = sample_rate // 1000
+    length_ms = length // samples_per_ms if samples_per_ms else 0
+    if length_ms < min_silence_len:
+        return 0, length
+
+    cumulative = energy_at(np.arange(length_ms + 1) * samples_per_ms)
+    window_energy = cumulative[min_silence_len:] - cumulative[:-min_silence_len]
+    threshold_rms = (np.floor(10 ** (silence_thresh / 20) * 32768) + 1) / 32767
+    threshold = threshold_rms ** 2 * min_silence_len * samples_per_ms
+    silence_starts = np.flatnonzero(window_energy < threshold)
+    if len(silence_starts) == 0:
+        return 0, length
+
+    gaps = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    first_end = (silence_starts[gaps[0]] if len(gaps) else silence_starts[-1]) + min_silence_len
+    last_start = silence_starts[gaps[-1] + 1] if len(gaps) else silence_starts[0]
+    last_end = silence_starts[-1] + min_silence_len
+
+    if silence_starts[0] == 0 and not len(gaps) and last_end >= length_ms:
+        # Everything is silent: nothing to trim against
+        return 0, length
+
+    start = first_end * samples_per_ms if silence_starts[0] == 0 else 0
+    end = last_start * samples_per_ms if last_end >= length_ms else length
+    return int(start), int(end)
+
+
+def signal_energy(audio: np.ndarray) -> EnergyFn:
+    """Cumulative-energy function of a plain signal, for `nonsilent_bounds`."""
+    energy = np.concatenate(([0.0], np.cumsum(np.square(audio, dtype=np.float64))))
+    return lambda positions: energy[positions]
+
+
+def _capped_energy(
+    energy: np.ndarray,
+    segments: np.ndarray,
+    out_starts: np.ndarray,
+    lengths: np.ndarray,
+) -> EnergyFn:
+    """Cumulative energy of the capped signal, derived from the source's.
+
+    Gaps are zeros, so the capped signal's energy up to a position is the
+    energy of the segments before it plus the covered part of its own segment.
+    """
+    segment_energy = energy[segments[:, 1]] - energy[segments[:, 0]]
+    before = np.concatenate(([0.0], np.cumsum(segment_energy)))
+
+    def energy_at(positions: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(out_starts, positions, side="right") - 1
+        covered = np.minimum(positions - out_starts[index], lengths[index])
+        source_start = segments[index, 0]
+        return before[index] + energy[source_start + covered] - energy[source_start]
+
+    return energy_at
@@ -0,0 +1,63 @@
+"""Output profiles: target sample rate and sample encoding of the delivered audio.
+
+The model always synthesizes 24 kHz float32 audio. A profile resamples it
+(polyphase, see `src.audio.resample`) and, for telephony, compands it to
+8-bit G.711, which is only delivered as WAV or raw (`pcm`) samples.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.audio.buffer import AudioBuffer
+from src.audio.g711 import Companding
+from src.audio.resample import resample
+
+_OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """Sample rate and encoding applied to synthesized audio before encoding."""
+
+    name: str
+    sample_rate: int
+    companding: Optional[Companding] = None
+    description: str = ""
+
+    def supports(self, output_format: str) -> bool:
+        """G.711 profiles only fit WAV or raw samples; Opus only takes its own rates."""
+        if self.companding is not None:
+            return output_format in ("wav", "pcm")
+        return output_format != "opus" or self.sample_rate in _OPUS_RATES
+
+    def apply(self, audio: AudioBuffer) -> AudioBuffer:
+        """Resample audio to the profile's rate."""
+        if audio.sample_rate == self.sample_rate:
+            return audio
+        return AudioBuffer(resample(audio.samples, audio.sample_rate, self.sample_rate), self.sample_rate)
+
+
+PROFILES: Dict[str, OutputProfile] = {
+    profile.name: profile
+    for profile in (
+        OutputProfile("telephony-8k-alaw", 8000, "alaw", "8 kHz G.711 A-law (European telephony)"),
+        OutputProfile("telephony-8k-ulaw", 8000, "ulaw", "8 kHz G.711 μ-law (North American telephony)"),
+        OutputProfile("wideband-16k", 16000, None, "16 kHz wideband (HD voice, speech recognition)"),
+        OutputProfile("22.05k", 22050, None, "22.05 kHz"),
+        OutputProfile("48k", 48000, None, "48 kHz (video, broadcast)"),
+    )
+}
+
+
+def get_profile(name: Optional[str], output_format: Optional[str] = None) -> Optional[OutputProfile]:
+    """Look up a profile; None for no profile.
+
+    Raises ValueError for an unknown profile or one that does not fit `output_format`.
+    """
+    if not name:
+        return None
+    profile = PROFILES.get(name)
+    if profile is None:
+        raise ValueError(f"Unknown output profile: {name}. Available: {list(PROFILES)}")
+    if output_format is not None and not profile.supports(output_format):
+        raise ValueError(f"Output profile {name} is not available as {output_format}")
+    return profile
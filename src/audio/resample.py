@@ -0,0 +1,38 @@
+"""Polyphase sample-rate conversion with cached filter kernels.
+
+`scipy.signal.resample_poly` designs its anti-aliasing FIR filter on every
+call; for 24 kHz -> 22.05 kHz that is a 3201-tap Kaiser window. The kernel
+depends only on the reduced up/down factors, so it is designed once per rate
+pair and reused.
+"""
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+from scipy.signal import firwin, resample_poly
+
+
+def rate_factors(source_rate: int, target_rate: int) -> Tuple[int, int]:
+    """Reduced (up, down) factors converting source_rate to target_rate."""
+    divisor = gcd(source_rate, target_rate)
+    return target_rate // divisor, source_rate // divisor
+
+
+@lru_cache(maxsize=32)
+def _kernel(up: int, down: int) -> np.ndarray:
+    """Low-pass FIR kernel; same design as resample_poly's default."""
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    kernel = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample mono float32 audio; returns the input unchanged if the rates match."""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    up, down = rate_factors(source_rate, target_rate)
+    output = resample_poly(np.asarray(samples, dtype=np.float32), up, down, window=_kernel(up, down))
+    return output.astype(np.float32, copy=False)
@@ -0,0 +1,56 @@
+"""Helpers for streaming audio in chunks.
+
+Raw PCM and WAV are produced here; compressed stream formats are encoded
+incrementally by `src.audio.encoders.get_stream_encoder`.
+"""
+import struct
+from typing import Literal, Optional
+
+import numpy as np
+
+StreamFormat = Literal["wav", "pcm", "mp3", "ogg", "opus"]
+
+STREAM_FORMATS = ["wav", "pcm", "mp3", "ogg", "opus"]
+
+# Placeholder used for RIFF/data sizes when the total length is unknown.
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def wav_stream_header(sample_rate: int = 24000, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Build a WAV header for a stream whose final length is unknown.
+
+    The RIFF and data chunk sizes are set to 0xFFFFFFFF, which players and
+    ffmpeg interpret as "read until end of stream".
+    """
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF"
+        + struct.pack("<I", _UNKNOWN_SIZE)
+        + b"WAVE"
+        + b"fmt "
+        + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data"
+        + struct.pack("<I", _UNKNOWN_SIZE)
+    )
+
+
+def float_to_pcm16(audio: np.ndarray) -> bytes:
+    """Convert float audio in [-1, 1] to little-endian 16-bit PCM bytes."""
+    clipped = np.clip(audio, -1.0, 1.0)
+    return (clipped * 32767.0).astype("<i2").tobytes()
+
+
+def get_stream_mime_type(stream_format: StreamFormat, sample_rate: int = 24000, companding: Optional[str] = None) -> str:
+    """Get MIME type for a streaming format (`companding`: G.711 law of raw samples)."""
+    if stream_format == "pcm":
+        if companding == "alaw":
+            return f"audio/PCMA; rate={sample_rate}; channels=1"
+        if companding == "ulaw":
+            return f"audio/PCMU; rate={sample_rate}; channels=1"
+        return f"audio/pcm; rate={sample_rate}; channels=1"
+    if stream_format == "mp3":
+        return "audio/mpeg"
+    if stream_format in ("ogg", "opus"):
+        return "audio/ogg"
+    return "audio/wav"
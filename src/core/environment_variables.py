@@ -18,4 +18,33 @@ environment_variables = SimpleNamespace(**{
     "SAMPLE_SPEAKERS_FOLDER": config("SAMPLE_SPEAKERS_FOLDER", default="speakers_audios/"),
     "VOCAB_FILE": config("VOCAB_FILE", default="vocab.json"),
     "CONFIG_FILE": config("CONFIG_FILE", default="config.json"),
+    "INFERENCE_MAX_WORKERS": config("INFERENCE_MAX_WORKERS", cast=int, default=1),
+    "INFERENCE_MAX_PENDING": config("INFERENCE_MAX_PENDING", cast=int, default=16),
+    "INFERENCE_MAX_BATCH_SIZE": config("INFERENCE_MAX_BATCH_SIZE", cast=int, default=1),
+    "INFERENCE_MAX_WAIT_MS": config("INFERENCE_MAX_WAIT_MS", cast=float, default=20.0),
+    "SYNTHESIS_COALESCING": config("SYNTHESIS_COALESCING", cast=bool, default=True),
+    "SENTENCE_CACHE_MEMORY_MB": config("SENTENCE_CACHE_MEMORY_MB", cast=float, default=64.0),
+    "SENTENCE_CACHE_DISK_MB": config("SENTENCE_CACHE_DISK_MB", cast=float, default=0.0),
+    "SENTENCE_CACHE_DIR": config("SENTENCE_CACHE_DIR", default=""),
+    "SPEAKER_LATENT_STORE": config("SPEAKER_LATENT_STORE", cast=bool, default=True),
+    "SPEAKER_LATENT_DIR": config("SPEAKER_LATENT_DIR", default=""),
+    "SPEAKER_RESIDENCY": config("SPEAKER_RESIDENCY", default="default"),
+    "SPEAKER_RESIDENT_MAX": config("SPEAKER_RESIDENT_MAX", cast=int, default=0),
+    "SPEAKER_RESIDENT_MB": config("SPEAKER_RESIDENT_MB", cast=float, default=0.0),
+    "SPEAKER_PINNED": config("SPEAKER_PINNED", default=""),
+    "SPEAKER_LOAD_WORKERS": config("SPEAKER_LOAD_WORKERS", cast=int, default=0),
+    "SPEAKER_WATCH_INTERVAL": config("SPEAKER_WATCH_INTERVAL", cast=float, default=0.0),
+    "QUEUE_BACKEND": config("QUEUE_BACKEND", default="sqlite"),
+    "QUEUE_PATH": config("QUEUE_PATH", default=""),
+    "QUEUE_WORKERS": config("QUEUE_WORKERS", cast=int, default=1),
+    "QUEUE_LEASE_SECONDS": config("QUEUE_LEASE_SECONDS", cast=float, default=120.0),
+    "QUEUE_MAX_ATTEMPTS": config("QUEUE_MAX_ATTEMPTS", cast=int, default=3),
+    "QUEUE_IDLE_TIMEOUT": config("QUEUE_IDLE_TIMEOUT", cast=float, default=30.0),
+    "QUEUE_NOTIFY_DIR": config("QUEUE_NOTIFY_DIR", default=""),
+    "QUEUE_FANOUT_MIN_CHARS": config("QUEUE_FANOUT_MIN_CHARS", cast=int, default=2000),
+    "QUEUE_FANOUT_PART_CHARS": config("QUEUE_FANOUT_PART_CHARS", cast=int, default=600),
+    "SENTENCE_FAST_PATH_CHARS": config("SENTENCE_FAST_PATH_CHARS", cast=int, default=200),
+    "SENTENCE_PACKING": config("SENTENCE_PACKING", cast=bool, default=True),
+    "CONVERSION_MAX_WORKERS": config("CONVERSION_MAX_WORKERS", cast=int, default=4),
+    "CONVERSION_MAX_PENDING": config("CONVERSION_MAX_PENDING", cast=int, default=32),
 })
@@ -33,6 +33,7 @@ class SynthesisRequest:
         length_penalty: Length penalty 0.5-2.0 (default: 1.0)
         do_sample: Enable sampling (default: True)
         enable_text_splitting: Enable text splitting (default: True)
+        seed: Random seed for reproducible output (default: None)
     """
     text: str
     voice: str
@@ -45,6 +46,7 @@ class SynthesisRequest:
     length_penalty: float = 1.0
     do_sample: bool = True
     enable_text_splitting: bool = True
+    seed: Optional[int] = None
 
 
 @dataclass
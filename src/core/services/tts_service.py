@@ -7,10 +7,8 @@ from pathlib import Path
 import logging
 import shutil
 import gc
-import io
 import os
 
-import numpy as np
 import torch
 
 from src.modules.system.torch_util import gpu_is_available, empty_cache
@@ -24,6 +22,8 @@ from src.core.models.tts_request import (
 )
 from src.tts.xtts.manager.tts_manager import TtsManager
 from src.tts.xtts.dto.tts_dto import TtsDto
+from src.tts.xtts.engine.inference_engine import get_engine
+from src.utils.cancellation import CancellationToken, OperationCancelledError
 
 
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ class TTSService:
         self._manager: Optional[TtsManager] = None
         self._is_model_loaded: bool = False
         self._progress_callback: Optional[Callable[[int, str], None]] = None
-        self._cancel_requested: bool = False
+        self._cancel_token: Optional[CancellationToken] = None
 
     def set_progress_callback(self, callback: Callable[[int, str], None]) -> None:
         """
@@ -126,7 +126,8 @@ class TTSService:
                 error_message="Model not loaded"
             )
 
-        self._cancel_requested = False
+        token = CancellationToken()
+        self._cancel_token = token
 
         try:
             self._report_progress(0, "Starting synthesis...")
@@ -143,48 +144,34 @@ class TTSService:
                 top_p=request.top_p,
                 speed=request.speed,
                 do_sample=request.do_sample,
-                enable_text_splitting=request.enable_text_splitting
+                enable_text_splitting=request.enable_text_splitting,
+                seed=request.seed
             )
 
             self._report_progress(20, "Synthesizing audio...")
 
-            # Check for cancellation
-            if self._cancel_requested:
-                return SynthesisResult(status=SynthesisStatus.CANCELLED)
+            # Perform synthesis; the engine returns float32 PCM, no decoding needed.
+            # cancel_synthesis() stops it before the next sentence.
+            audio = get_engine().synthesize(dto, token=token)
 
-            # Perform synthesis
-            audio_bytes = self._manager.model.synthesize_audio(dto)
-
-            if audio_bytes is None:
+            if audio is None:
                 return SynthesisResult(
                     status=SynthesisStatus.ERROR,
                     error_message="Synthesis returned no audio"
                 )
 
-            self._report_progress(80, "Processing audio...")
-
-            # Convert bytes to numpy array
-            audio_data = self._bytes_to_numpy(audio_bytes)
-
-            if audio_data is None:
-                return SynthesisResult(
-                    status=SynthesisStatus.ERROR,
-                    error_message="Failed to process audio data"
-                )
-
-            # Calculate duration
-            sample_rate = 24000  # XTTS default
-            duration = len(audio_data) / sample_rate
-
             self._report_progress(100, "Synthesis complete")
 
             return SynthesisResult(
-                audio_data=audio_data,
-                sample_rate=sample_rate,
-                duration_seconds=duration,
+                audio_data=audio.samples,
+                sample_rate=audio.sample_rate,
+                duration_seconds=audio.duration_seconds,
                 status=SynthesisStatus.COMPLETED
             )
 
+        except OperationCancelledError:
+            return SynthesisResult(status=SynthesisStatus.CANCELLED)
+
         except Exception as e:
             logger.error(f"Synthesis error: {e}")
             return SynthesisResult(
@@ -192,24 +179,6 @@ class TTSService:
                 error_message=str(e)
             )
 
-    def _bytes_to_numpy(self, audio_bytes: io.BytesIO) -> Optional[np.ndarray]:
-        """Convert audio bytes (WAV) to numpy array."""
-        try:
-            import soundfile as sf
-
-            audio_bytes.seek(0)
-            audio_data, _ = sf.read(audio_bytes)
-
-            # Ensure float32
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-
-            return audio_data
-
-        except Exception as e:
-            logger.error(f"Error converting audio bytes: {e}")
-            return None
-
     def list_speakers(self) -> List[str]:
         """Get list of available speaker names."""
         if not self.is_model_loaded():
@@ -239,7 +208,8 @@ class TTSService:
 
     def cancel_synthesis(self) -> None:
         """Request cancellation of ongoing synthesis."""
-        self._cancel_requested = True
+        if self._cancel_token is not None:
+            self._cancel_token.cancel()
 
     def get_speaker_info(self, speaker_name: str) -> Optional[Speaker]:
         """Get information about a specific speaker."""
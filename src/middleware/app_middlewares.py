@@ -2,6 +2,7 @@ from settings.settings import Settings
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, HTTPException, Depends
+from src.utils.bounded_executor import ExecutorSaturatedError
 
 settings = Settings()
 
@@ -21,4 +22,13 @@ class AppMiddlewares:
             return JSONResponse(
                 status_code=exc.status_code,
                 content={"message": exc.detail},
+                headers=getattr(exc, "headers", None),
+            )
+
+        @app.exception_handler(ExecutorSaturatedError)
+        async def saturated_exception_handler(request, exc):
+            return JSONResponse(
+                status_code=503,
+                content={"message": str(exc)},
+                headers={"Retry-After": str(exc.retry_after)},
             )
\ No newline at end of file
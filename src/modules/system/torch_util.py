@@ -1,4 +1,8 @@
 import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 import torch
 from settings.environment_variables import environment_variables
 
@@ -70,4 +74,79 @@ def synchronize():
     try:
         torch.cuda.synchronize()
     except Exception:
-        pass
\ No newline at end of file
+        pass
+
+
+class _RngGate:
+    """Readers-writer gate around the process-wide torch RNG.
+
+    Unseeded inference enters shared mode and may run concurrently. Seeded
+    inference enters exclusive mode, so nothing else draws from the RNG while
+    it runs and its output depends only on the seed.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+_rng_gate = _RngGate()
+
+
+@contextmanager
+def rng_context(seed: Optional[int] = None) -> Iterator[None]:
+    """Run a block of inference with an isolated, optionally seeded, RNG state.
+
+    With a seed, the global RNG state is forked, seeded and restored afterwards,
+    and cuDNN is switched to deterministic kernels, so the same input and seed
+    give bit-identical output. Without a seed the block only waits for any
+    seeded block in progress.
+    """
+    if seed is None:
+        with _rng_gate.shared():
+            yield
+        return
+
+    with _rng_gate.exclusive():
+        devices = [torch.cuda.current_device()] if gpu_is_available() else []
+        deterministic = torch.backends.cudnn.deterministic
+        benchmark = torch.backends.cudnn.benchmark
+        with torch.random.fork_rng(devices=devices):
+            torch.manual_seed(seed)
+            torch.backends.cudnn.deterministic = True
+            torch.backends.cudnn.benchmark = False
+            try:
+                yield
+            finally:
+                torch.backends.cudnn.deterministic = deterministic
+                torch.backends.cudnn.benchmark = benchmark
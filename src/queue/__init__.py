@@ -1,6 +1,9 @@
 """Queue module for async task processing."""
 from src.queue.models import QueueTask, TaskStatus, TaskType, TaskResponse, QueueStats
+from src.queue.backend import QueueBackend
 from src.queue.file_queue import FileQueue
+from src.queue.sqlite_queue import SqliteQueue
+from src.queue.factory import QueueBackendFactory, get_queue
 from src.queue.consumer import QueueConsumer, get_consumer, start_consumer, stop_consumer
 
 __all__ = [
@@ -9,7 +12,11 @@ __all__ = [
     'TaskType',
     'TaskResponse',
     'QueueStats',
+    'QueueBackend',
     'FileQueue',
+    'SqliteQueue',
+    'QueueBackendFactory',
+    'get_queue',
     'QueueConsumer',
     'get_consumer',
     'start_consumer',
@@ -0,0 +1,121 @@
+"""Queue storage interface shared by every queue backend."""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from src.queue.models import QueueTask, TaskStatus
+
+# Statuses a task never leaves.
+FINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED, TaskStatus.DEAD_LETTER)
+
+
+class QueueBackend(ABC):
+    """Persistent store of queue tasks.
+
+    Implementations must be safe to use from several threads. `claim_next_pending`
+    must be atomic: a pending task is handed to exactly one caller.
+
+    A claim is a lease: the task belongs to `owner` until `lease_expires_at`,
+    which the owner extends with `heartbeat`. `reclaim_expired` puts tasks
+    whose owner stopped heartbeating (crash, restart, lost node) back to
+    PENDING, or to DEAD_LETTER once they used up their attempts.
+    """
+
+    @abstractmethod
+    def add_task(self, task: QueueTask) -> str:
+        """Add a task to the queue and wake the consumers. Returns task ID."""
+
+    @abstractmethod
+    def get_task(self, task_id: str) -> Optional[QueueTask]:
+        """Get a task by ID."""
+
+    @abstractmethod
+    def get_next_pending(self) -> Optional[QueueTask]:
+        """Get the next pending task (FIFO) without claiming it."""
+
+    @abstractmethod
+    def claim_next_pending(
+        self,
+        owner: str = None,
+        lease_seconds: float = 300.0,
+        parent_id: str = None
+    ) -> Optional[QueueTask]:
+        """Atomically move the next pending task (FIFO) to PROCESSING and return it.
+
+        The task is leased to `owner` for `lease_seconds` and its attempts are
+        incremented. With `parent_id`, only subtasks of that task are considered.
+        """
+
+    @abstractmethod
+    def heartbeat(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a task. False if owner no longer holds a PROCESSING lease on it."""
+
+    @abstractmethod
+    def reclaim_expired(self, max_attempts: int) -> Tuple[int, int]:
+        """Release PROCESSING tasks whose lease expired.
+
+        Tasks with fewer than `max_attempts` attempts go back to PENDING, the
+        others to DEAD_LETTER. Returns (requeued, dead_lettered).
+        """
+
+    @abstractmethod
+    def update_task(self, task: QueueTask) -> bool:
+        """Update a task in the queue."""
+
+    @abstractmethod
+    def update_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        error_message: str = None,
+        result_file: str = None,
+        progress: float = None,
+        owner: str = None
+    ) -> bool:
+        """Update task status and optional fields.
+
+        With `owner`, the update only applies while owner holds the task's lease.
+        """
+
+    @abstractmethod
+    def remove_task(self, task_id: str) -> bool:
+        """Remove a task from the queue."""
+
+    @abstractmethod
+    def get_all_tasks(
+        self,
+        status: TaskStatus = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False
+    ) -> List[QueueTask]:
+        """Get tasks in creation order, optionally filtered by status and paginated."""
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue statistics."""
+
+    @abstractmethod
+    def clear_completed(self, older_than_hours: int = 24) -> int:
+        """Remove completed/failed/cancelled tasks older than specified hours."""
+
+    def get_subtasks(self, parent_id: str) -> List[QueueTask]:
+        """Subtasks of a task, in creation order."""
+        return [task for task in self.get_all_tasks() if task.parent_id == parent_id]
+
+    def get_pending_count(self) -> int:
+        """Get count of pending tasks."""
+        return self.get_stats()['pending']
+
+    def get_pending_position(self, task_id: str) -> int:
+        """Position (1-based) of a pending task in the queue, 0 if it is not pending."""
+        for i, task in enumerate(self.get_all_tasks(TaskStatus.PENDING)):
+            if task.id == task_id:
+                return i + 1
+        return 0
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a pending task."""
+        task = self.get_task(task_id)
+        if task and task.status == TaskStatus.PENDING.value:
+            return self.update_task_status(task_id, TaskStatus.CANCELLED)
+        return False
@@ -1,23 +1,46 @@
 """Queue consumer - processes tasks in background."""
 import os
+import socket
 import time
 import threading
+import uuid
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 
 from src.queue.models import QueueTask, TaskStatus, TaskType
-from src.queue.file_queue import FileQueue
+from src.queue.backend import FINAL_STATUSES
+from src.queue.factory import get_queue
+from src.queue.fanout import PartStore, split_text
+from src.queue.notifier import get_notifier
 from src.tts.xtts.dto.tts_dto import TtsDto
 from src.tts.xtts.manager.tts_manager import TtsManager
-from src.audio.converter import convert_audio
+from src.tts.xtts.engine.inference_engine import get_engine, Priority
+from src.audio.converter import encode_audio
+from src.core.application import Application
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+from src.utils.zip_stream import ZipStreamWriter
 
 
 class QueueConsumer:
     """Background consumer that processes queue tasks.
 
-    Implements a single-threaded consumer pattern that polls the queue
-    and processes tasks sequentially.
+    Runs `QUEUE_WORKERS` worker threads, each processing one task at a time.
+    Several processes on the same host (sharing the queue store) may run
+    consumers side by side: every claim is a lease held by one worker, renewed by a
+    heartbeat thread every third of `QUEUE_LEASE_SECONDS`. The same thread
+    reclaims tasks whose lease expired because their worker died, retrying
+    them up to `QUEUE_MAX_ATTEMPTS` times before moving them to DEAD_LETTER.
+
+    When the queue is empty workers sleep until `add_task` signals a new task
+    (in this process or, through the notifier, in another one), checking the
+    store again only every `QUEUE_IDLE_TIMEOUT` seconds as a fallback.
+
+    Synthesis tasks whose text reaches `QUEUE_FANOUT_MIN_CHARS` are fanned out
+    into SYNTHESIS_PART subtasks of about `QUEUE_FANOUT_PART_CHARS` characters
+    that every worker can pick up. The worker holding the parent task works on
+    its parts too (so a single worker still finishes it), reports aggregated
+    progress and joins the parts into the result file.
     """
 
     _instance = None
@@ -35,42 +58,87 @@ class QueueConsumer:
         if self._initialized:
             return
 
-        self.queue = FileQueue()
+        envs = Application().envs
+        self.queue = get_queue()
         self.tts_manager = TtsManager()
+        self.engine = get_engine()
+        self.num_workers = max(1, envs.QUEUE_WORKERS)
+        self.lease_seconds = max(1.0, envs.QUEUE_LEASE_SECONDS)
+        self.max_attempts = max(1, envs.QUEUE_MAX_ATTEMPTS)
+        self.fanout_min_chars = envs.QUEUE_FANOUT_MIN_CHARS
+        self.fanout_part_chars = max(1, envs.QUEUE_FANOUT_PART_CHARS)
+        self._consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
         self._running = False
-        self._thread: Optional[threading.Thread] = None
-        self._poll_interval = 2.0
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.notifier = get_notifier()
+        idle_timeout = envs.QUEUE_IDLE_TIMEOUT
+        self._idle_timeout: Optional[float] = idle_timeout if idle_timeout > 0 else None
+        self._error_backoff = 2.0
         self._on_task_complete: Optional[Callable] = None
         self._on_task_error: Optional[Callable] = None
+        # Tasks being processed here: task id -> (lease owner, cancellation token)
+        self._active: Dict[str, Tuple[str, CancellationToken]] = {}
+        self._active_lock = threading.Lock()
 
         output_dir = Path(__file__).parent.parent.parent / "data" / "queue" / "output"
         output_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir = output_dir
+        self.parts = PartStore(output_dir.parent / "parts")
 
         self._initialized = True
 
     @property
     def is_running(self) -> bool:
         """Check if consumer is running."""
-        return self._running and self._thread is not None and self._thread.is_alive()
+        return self._running and any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def active_workers(self) -> int:
+        """Number of live worker threads."""
+        return sum(1 for thread in self._threads if thread.is_alive())
 
     def start(self) -> bool:
-        """Start the consumer thread."""
+        """Start the worker and heartbeat threads."""
         if self.is_running:
             return False
 
         self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
-        print("[QueueConsumer] Started")
+        self._stop_event.clear()
+        self.notifier.listen()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name="queue-heartbeat", daemon=True
+        )
+        self._heartbeat_thread.start()
+        self._threads = [
+            threading.Thread(
+                target=self._run_loop,
+                args=(f"{self._consumer_id}:{i}",),
+                name=f"queue-worker-{i}",
+                daemon=True
+            )
+            for i in range(self.num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"[QueueConsumer] Started with {self.num_workers} worker(s)")
         return True
 
     def stop(self) -> None:
-        """Stop the consumer thread."""
+        """Stop the consumer threads.
+
+        Tasks still running keep their lease until it expires, then are retried.
+        """
         self._running = False
-        if self._thread:
-            self._thread.join(timeout=5.0)
-            self._thread = None
+        self._stop_event.set()
+        self.notifier.notify_local()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads = []
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join(timeout=5.0)
+            self._heartbeat_thread = None
         print("[QueueConsumer] Stopped")
 
     def set_callbacks(
@@ -82,36 +150,83 @@ class QueueConsumer:
         self._on_task_complete = on_complete
         self._on_task_error = on_error
 
-    def _run_loop(self) -> None:
-        """Main consumer loop."""
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a task that is being processed.
+
+        Synthesis stops before its next sentence and the task ends as CANCELLED.
+        Returns False if the task is not being processed by this consumer.
+        """
+        with self._active_lock:
+            active = self._active.get(task_id)
+        if active is None:
+            return False
+        active[1].cancel()
+        # Wakes a parent task waiting for its parts.
+        self.notifier.notify_local()
+        return True
+
+    def _run_loop(self, worker_id: str) -> None:
+        """Worker loop: claim and process tasks until stopped."""
         while self._running:
             try:
-                task = self.queue.get_next_pending()
+                generation = self.notifier.generation
+                task = self.queue.claim_next_pending(worker_id, self.lease_seconds)
 
                 if task:
                     self._process_task(task)
                 else:
-                    time.sleep(self._poll_interval)
+                    self.notifier.wait(generation, self._idle_timeout)
 
             except Exception as e:
                 print(f"[QueueConsumer] Error in loop: {e}")
-                time.sleep(self._poll_interval)
+                time.sleep(self._error_backoff)
+
+    def _heartbeat_loop(self) -> None:
+        """Renew the leases of active tasks and reclaim expired ones."""
+        interval = self.lease_seconds / 3
+        while True:
+            try:
+                self._renew_leases()
+                requeued, dead = self.queue.reclaim_expired(self.max_attempts)
+                if requeued or dead:
+                    print(f"[QueueConsumer] Reclaimed expired leases: {requeued} requeued, {dead} dead-lettered")
+            except Exception as e:
+                print(f"[QueueConsumer] Heartbeat failed: {e}")
+            if self._stop_event.wait(interval):
+                return
+
+    def _renew_leases(self) -> None:
+        with self._active_lock:
+            active = list(self._active.items())
+        for task_id, (owner, token) in active:
+            if not self.queue.heartbeat(task_id, owner, self.lease_seconds):
+                # Cancelled elsewhere or reclaimed after a stall: stop working on it.
+                print(f"[QueueConsumer] Lost lease on task {task_id}")
+                token.cancel()
+                self.notifier.notify_local()
+
+    def _update_status(self, task: QueueTask, status: TaskStatus, **fields) -> bool:
+        """Update a task this worker holds the lease on."""
+        return self.queue.update_task_status(task.id, status, owner=task.lease_owner, **fields)
 
     def _process_task(self, task: QueueTask) -> None:
         """Process a single task."""
-        print(f"[QueueConsumer] Processing task {task.id} ({task.task_type})")
+        print(f"[QueueConsumer] Processing task {task.id} ({task.task_type}, attempt {task.attempts})")
 
-        self.queue.update_task_status(
-            task.id,
-            TaskStatus.PROCESSING,
-            progress=0.0
-        )
+        token = CancellationToken()
+        with self._active_lock:
+            self._active[task.id] = (task.lease_owner, token)
 
         try:
             if task.task_type == TaskType.SYNTHESIS.value:
-                self._process_synthesis_task(task)
+                if self._should_fan_out(task.payload):
+                    self._process_fan_out_task(task, token)
+                else:
+                    self._process_synthesis_task(task, token)
+            elif task.task_type == TaskType.SYNTHESIS_PART.value:
+                self._process_part_task(task, token)
             elif task.task_type == TaskType.BATCH_SYNTHESIS.value:
-                self._process_batch_synthesis_task(task)
+                self._process_batch_synthesis_task(task, token)
             else:
                 raise ValueError(f"Unknown task type: {task.task_type}")
 
@@ -119,22 +234,27 @@ class QueueConsumer:
                 updated_task = self.queue.get_task(task.id)
                 self._on_task_complete(updated_task)
 
+        except OperationCancelledError:
+            print(f"[QueueConsumer] Task {task.id} cancelled")
+            self._update_status(task, TaskStatus.CANCELLED)
+
         except Exception as e:
             print(f"[QueueConsumer] Task {task.id} failed: {e}")
-            self.queue.update_task_status(
-                task.id,
-                TaskStatus.FAILED,
-                error_message=str(e)
-            )
+            self._update_status(task, TaskStatus.FAILED, error_message=str(e))
 
             if self._on_task_error:
                 self._on_task_error(task, e)
 
-    def _process_synthesis_task(self, task: QueueTask) -> None:
-        """Process a synthesis task."""
-        payload = task.payload
+        finally:
+            with self._active_lock:
+                self._active.pop(task.id, None)
+            if task.task_type == TaskType.SYNTHESIS_PART.value:
+                # Wake the worker waiting on the parent, wherever it runs.
+                self.notifier.notify()
 
-        dto = TtsDto(
+    def _build_dto(self, payload: dict) -> TtsDto:
+        """Build the synthesis request described by a task payload."""
+        return TtsDto(
             text=payload.get('text', ''),
             voice=payload.get('voice', 'voice'),
             lang_code=payload.get('lang_code', 'en'),
@@ -145,108 +265,231 @@ class QueueConsumer:
             top_p=payload.get('top_p', 0.75),
             speed=payload.get('speed', 0.95),
             do_sample=payload.get('do_sample', True),
-            enable_text_splitting=payload.get('enable_text_splitting', True)
+            enable_text_splitting=payload.get('enable_text_splitting', True),
+            seed=payload.get('seed')
         )
 
-        self.queue.update_task_status(task.id, TaskStatus.PROCESSING, progress=10.0)
+    def _process_synthesis_task(self, task: QueueTask, token: CancellationToken) -> None:
+        """Process a synthesis task."""
+        payload = task.payload
+        dto = self._build_dto(payload)
 
-        audio_bytes = self.tts_manager.model.synthesize_audio(dto)
+        self._update_status(task, TaskStatus.PROCESSING, progress=10.0)
 
-        self.queue.update_task_status(task.id, TaskStatus.PROCESSING, progress=80.0)
+        audio = self.engine.synthesize(dto, priority=Priority.BACKGROUND, token=token)
+        if not audio:
+            raise RuntimeError("Synthesis returned no audio")
 
-        output_format = payload.get('output_format', 'wav')
-        if output_format != 'wav':
-            audio_bytes = convert_audio(audio_bytes, output_format)
+        self._update_status(task, TaskStatus.PROCESSING, progress=80.0)
+
+        self._write_synthesis_result(task, audio)
+
+    def _write_synthesis_result(self, task: QueueTask, audio) -> bool:
+        """Encode the audio of a synthesis task, save it and complete the task."""
+        output_format = task.payload.get('output_format', 'wav')
+        audio_bytes = encode_audio(audio, output_format, task.payload.get('profile'))
 
         output_file = self.output_dir / f"{task.id}.{output_format}"
         with open(output_file, 'wb') as f:
             f.write(audio_bytes)
 
-        self.queue.update_task_status(
-            task.id,
+        if not self._update_status(
+            task,
             TaskStatus.COMPLETED,
             result_file=str(output_file),
             progress=100.0
-        )
+        ):
+            print(f"[QueueConsumer] Task {task.id} finished after losing its lease; result discarded")
+            return False
 
         print(f"[QueueConsumer] Task {task.id} completed: {output_file}")
+        return True
 
-    def _process_batch_synthesis_task(self, task: QueueTask) -> None:
-        """Process a batch synthesis task."""
-        import zipfile
-        import io
-        import json
+    def _should_fan_out(self, payload: dict) -> bool:
+        """Whether a synthesis task is split into parts (`fan_out` in the payload overrides the threshold)."""
+        fan_out = payload.get('fan_out')
+        if fan_out is not None:
+            return fan_out
+        return 0 < self.fanout_min_chars <= len(payload.get('text', ''))
+
+    def _create_parts(self, task: QueueTask) -> List[QueueTask]:
+        """Queue the parts of a task, reusing those of an earlier attempt."""
+        parts = self.queue.get_subtasks(task.id)
+        if parts and len(parts) == parts[0].payload.get('count'):
+            return parts
+
+        # Interrupted while queueing parts: start over.
+        for part in parts:
+            self.queue.remove_task(part.id)
+
+        chunks = split_text(
+            task.payload.get('text', ''), self.fanout_part_chars, task.payload.get('lang_code', 'en')
+        )
+        if len(chunks) < 2:
+            return []
+
+        base_payload = {key: value for key, value in task.payload.items() if key != 'fan_out'}
+        for index, chunk in enumerate(chunks):
+            self.queue.add_task(QueueTask(
+                task_type=TaskType.SYNTHESIS_PART,
+                payload={**base_payload, 'text': chunk, 'index': index, 'count': len(chunks)},
+                parent_id=task.id
+            ))
+        print(f"[QueueConsumer] Task {task.id} fanned out into {len(chunks)} parts")
+        return self.queue.get_subtasks(task.id)
+
+    def _process_fan_out_task(self, task: QueueTask, token: CancellationToken) -> None:
+        """Split a long synthesis task into parts, help process them, then join them."""
+        parts = self._create_parts(task)
+        if not parts:
+            self._process_synthesis_task(task, token)
+            return
 
+        try:
+            total = len(parts)
+            while True:
+                generation = self.notifier.generation
+                parts = self.queue.get_subtasks(task.id)
+                for part in parts:
+                    if part.status in (TaskStatus.FAILED.value, TaskStatus.DEAD_LETTER.value,
+                                       TaskStatus.CANCELLED.value):
+                        reason = f": {part.error_message}" if part.error_message else ""
+                        raise RuntimeError(f"Part {part.payload.get('index')} {part.status}{reason}")
+
+                done = sum(1 for part in parts if part.status == TaskStatus.COMPLETED.value)
+                self._update_status(task, TaskStatus.PROCESSING, progress=round(done / total * 90, 1))
+                if done == total:
+                    break
+
+                token.raise_if_cancelled()
+                part = self.queue.claim_next_pending(task.lease_owner, self.lease_seconds, parent_id=task.id)
+                if part:
+                    self._process_task(part)
+                else:
+                    # Remaining parts are running on other workers.
+                    self.notifier.wait(generation, self._idle_timeout)
+
+            token.raise_if_cancelled()
+            audio = self.parts.join(task.id, total)
+        except BaseException:
+            if self._still_owned(task):
+                self._cancel_parts(task.id)
+            raise
+
+        if self._write_synthesis_result(task, audio):
+            self.parts.remove(task.id)
+            for part in parts:
+                self.queue.remove_task(part.id)
+
+    def _still_owned(self, task: QueueTask) -> bool:
+        """False if the task was reclaimed and handed to another worker after losing its lease."""
+        current = self.queue.get_task(task.id)
+        return (
+            current is None
+            or TaskStatus(current.status) in FINAL_STATUSES
+            or current.lease_owner == task.lease_owner
+        )
+
+    def _cancel_parts(self, parent_id: str) -> None:
+        """Stop the unfinished parts of a task and drop the audio of finished ones."""
+        for part in self.queue.get_subtasks(parent_id):
+            if TaskStatus(part.status) not in FINAL_STATUSES:
+                # Parts running elsewhere stop at their next heartbeat.
+                if not self.cancel_task(part.id):
+                    self.queue.update_task_status(part.id, TaskStatus.CANCELLED)
+        self.parts.remove(parent_id)
+
+    def _process_part_task(self, task: QueueTask, token: CancellationToken) -> None:
+        """Synthesize one part of a fanned-out task and store its samples for the join."""
+        audio = self.engine.synthesize(self._build_dto(task.payload), priority=Priority.BACKGROUND, token=token)
+        if not audio:
+            raise RuntimeError("Synthesis returned no audio")
+
+        self.parts.save(task.parent_id, task.payload['index'], audio)
+        if not self._update_status(task, TaskStatus.COMPLETED, progress=100.0):
+            print(f"[QueueConsumer] Part {task.id} finished after losing its lease; result discarded")
+
+    def _process_batch_synthesis_task(self, task: QueueTask, token: CancellationToken) -> None:
+        """Process a batch synthesis task.
+
+        Each item is written into the ZIP on disk as soon as it is synthesized,
+        so memory stays bounded whatever the batch size; the manifest comes last.
+        """
         payload = task.payload
         items = payload.get('items', [])
         default_voice = payload.get('default_voice', 'voice')
         default_lang_code = payload.get('default_lang_code', 'en')
         output_format = payload.get('output_format', 'wav')
+        profile = payload.get('profile')
 
         total_items = len(items)
         results = []
-        audio_files = []
-
-        for idx, item in enumerate(items):
-            progress = (idx / total_items) * 90
-            self.queue.update_task_status(task.id, TaskStatus.PROCESSING, progress=progress)
-
-            voice = item.get('voice') or default_voice
-            lang_code = item.get('lang_code') or default_lang_code
-            text = item.get('text', '')
-
-            try:
-                dto = TtsDto(
-                    text=text,
-                    voice=voice,
-                    lang_code=lang_code
-                )
-
-                audio_bytes = self.tts_manager.model.synthesize_audio(dto)
-
-                if output_format != 'wav':
-                    audio_bytes = convert_audio(audio_bytes, output_format)
-
-                filename = f"audio_{idx:03d}.{output_format}"
-                audio_files.append((filename, audio_bytes))
-
-                results.append({
-                    'index': idx,
-                    'success': True,
-                    'text': text[:50] + '...' if len(text) > 50 else text
-                })
-
-            except Exception as e:
-                results.append({
-                    'index': idx,
-                    'success': False,
-                    'text': text[:50] + '...' if len(text) > 50 else text,
-                    'error': str(e)
-                })
-
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for filename, audio_data in audio_files:
-                zf.writestr(filename, audio_data)
-
-            manifest = {
-                'total': total_items,
-                'successful': sum(1 for r in results if r.get('success')),
-                'failed': sum(1 for r in results if not r.get('success')),
-                'results': results
-            }
-            zf.writestr('manifest.json', json.dumps(manifest, indent=2))
 
         output_file = self.output_dir / f"{task.id}.zip"
-        with open(output_file, 'wb') as f:
-            f.write(zip_buffer.getvalue())
-
-        self.queue.update_task_status(
-            task.id,
+        partial_file = output_file.with_suffix(".zip.part")
+        try:
+            with open(partial_file, 'wb') as f:
+                archive = ZipStreamWriter(f)
+                for idx, item in enumerate(items):
+                    token.raise_if_cancelled()
+                    progress = (idx / total_items) * 90
+                    self._update_status(task, TaskStatus.PROCESSING, progress=progress)
+
+                    voice = item.get('voice') or default_voice
+                    lang_code = item.get('lang_code') or default_lang_code
+                    text = item.get('text', '')
+
+                    try:
+                        dto = TtsDto(
+                            text=text,
+                            voice=voice,
+                            lang_code=lang_code
+                        )
+
+                        audio = self.engine.synthesize(dto, priority=Priority.BACKGROUND, token=token)
+                        if not audio:
+                            raise RuntimeError("Synthesis returned no audio")
+
+                        archive.write(
+                            f"audio_{idx:03d}.{output_format}", encode_audio(audio, output_format, profile)
+                        )
+
+                        results.append({
+                            'index': idx,
+                            'success': True,
+                            'text': text[:50] + '...' if len(text) > 50 else text
+                        })
+
+                    except OperationCancelledError:
+                        raise
+                    except Exception as e:
+                        results.append({
+                            'index': idx,
+                            'success': False,
+                            'text': text[:50] + '...' if len(text) > 50 else text,
+                            'error': str(e)
+                        })
+
+                archive.write_json('manifest.json', {
+                    'total': total_items,
+                    'successful': sum(1 for r in results if r.get('success')),
+                    'failed': sum(1 for r in results if not r.get('success')),
+                    'results': results
+                })
+                archive.close()
+            os.replace(partial_file, output_file)
+        except BaseException:
+            partial_file.unlink(missing_ok=True)
+            raise
+
+        if not self._update_status(
+            task,
             TaskStatus.COMPLETED,
             result_file=str(output_file),
             progress=100.0
-        )
+        ):
+            print(f"[QueueConsumer] Task {task.id} finished after losing its lease; result discarded")
+            return
 
         print(f"[QueueConsumer] Batch task {task.id} completed: {output_file}")
 
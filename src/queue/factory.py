@@ -0,0 +1,37 @@
+"""Selection of the queue backend."""
+from typing import Optional
+
+from src.core.application import Application
+from src.queue.backend import QueueBackend
+from src.queue.file_queue import FileQueue
+from src.queue.sqlite_queue import SqliteQueue
+
+
+class QueueBackendFactory:
+    """Factory for queue backends."""
+
+    @staticmethod
+    def create(backend_type: str = "sqlite", path: Optional[str] = None) -> QueueBackend:
+        """Create the queue backend.
+
+        Args:
+            backend_type: "sqlite" (default) or "file" (legacy JSON file)
+            path: Database or JSON file path; the default lives in data/queue/
+        """
+        if backend_type == "file":
+            return FileQueue(path or None)
+        if backend_type == "sqlite":
+            return SqliteQueue(path or None)
+        raise ValueError(f"Unknown queue backend: {backend_type}")
+
+
+_queue_instance: Optional[QueueBackend] = None
+
+
+def get_queue() -> QueueBackend:
+    """Get or create the queue backend selected by QUEUE_BACKEND / QUEUE_PATH."""
+    global _queue_instance
+    if _queue_instance is None:
+        envs = Application().envs
+        _queue_instance = QueueBackendFactory.create(envs.QUEUE_BACKEND, envs.QUEUE_PATH)
+    return _queue_instance
@@ -0,0 +1,78 @@
+"""Fan-out of long synthesis tasks into ordered parts.
+
+A long text is split at paragraph and sentence boundaries into parts of at
+most `max_chars` characters (a single longer sentence stays whole). Each part
+is queued as a SYNTHESIS_PART subtask that any worker may pick up; its audio
+is saved as float32 samples in `PartStore`, and the parent task stitches the
+parts back together in order once all of them completed.
+"""
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from src.audio.accumulator import AudioAccumulator
+from src.audio.buffer import AudioBuffer
+from src.tokenizer.splitter import get_sentence_splitter
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+def split_text(text: str, max_chars: int, lang: str = "en") -> List[str]:
+    """Split text into ordered parts of whole sentences.
+
+    Paragraphs always start a new part; sentences of a paragraph are packed
+    together while the part stays within `max_chars`.
+    """
+    splitter = get_sentence_splitter()
+    parts = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        current = ""
+        for sentence in splitter.split(paragraph, lang):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                parts.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            parts.append(current)
+    return parts
+
+
+class PartStore:
+    """Audio of finished parts, one `.npy` file per part under `root/<parent_id>/`."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, parent_id: str, index: int) -> Path:
+        return self.root / parent_id / f"{index:05d}.npy"
+
+    def save(self, parent_id: str, index: int, audio: AudioBuffer) -> None:
+        """Store the audio of a part; replaces any earlier attempt atomically."""
+        path = self._path(parent_id, index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            np.save(f, np.asarray(audio.samples, dtype=np.float32))
+        os.replace(temp_path, path)
+
+    def join(self, parent_id: str, count: int, sample_rate: int = 24000) -> AudioBuffer:
+        """Concatenate parts 0..count-1 in order.
+
+        Parts are memory-mapped, so only the joined result is held in memory.
+        """
+        accumulator = AudioAccumulator(sample_rate)
+        for index in range(count):
+            path = self._path(parent_id, index)
+            if not path.exists():
+                raise RuntimeError(f"Audio of part {index} is missing")
+            accumulator.append(np.load(path, mmap_mode="r"))
+        return accumulator.to_buffer()
+
+    def remove(self, parent_id: str) -> None:
+        """Delete the stored parts of a task."""
+        shutil.rmtree(self.root / parent_id, ignore_errors=True)
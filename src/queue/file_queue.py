@@ -2,17 +2,21 @@
 import os
 import json
 import threading
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from src.queue.backend import FINAL_STATUSES, QueueBackend
 from src.queue.models import QueueTask, TaskStatus
+from src.queue.notifier import get_notifier
 
 
-class FileQueue:
+class FileQueue(QueueBackend):
     """Thread-safe file-based queue for task persistence.
 
     Uses a JSON file to store tasks with file locking for concurrent access.
+    Every operation reads (and most rewrite) the whole file; prefer
+    `SqliteQueue` for anything but small queues.
     """
 
     _instance = None
@@ -72,6 +76,7 @@ class FileQueue:
         tasks = self._read_tasks()
         tasks.append(task.to_dict())
         self._write_tasks(tasks)
+        get_notifier().notify()
         return task.id
 
     def get_task(self, task_id: str) -> Optional[QueueTask]:
@@ -90,6 +95,81 @@ class FileQueue:
                 return QueueTask.from_dict(task_data)
         return None
 
+    def claim_next_pending(
+        self,
+        owner: str = None,
+        lease_seconds: float = 300.0,
+        parent_id: str = None
+    ) -> Optional[QueueTask]:
+        """Atomically move the next pending task (FIFO) to PROCESSING and return it.
+
+        The task is leased to `owner` for `lease_seconds` and its attempts are
+        incremented. With `parent_id`, only subtasks of that task are considered.
+        """
+        with self._file_lock:
+            tasks = self._read_tasks()
+            for task_data in tasks:
+                if parent_id is not None and task_data.get('parent_id') != parent_id:
+                    continue
+                if task_data.get('status') == TaskStatus.PENDING.value:
+                    now = datetime.utcnow()
+                    task_data['status'] = TaskStatus.PROCESSING.value
+                    task_data['progress'] = 0.0
+                    task_data['started_at'] = task_data.get('started_at') or now.isoformat()
+                    task_data['attempts'] = task_data.get('attempts', 0) + 1
+                    task_data['lease_owner'] = owner
+                    task_data['lease_expires_at'] = (now + timedelta(seconds=lease_seconds)).isoformat()
+                    self._write_tasks(tasks)
+                    return QueueTask.from_dict(dict(task_data))
+            return None
+
+    def heartbeat(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a task. False if owner no longer holds a PROCESSING lease on it."""
+        with self._file_lock:
+            tasks = self._read_tasks()
+            for task_data in tasks:
+                if (task_data.get('id') == task_id and task_data.get('lease_owner') == owner
+                        and task_data.get('status') == TaskStatus.PROCESSING.value):
+                    expires = datetime.utcnow() + timedelta(seconds=lease_seconds)
+                    task_data['lease_expires_at'] = expires.isoformat()
+                    self._write_tasks(tasks)
+                    return True
+            return False
+
+    def reclaim_expired(self, max_attempts: int) -> Tuple[int, int]:
+        """Release PROCESSING tasks whose lease expired.
+
+        Tasks with fewer than `max_attempts` attempts go back to PENDING, the
+        others to DEAD_LETTER. Returns (requeued, dead_lettered).
+        """
+        requeued = dead = 0
+        with self._file_lock:
+            tasks = self._read_tasks()
+            now = datetime.utcnow().isoformat()
+            for task_data in tasks:
+                if task_data.get('status') != TaskStatus.PROCESSING.value:
+                    continue
+                expires = task_data.get('lease_expires_at')
+                if expires and expires >= now:
+                    continue
+                task_data['lease_expires_at'] = None
+                attempts = task_data.get('attempts', 0)
+                if attempts >= max_attempts:
+                    task_data['status'] = TaskStatus.DEAD_LETTER.value
+                    task_data['completed_at'] = now
+                    task_data['error_message'] = f"Lease expired after {attempts} attempt(s)"
+                    dead += 1
+                else:
+                    task_data['status'] = TaskStatus.PENDING.value
+                    task_data['progress'] = 0.0
+                    task_data['lease_owner'] = None
+                    requeued += 1
+            if requeued or dead:
+                self._write_tasks(tasks)
+        if requeued:
+            get_notifier().notify()
+        return requeued, dead
+
     def update_task(self, task: QueueTask) -> bool:
         """Update a task in the queue."""
         tasks = self._read_tasks()
@@ -106,19 +186,40 @@ class FileQueue:
         status: TaskStatus,
         error_message: str = None,
         result_file: str = None,
-        progress: float = None
+        progress: float = None,
+        owner: str = None
+    ) -> bool:
+        """Update task status and optional fields.
+
+        With `owner`, the update only applies while owner holds the task's lease.
+        """
+        with self._file_lock:
+            return self._update_task_status(task_id, status, error_message, result_file, progress, owner)
+
+    def _update_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        error_message: Optional[str],
+        result_file: Optional[str],
+        progress: Optional[float],
+        owner: Optional[str]
     ) -> bool:
-        """Update task status and optional fields."""
         tasks = self._read_tasks()
         for i, task_data in enumerate(tasks):
             if task_data.get('id') == task_id:
+                if owner is not None and (task_data.get('lease_owner') != owner
+                                          or task_data.get('status') != TaskStatus.PROCESSING.value):
+                    return False
+
                 tasks[i]['status'] = status.value
 
                 if status == TaskStatus.PROCESSING and not tasks[i].get('started_at'):
                     tasks[i]['started_at'] = datetime.utcnow().isoformat()
 
-                if status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
+                if status in FINAL_STATUSES:
                     tasks[i]['completed_at'] = datetime.utcnow().isoformat()
+                    tasks[i]['lease_expires_at'] = None
 
                 if error_message is not None:
                     tasks[i]['error_message'] = error_message
@@ -144,8 +245,14 @@ class FileQueue:
             return True
         return False
 
-    def get_all_tasks(self, status: TaskStatus = None) -> List[QueueTask]:
-        """Get all tasks, optionally filtered by status."""
+    def get_all_tasks(
+        self,
+        status: TaskStatus = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False
+    ) -> List[QueueTask]:
+        """Get tasks in creation order, optionally filtered by status and paginated."""
         tasks = self._read_tasks()
         result = []
 
@@ -153,11 +260,10 @@ class FileQueue:
             if status is None or task_data.get('status') == status.value:
                 result.append(QueueTask.from_dict(task_data))
 
-        return result
-
-    def get_pending_count(self) -> int:
-        """Get count of pending tasks."""
-        return len(self.get_all_tasks(TaskStatus.PENDING))
+        if newest_first:
+            result.sort(key=lambda t: t.created_at, reverse=True)
+        end = None if limit is None else offset + limit
+        return result[offset:end]
 
     def get_stats(self) -> Dict[str, int]:
         """Get queue statistics."""
@@ -168,7 +274,8 @@ class FileQueue:
             'processing': 0,
             'completed': 0,
             'failed': 0,
-            'cancelled': 0
+            'cancelled': 0,
+            'dead_letter': 0
         }
 
         for task in tasks:
@@ -187,7 +294,7 @@ class FileQueue:
         def should_keep(task: Dict) -> bool:
             nonlocal removed
             status = task.get('status')
-            if status not in (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value):
+            if status not in [final.value for final in FINAL_STATUSES]:
                 return True
 
             completed_at = task.get('completed_at')
@@ -209,10 +316,3 @@ class FileQueue:
             self._write_tasks(filtered_tasks)
 
         return removed
-
-    def cancel_task(self, task_id: str) -> bool:
-        """Cancel a pending task."""
-        task = self.get_task(task_id)
-        if task and task.status == TaskStatus.PENDING.value:
-            return self.update_task_status(task_id, TaskStatus.CANCELLED)
-        return False
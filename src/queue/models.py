@@ -13,12 +13,14 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
+    DEAD_LETTER = "dead_letter"
 
 
 class TaskType(str, Enum):
     """Type of queue task."""
     SYNTHESIS = "synthesis"
     BATCH_SYNTHESIS = "batch_synthesis"
+    SYNTHESIS_PART = "synthesis_part"
 
 
 class SynthesisTaskPayload(BaseModel):
@@ -35,6 +37,9 @@ class SynthesisTaskPayload(BaseModel):
     speed: float = 0.95
     do_sample: bool = True
     enable_text_splitting: bool = True
+    seed: Optional[int] = None
+    fan_out: Optional[bool] = None
+    profile: Optional[str] = None
 
 
 class QueueTask(BaseModel):
@@ -49,6 +54,10 @@ class QueueTask(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     progress: float = 0.0
+    attempts: int = 0
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    parent_id: Optional[str] = None
 
     class Config:
         use_enum_values = True
@@ -59,6 +68,7 @@ class QueueTask(BaseModel):
         data['created_at'] = self.created_at.isoformat() if self.created_at else None
         data['started_at'] = self.started_at.isoformat() if self.started_at else None
         data['completed_at'] = self.completed_at.isoformat() if self.completed_at else None
+        data['lease_expires_at'] = self.lease_expires_at.isoformat() if self.lease_expires_at else None
         return data
 
     @classmethod
@@ -70,6 +80,8 @@ class QueueTask(BaseModel):
             data['started_at'] = datetime.fromisoformat(data['started_at'])
         if data.get('completed_at') and isinstance(data['completed_at'], str):
             data['completed_at'] = datetime.fromisoformat(data['completed_at'])
+        if data.get('lease_expires_at') and isinstance(data['lease_expires_at'], str):
+            data['lease_expires_at'] = datetime.fromisoformat(data['lease_expires_at'])
         return cls(**data)
 
 
@@ -84,6 +96,8 @@ class TaskResponse(BaseModel):
     created_at: str
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
+    attempts: int = 0
+    parent_id: Optional[str] = None
     estimated_wait_seconds: Optional[float] = None
 
 
@@ -95,4 +109,6 @@ class QueueStats(BaseModel):
     completed: int
     failed: int
     cancelled: int
+    dead_letter: int = 0
     consumer_running: bool
+    consumer_workers: int = 0
@@ -0,0 +1,145 @@
+"""Wake-up signal for queue consumers.
+
+Adding a task bumps a generation counter and wakes every consumer waiting in
+this process. For deployments where API and consumers run in different
+processes sharing the queue store, each listening process also binds a Unix
+datagram socket in the notify directory; a notification sends one datagram
+to every socket found there. Socket names carry a random suffix, since
+processes in different containers sharing the directory may have the same
+pid. Where Unix sockets are unavailable (e.g. Windows) only in-process
+wake-ups are used and consumers fall back to their idle timeout.
+"""
+import atexit
+import os
+import socket
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from src.core.application import Application
+
+
+class QueueNotifier:
+    """Generation counter that queue consumers can wait on."""
+
+    def __init__(self, notify_dir: Optional[Path] = None):
+        self.notify_dir = notify_dir
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._socket: Optional[socket.socket] = None
+        self._socket_path: Optional[Path] = None
+        self._listener: Optional[threading.Thread] = None
+
+    @property
+    def generation(self) -> int:
+        """Current generation; pass it to `wait` to detect later notifications."""
+        with self._condition:
+            return self._generation
+
+    def wait(self, since: int, timeout: Optional[float] = None) -> bool:
+        """Block until a notification newer than `since` arrives or timeout passes.
+
+        Returns True if notified. Read `generation` before checking the queue,
+        then wait with it, so a task added in between is never missed.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation != since, timeout)
+
+    def notify(self) -> None:
+        """Wake consumers in this process and in other listening processes."""
+        self.notify_local()
+        self._notify_remote()
+
+    def notify_local(self) -> None:
+        """Wake consumers in this process only."""
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def listen(self) -> bool:
+        """Receive notifications from other processes. Returns False if unsupported."""
+        if self._listener is not None:
+            return True
+        if self.notify_dir is None or not hasattr(socket, "AF_UNIX"):
+            return False
+        try:
+            self.notify_dir.mkdir(parents=True, exist_ok=True)
+            path = self.notify_dir / f"{os.getpid()}-{uuid.uuid4().hex[:12]}.sock"
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(str(path))
+        except OSError as e:
+            print(f"[QueueNotifier] Cross-process notifications disabled: {e}")
+            return False
+
+        self._socket = sock
+        self._socket_path = path
+        self._listener = threading.Thread(target=self._receive_loop, name="queue-notifier", daemon=True)
+        self._listener.start()
+        atexit.register(self.close)
+        return True
+
+    def close(self) -> None:
+        """Stop listening and remove this process's socket."""
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            sock.close()
+        if self._socket_path is not None:
+            try:
+                self._socket_path.unlink()
+            except OSError:
+                pass
+            self._socket_path = None
+        self._listener = None
+
+    def _receive_loop(self) -> None:
+        sock = self._socket
+        while sock is not None and self._socket is sock:
+            try:
+                sock.recv(64)
+            except OSError:
+                return
+            self.notify_local()
+
+    def _notify_remote(self) -> None:
+        if self.notify_dir is None or not hasattr(socket, "AF_UNIX") or not self.notify_dir.is_dir():
+            return
+        try:
+            sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        except OSError:
+            return
+        with sender:
+            sender.setblocking(False)
+            for path in self.notify_dir.glob("*.sock"):
+                if path == self._socket_path:
+                    continue
+                try:
+                    sender.sendto(b"1", str(path))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Nobody bound to it any more: left behind by a dead process.
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                except OSError:
+                    # Receiver buffer full: it has pending wake-ups already.
+                    pass
+
+
+_notifier_instance: Optional[QueueNotifier] = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier() -> QueueNotifier:
+    """Get or create the process-wide queue notifier."""
+    global _notifier_instance
+    if _notifier_instance is None:
+        with _notifier_lock:
+            if _notifier_instance is None:
+                notify_dir = Application().envs.QUEUE_NOTIFY_DIR
+                if notify_dir:
+                    path = Path(notify_dir)
+                else:
+                    path = Path(__file__).parent.parent.parent / "data" / "queue" / "notify"
+                _notifier_instance = QueueNotifier(path)
+    return _notifier_instance
@@ -0,0 +1,379 @@
+"""SQLite queue backend.
+
+Tasks live in one table indexed on status, creation time and id, so lookups,
+claims and status updates touch a single row instead of rewriting the whole
+queue. The database runs in WAL mode: readers (status polling, listings) do
+not block the consumer's writes, and several processes on the same host can
+share the file. WAL relies on shared memory, so the database must live on a
+local filesystem; it cannot be shared between hosts over a network
+filesystem (NFS, SMB).
+
+Claims are leases (`lease_owner`, `lease_expires_at`), so consumers in
+several processes sharing the database can recover the tasks of a consumer
+that died.
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.queue.backend import FINAL_STATUSES, QueueBackend
+from src.queue.models import QueueTask, TaskStatus
+from src.queue.notifier import get_notifier
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    task_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result_file TEXT,
+    error_message TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at TEXT,
+    parent_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at, seq);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at, seq);
+"""
+
+# Indexes on columns added after the first schema, created once they exist.
+_ADDED_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tasks_parent ON tasks (parent_id, status, created_at, seq);
+"""
+
+_COLUMNS = (
+    "id", "task_type", "status", "payload", "result_file", "error_message",
+    "created_at", "started_at", "completed_at", "progress",
+    "attempts", "lease_owner", "lease_expires_at", "parent_id",
+)
+
+# Columns added after the first schema, with their definitions.
+_ADDED_COLUMNS = {
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "lease_owner": "TEXT",
+    "lease_expires_at": "TEXT",
+    "parent_id": "TEXT",
+}
+
+
+class SqliteQueue(QueueBackend):
+    """Thread-safe SQLite (WAL) queue for task persistence.
+
+    Each thread uses its own connection. On first use, tasks from a legacy
+    `tasks.json` next to the database are imported and the file is renamed
+    to `tasks.json.migrated`.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, db_file: str = None):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SqliteQueue, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, db_file: str = None):
+        if self._initialized:
+            return
+
+        if db_file:
+            self.db_file = Path(db_file)
+        else:
+            self.db_file = Path(__file__).parent.parent.parent / "data" / "queue" / "tasks.db"
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        self._connection().executescript(_SCHEMA)
+        self._add_missing_columns()
+        self._connection().executescript(_ADDED_INDEXES)
+        self._migrate_json(self.db_file.parent / "tasks.json")
+        self._initialized = True
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_file), timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction, taking the write lock up front."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _add_missing_columns(self) -> None:
+        """Upgrade a database created by an older schema."""
+        with self._transaction() as conn:
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(tasks)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} {definition}")
+
+    def _migrate_json(self, json_file: Path) -> None:
+        """Import tasks from a legacy FileQueue file, once."""
+        if not json_file.exists():
+            return
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                tasks = json.load(f).get('tasks', [])
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[SqliteQueue] Could not read {json_file} for migration: {e}")
+            return
+
+        with self._transaction() as conn:
+            for task_data in tasks:
+                try:
+                    task = QueueTask.from_dict(dict(task_data))
+                except Exception as e:
+                    print(f"[SqliteQueue] Skipping invalid task during migration: {e}")
+                    continue
+                conn.execute(
+                    f"INSERT OR IGNORE INTO tasks ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    self._to_row(task)
+                )
+        try:
+            os.replace(json_file, json_file.with_name(json_file.name + ".migrated"))
+        except FileNotFoundError:
+            # Another process migrated it at the same time; rows were inserted OR IGNOREd.
+            return
+        print(f"[SqliteQueue] Migrated {len(tasks)} task(s) from {json_file}")
+
+    @staticmethod
+    def _to_row(task: QueueTask) -> tuple:
+        data = task.to_dict()
+        data['payload'] = json.dumps(data['payload'], ensure_ascii=False)
+        return tuple(data[column] for column in _COLUMNS)
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> QueueTask:
+        data: Dict[str, Any] = {column: row[column] for column in _COLUMNS}
+        data['payload'] = json.loads(data['payload'])
+        return QueueTask.from_dict(data)
+
+    def add_task(self, task: QueueTask) -> str:
+        """Add a task to the queue. Returns task ID."""
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT INTO tasks ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                self._to_row(task)
+            )
+        get_notifier().notify()
+        return task.id
+
+    def get_task(self, task_id: str) -> Optional[QueueTask]:
+        """Get a task by ID."""
+        row = self._connection().execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def get_next_pending(self) -> Optional[QueueTask]:
+        """Get the next pending task (FIFO) without claiming it."""
+        row = self._connection().execute(
+            "SELECT * FROM tasks WHERE status = ? ORDER BY created_at, seq LIMIT 1",
+            (TaskStatus.PENDING.value,)
+        ).fetchone()
+        return self._from_row(row) if row else None
+
+    def claim_next_pending(
+        self,
+        owner: str = None,
+        lease_seconds: float = 300.0,
+        parent_id: str = None
+    ) -> Optional[QueueTask]:
+        """Atomically move the next pending task (FIFO) to PROCESSING and return it.
+
+        The task is leased to `owner` for `lease_seconds` and its attempts are
+        incremented. With `parent_id`, only subtasks of that task are considered.
+        """
+        now = datetime.utcnow()
+        expires = (now + timedelta(seconds=lease_seconds)).isoformat()
+        query = "SELECT seq FROM tasks WHERE status = ?"
+        params: List[Any] = [TaskStatus.PENDING.value]
+        if parent_id is not None:
+            query += " AND parent_id = ?"
+            params.append(parent_id)
+        with self._transaction() as conn:
+            row = conn.execute(query + " ORDER BY created_at, seq LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = ?, progress = 0, started_at = COALESCE(started_at, ?), "
+                "attempts = attempts + 1, lease_owner = ?, lease_expires_at = ? WHERE seq = ?",
+                (TaskStatus.PROCESSING.value, now.isoformat(), owner, expires, row['seq'])
+            )
+            claimed = conn.execute("SELECT * FROM tasks WHERE seq = ?", (row['seq'],)).fetchone()
+        return self._from_row(claimed)
+
+    def heartbeat(self, task_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a task. False if owner no longer holds a PROCESSING lease on it."""
+        expires = (datetime.utcnow() + timedelta(seconds=lease_seconds)).isoformat()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (expires, task_id, owner, TaskStatus.PROCESSING.value)
+            )
+        return cursor.rowcount > 0
+
+    def reclaim_expired(self, max_attempts: int) -> Tuple[int, int]:
+        """Release PROCESSING tasks whose lease expired.
+
+        Tasks with fewer than `max_attempts` attempts go back to PENDING, the
+        others to DEAD_LETTER. Returns (requeued, dead_lettered).
+        """
+        now = datetime.utcnow().isoformat()
+        expired = "status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        with self._transaction() as conn:
+            dead = conn.execute(
+                f"UPDATE tasks SET status = ?, completed_at = ?, lease_expires_at = NULL, "
+                f"error_message = 'Lease expired after ' || attempts || ' attempt(s)' "
+                f"WHERE {expired} AND attempts >= ?",
+                (TaskStatus.DEAD_LETTER.value, now, TaskStatus.PROCESSING.value, now, max_attempts)
+            ).rowcount
+            requeued = conn.execute(
+                f"UPDATE tasks SET status = ?, progress = 0, lease_owner = NULL, lease_expires_at = NULL "
+                f"WHERE {expired}",
+                (TaskStatus.PENDING.value, TaskStatus.PROCESSING.value, now)
+            ).rowcount
+        if requeued:
+            get_notifier().notify()
+        return requeued, dead
+
+    def update_task(self, task: QueueTask) -> bool:
+        """Update a task in the queue."""
+        row = self._to_row(task)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {', '.join(f'{column} = ?' for column in _COLUMNS[1:])} WHERE id = ?",
+                row[1:] + (task.id,)
+            )
+        return cursor.rowcount > 0
+
+    def update_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        error_message: str = None,
+        result_file: str = None,
+        progress: float = None,
+        owner: str = None
+    ) -> bool:
+        """Update task status and optional fields.
+
+        With `owner`, the update only applies while owner holds the task's lease.
+        """
+        now = datetime.utcnow().isoformat()
+        assignments = ["status = ?"]
+        params: List[Any] = [status.value]
+
+        if status == TaskStatus.PROCESSING:
+            assignments.append("started_at = COALESCE(started_at, ?)")
+            params.append(now)
+        if status in FINAL_STATUSES:
+            assignments.append("completed_at = ?, lease_expires_at = NULL")
+            params.append(now)
+        if error_message is not None:
+            assignments.append("error_message = ?")
+            params.append(error_message)
+        if result_file is not None:
+            assignments.append("result_file = ?")
+            params.append(result_file)
+        if progress is not None:
+            assignments.append("progress = ?")
+            params.append(progress)
+
+        query = f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?"
+        params.append(task_id)
+        if owner is not None:
+            query += " AND lease_owner = ? AND status = ?"
+            params += [owner, TaskStatus.PROCESSING.value]
+
+        with self._transaction() as conn:
+            cursor = conn.execute(query, params)
+        return cursor.rowcount > 0
+
+    def remove_task(self, task_id: str) -> bool:
+        """Remove a task from the queue."""
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return cursor.rowcount > 0
+
+    def get_all_tasks(
+        self,
+        status: TaskStatus = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False
+    ) -> List[QueueTask]:
+        """Get tasks in creation order, optionally filtered by status and paginated."""
+        query = "SELECT * FROM tasks"
+        params: List[Any] = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status.value)
+        order = "DESC" if newest_first else "ASC"
+        query += f" ORDER BY created_at {order}, seq {order} LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return [self._from_row(row) for row in self._connection().execute(query, params)]
+
+    def get_subtasks(self, parent_id: str) -> List[QueueTask]:
+        """Subtasks of a task, in creation order."""
+        rows = self._connection().execute(
+            "SELECT * FROM tasks WHERE parent_id = ? ORDER BY created_at, seq", (parent_id,)
+        )
+        return [self._from_row(row) for row in rows]
+
+    def get_pending_position(self, task_id: str) -> int:
+        """Position (1-based) of a pending task in the queue, 0 if it is not pending."""
+        row = self._connection().execute(
+            "SELECT 1 + (SELECT COUNT(*) FROM tasks AS other WHERE other.status = task.status "
+            "AND (other.created_at < task.created_at "
+            "OR (other.created_at = task.created_at AND other.seq < task.seq))) AS position "
+            "FROM tasks AS task WHERE task.id = ? AND task.status = ?",
+            (task_id, TaskStatus.PENDING.value)
+        ).fetchone()
+        return row['position'] if row else 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue statistics."""
+        stats = {status.value: 0 for status in TaskStatus}
+        for row in self._connection().execute("SELECT status, COUNT(*) AS count FROM tasks GROUP BY status"):
+            stats[row['status']] = row['count']
+        stats['total'] = sum(stats.values())
+        return stats
+
+    def clear_completed(self, older_than_hours: int = 24) -> int:
+        """Remove completed/failed/cancelled tasks older than specified hours."""
+        cutoff = (datetime.utcnow() - timedelta(hours=older_than_hours)).isoformat()
+        statuses = [status.value for status in FINAL_STATUSES]
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM tasks WHERE status IN ({', '.join('?' for _ in statuses)}) "
+                "AND (completed_at IS NULL OR completed_at <= ?)",
+                statuses + [cutoff]
+            )
+        return cursor.rowcount
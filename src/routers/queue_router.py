@@ -6,10 +6,11 @@ from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.queue import (
-    FileQueue, QueueTask, TaskStatus, TaskType,
-    TaskResponse, QueueStats, get_consumer
+    QueueTask, TaskStatus, TaskType,
+    TaskResponse, QueueStats, get_consumer, get_queue
 )
 from src.audio.converter import estimate_duration_seconds
+from src.audio.profiles import get_profile
 
 
 router = APIRouter(
@@ -32,6 +33,9 @@ class EnqueueSynthesisRequest(BaseModel):
     speed: float = Field(default=0.95, ge=0.5, le=2.0)
     do_sample: bool = True
     enable_text_splitting: bool = True
+    seed: Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
+    fan_out: Optional[bool] = None
+    profile: Optional[str] = None
 
 
 class EnqueueBatchRequest(BaseModel):
@@ -40,6 +44,7 @@ class EnqueueBatchRequest(BaseModel):
     default_voice: str = "voice"
     default_lang_code: str = "en"
     output_format: str = "wav"
+    profile: Optional[str] = None
 
 
 class EnqueueResponse(BaseModel):
@@ -51,27 +56,29 @@ class EnqueueResponse(BaseModel):
     message: str
 
 
-queue = FileQueue()
+queue = get_queue()
 
 
 def _get_queue_position(task_id: str) -> int:
     """Get position of task in queue (1-based)."""
-    pending = queue.get_all_tasks(TaskStatus.PENDING)
-    for i, task in enumerate(pending):
-        if task.id == task_id:
-            return i + 1
-    return 0
+    return queue.get_pending_position(task_id)
+
+
+def _check_profile(profile: Optional[str], output_format: str) -> None:
+    """Reject an unknown output profile, or one that does not fit the format, before enqueuing."""
+    try:
+        get_profile(profile, output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 def _estimate_wait_time(position: int) -> float:
     """Estimate wait time based on queue position."""
-    pending_tasks = queue.get_all_tasks(TaskStatus.PENDING)
+    pending_tasks = queue.get_all_tasks(TaskStatus.PENDING, limit=position)
     total_duration = 0.0
 
-    for i, task in enumerate(pending_tasks):
-        if i >= position:
-            break
-        if task.task_type == TaskType.SYNTHESIS.value:
+    for task in pending_tasks:
+        if task.task_type in (TaskType.SYNTHESIS.value, TaskType.SYNTHESIS_PART.value):
             text = task.payload.get('text', '')
             speed = task.payload.get('speed', 1.0)
             total_duration += estimate_duration_seconds(text, speed) * 2
@@ -89,7 +96,13 @@ async def enqueue_synthesis(request: EnqueueSynthesisRequest):
 
     Returns immediately with task ID. Use /queue/task/{task_id} to check status.
     Use /queue/task/{task_id}/result to download the result when completed.
+
+    Long texts are split into parts synthesized in parallel by the queue
+    workers; `fan_out` forces (true) or disables (false) the split.
+    `profile` applies an output profile (see /tts/profiles) to the result.
     """
+    _check_profile(request.profile, request.output_format)
+
     task = QueueTask(
         task_type=TaskType.SYNTHESIS,
         payload=request.dict()
@@ -120,6 +133,7 @@ async def enqueue_batch(request: EnqueueBatchRequest):
     """
     if not request.items:
         raise HTTPException(status_code=400, detail="Items list cannot be empty")
+    _check_profile(request.profile, request.output_format)
 
     task = QueueTask(
         task_type=TaskType.BATCH_SYNTHESIS,
@@ -168,6 +182,8 @@ async def get_task_status(task_id: str):
         created_at=task.created_at.isoformat() if task.created_at else None,
         started_at=task.started_at.isoformat() if task.started_at else None,
         completed_at=task.completed_at.isoformat() if task.completed_at else None,
+        attempts=task.attempts,
+        parent_id=task.parent_id,
         estimated_wait_seconds=wait_time
     )
 
@@ -194,7 +210,7 @@ async def get_task_result(task_id: str):
 
     if filename.endswith('.mp3'):
         media_type = "audio/mpeg"
-    elif filename.endswith('.ogg'):
+    elif filename.endswith('.ogg') or filename.endswith('.opus'):
         media_type = "audio/ogg"
     elif filename.endswith('.flac'):
         media_type = "audio/flac"
@@ -208,12 +224,21 @@ async def get_task_result(task_id: str):
 
 @router.delete("/task/{task_id}")
 async def cancel_task(task_id: str):
-    """Cancel a pending task."""
+    """Cancel a pending task, or stop one that is processing.
+
+    A processing task stops before its next sentence and then becomes cancelled.
+    """
     task = queue.get_task(task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
+    if task.status == TaskStatus.PROCESSING.value:
+        # A worker in another process notices at its next heartbeat and stops.
+        if get_consumer().cancel_task(task_id) or queue.update_task_status(task_id, TaskStatus.CANCELLED):
+            return {"success": True, "message": f"Task {task_id} cancellation requested"}
+        raise HTTPException(status_code=500, detail="Failed to cancel task")
+
     if task.status != TaskStatus.PENDING.value:
         raise HTTPException(
             status_code=400,
@@ -242,14 +267,10 @@ async def list_tasks(
         except ValueError:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid status: {status}. Valid: pending, processing, completed, failed, cancelled"
+                detail=f"Invalid status: {status}. Valid: {', '.join(s.value for s in TaskStatus)}"
             )
 
-    tasks = queue.get_all_tasks(task_status)
-
-    tasks.sort(key=lambda t: t.created_at or "", reverse=True)
-
-    paginated = tasks[offset:offset + limit]
+    paginated = queue.get_all_tasks(task_status, limit=limit, offset=offset, newest_first=True)
 
     return [
         TaskResponse(
@@ -261,7 +282,9 @@ async def list_tasks(
             error_message=t.error_message,
             created_at=t.created_at.isoformat() if t.created_at else None,
             started_at=t.started_at.isoformat() if t.started_at else None,
-            completed_at=t.completed_at.isoformat() if t.completed_at else None
+            completed_at=t.completed_at.isoformat() if t.completed_at else None,
+            attempts=t.attempts,
+            parent_id=t.parent_id
         )
         for t in paginated
     ]
@@ -280,7 +303,9 @@ async def get_queue_stats():
         completed=stats['completed'],
         failed=stats['failed'],
         cancelled=stats['cancelled'],
-        consumer_running=consumer.is_running
+        dead_letter=stats['dead_letter'],
+        consumer_running=consumer.is_running,
+        consumer_workers=consumer.active_workers
     )
 
 
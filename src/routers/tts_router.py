@@ -1,13 +1,26 @@
 from src.core.application import Application
 from src.tts.xtts.manager.tts_manager import TtsManager
 from src.tts.xtts.dto.tts_dto import TtsDto
+from src.tts.xtts.engine.inference_engine import get_engine
+from src.tts.xtts.engine.single_flight import synthesis_key
+from src.tts.xtts.wrapper.audio.sentence_cache import get_sentence_cache
+from src.utils.bounded_executor import BoundedExecutor, ExecutorSaturatedError
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+from src.utils.zip_stream import ZipStreamWriter
+from src.audio.buffer import AudioBuffer
 from src.audio.converter import (
-    convert_audio, get_mime_type, estimate_duration_seconds,
+    encode_audio, get_mime_type, estimate_duration_seconds,
     SUPPORTED_FORMATS, AudioFormat
 )
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import StreamingResponse, JSONResponse
+from src.audio.encoders import encoder_backends, get_stream_encoder
+from src.audio.profiles import PROFILES, OutputProfile, get_profile
+from src.audio.streaming import get_stream_mime_type, STREAM_FORMATS
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 import typing
+import asyncio
+from collections import OrderedDict
 import io
 import os
 import tempfile
@@ -40,6 +53,8 @@ class TtsRequest(BaseModel):
     speed: typing.Optional[float] = Field(default=0.95, ge=0.5, le=2.0)
     do_sample: typing.Optional[bool] = Field(default=True)
     enable_text_splitting: typing.Optional[bool] = Field(default=True)
+    seed: typing.Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
+    deadline_ms: typing.Optional[int] = Field(default=None, gt=0)
 
     # Output format (wav, mp3, ogg, flac)
     output_format: typing.Optional[str] = Field(default="wav")
@@ -62,6 +77,9 @@ class BatchSynthesisRequest(BaseModel):
     default_voice: str = "voice"
     default_lang_code: str = "en"
     output_format: str = "wav"
+    profile: typing.Optional[str] = None
+    deadline_ms: typing.Optional[int] = Field(default=None, gt=0)
+    seed: typing.Optional[int] = Field(default=None, ge=0, le=2**32 - 1)
 
 
 class BatchSynthesisResult(BaseModel):
@@ -112,6 +130,13 @@ class AddSpeakerResponse(BaseModel):
     message: str
 
 
+class BulkAddSpeakersResponse(BaseModel):
+    """Response for bulk add speakers endpoint."""
+    total: int
+    added: int
+    results: typing.List[AddSpeakerResponse]
+
+
 app = Application()
 
 swagger_tags = ['xtts-synthesizer']
@@ -122,19 +147,75 @@ router = APIRouter(
 )
 stream_manager = TtsManager()
 
-def synthesize_audio(dto: TtsDto) -> bytes:
-    return stream_manager.model.synthesize_audio(dto)
+# CPU-bound format conversion runs off the event loop, on its own bounded pool.
+conversion_executor = BoundedExecutor(
+    max_workers=app.envs.CONVERSION_MAX_WORKERS,
+    max_pending=app.envs.CONVERSION_MAX_PENDING,
+    thread_name_prefix="audio-conversion"
+)
+
+# Encoded items kept per batch request so repeated items are not synthesized again.
+BATCH_REUSE_ITEMS = 16
+
+
+async def cancel_on_disconnect(request: Request, token: CancellationToken, interval: float = 0.25) -> None:
+    """Cancel token as soon as the HTTP client disconnects."""
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel()
+            return
+        await asyncio.sleep(interval)
+
+
+async def synthesize_audio(
+    dto: TtsDto,
+    request: typing.Optional[Request] = None,
+    token: typing.Optional[CancellationToken] = None
+) -> typing.Optional[AudioBuffer]:
+    """Run a synthesis on the inference engine without blocking the event loop.
+
+    The synthesis stops between sentences when the client behind `request`
+    disconnects (499) or when `dto.deadline_ms` passes (504).
+    """
+    token = token or CancellationToken.with_timeout_ms(dto.deadline_ms)
+    watcher = asyncio.create_task(cancel_on_disconnect(request, token)) if request is not None else None
+    try:
+        return await asyncio.wrap_future(get_engine().submit(dto, token=token))
+    except OperationCancelledError as e:
+        raise HTTPException(status_code=504 if e.deadline_exceeded else 499, detail=str(e))
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+async def encode_audio_async(
+    audio: AudioBuffer,
+    output_format: str = "wav",
+    profile: typing.Optional[str] = None
+) -> bytes:
+    """Encode PCM audio on the conversion pool without blocking the event loop."""
+    return await asyncio.wrap_future(conversion_executor.submit(encode_audio, audio, output_format, profile))
+
+
+def resolve_profile(profile: typing.Optional[str], output_format: str) -> typing.Optional[OutputProfile]:
+    """Validate an output profile for a format, as a 400 error."""
+    try:
+        return get_profile(profile, output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/synthesize", tags=swagger_tags)
-async def synthesize_stream(dto: TtsDto):
+async def synthesize_stream(dto: TtsDto, request: Request, profile: typing.Optional[str] = None):
     """Synthesize and return WAV audio as a file download (application/octet-stream / audio/wav).
 
     Returns a StreamingResponse with Content-Disposition set to attachment so clients
-    receive a file instead of base64 data.
+    receive a file instead of base64 data. `profile` selects an output profile
+    (see /tts/profiles), e.g. 8 kHz A-law for telephony.
     """
-    audio = synthesize_audio(dto)
+    resolve_profile(profile, "wav")
+    audio = await synthesize_audio(dto, request)
     if audio:
-        buffer = io.BytesIO(audio)
+        buffer = io.BytesIO(await encode_audio_async(audio, "wav", profile))
         buffer.seek(0)
         return StreamingResponse(
             buffer,
@@ -144,6 +225,82 @@ async def synthesize_stream(dto: TtsDto):
 
     raise HTTPException(status_code=500, detail="Failed to synthesize audio")
 
+@router.post("/synthesize/stream", tags=swagger_tags)
+async def synthesize_chunked(
+    dto: TtsDto,
+    request: Request,
+    response_format: str = "wav",
+    output_format: typing.Optional[str] = None,
+    profile: typing.Optional[str] = None
+):
+    """Synthesize and stream audio sentence by sentence (chunked transfer).
+
+    Each sentence is encoded and sent as soon as the model produces it, so
+    playback can start before the whole text is synthesized. The format
+    (`output_format`, or its older name `response_format`) is `wav` (16-bit
+    WAV with a streaming header), `pcm` (raw 16-bit little-endian mono),
+    `mp3`, `ogg` (Vorbis) or `opus` (Opus in Ogg). `profile` selects an output
+    profile (see /tts/profiles); with a telephony profile, `pcm` streams raw
+    G.711 samples. Synthesis stops at the next sentence once the client
+    disconnects or `deadline_ms` passes.
+    """
+    stream_format = output_format or response_format
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported stream format: {stream_format}. Supported: {STREAM_FORMATS}"
+        )
+    output_profile = resolve_profile(profile, stream_format)
+    try:
+        encoder = get_stream_encoder(stream_format, sample_rate=24000, profile=output_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not stream_manager.model.model_manager.is_loaded():
+        raise HTTPException(status_code=503, detail="Model is not loaded")
+
+    embedding_manager = stream_manager.model.embedding_manager
+    if embedding_manager is None or not embedding_manager.has_speaker(dto.voice):
+        raise HTTPException(status_code=404, detail=f"Speaker '{dto.voice}' not found")
+
+    # Submit before the response starts so saturation is reported as a 503.
+    token = CancellationToken.with_timeout_ms(dto.deadline_ms)
+    chunks = get_engine().submit_stream(dto, token=token)
+
+    def audio_chunks() -> typing.Iterator[bytes]:
+        try:
+            for chunk in chunks:
+                data = encoder.write(chunk)
+                if data:
+                    yield data
+            tail = encoder.close()
+            if tail:
+                yield tail
+        except GeneratorExit:
+            # The client disconnected: stop synthesizing at the next sentence.
+            token.cancel()
+            raise
+
+    async def watched_chunks() -> typing.AsyncIterator[bytes]:
+        # Starlette never closes the sync generator, so watch the connection here.
+        watcher = asyncio.create_task(cancel_on_disconnect(request, token))
+        try:
+            async for data in iterate_in_threadpool(audio_chunks()):
+                yield data
+        finally:
+            watcher.cancel()
+            token.cancel()
+
+    return StreamingResponse(
+        watched_chunks(),
+        media_type=get_stream_mime_type(
+            stream_format,
+            sample_rate=output_profile.sample_rate if output_profile else 24000,
+            companding=output_profile.companding if output_profile else None
+        ),
+        headers={"Content-Disposition": f'inline; filename="synthesis.{stream_format}"'},
+    )
+
 @router.get("/voices", tags=swagger_tags, response_model=list[str])
 async def list_speakers():
     print(f"instance id: {id(stream_manager)}")
@@ -151,7 +308,7 @@ async def list_speakers():
 
 
 @router.post("/audio/speech", tags=swagger_tags)
-async def audio_speech(payload: typing.Dict[str, typing.Any]):
+async def audio_speech(payload: typing.Dict[str, typing.Any], http_request: Request):
     """Compatibility endpoint for external clients.
 
     Accepts payloads like the NestJS client (keys: text_input, voice_name, response_format, download_format, ...)
@@ -188,18 +345,16 @@ async def audio_speech(payload: typing.Dict[str, typing.Any]):
         top_p=request.top_p,
         speed=request.speed,
         do_sample=request.do_sample,
-        enable_text_splitting=request.enable_text_splitting
+        enable_text_splitting=request.enable_text_splitting,
+        seed=request.seed,
+        deadline_ms=request.deadline_ms
     )
 
-    audio = synthesize_audio(dto)
+    audio = await synthesize_audio(dto, http_request)
 
-    # If model returns JSON-like response, forward as JSON
-    if isinstance(audio, dict):
-        return JSONResponse(content=audio)
-
-    if isinstance(audio, (bytes, bytearray)):
+    if audio:
         # Always return WAV bytes (no format conversion) to remain compatible with the client
-        buffer = io.BytesIO(audio)
+        buffer = io.BytesIO(await encode_audio_async(audio, "wav"))
         buffer.seek(0)
         return StreamingResponse(
             buffer,
@@ -238,19 +393,28 @@ async def get_model_info():
 
 
 @router.post("/synthesize/with-format", tags=swagger_tags)
-async def synthesize_with_format(dto: TtsDto, output_format: str = "wav"):
-    """Synthesize audio and return in the specified format (wav, mp3, ogg, flac)."""
+async def synthesize_with_format(
+    dto: TtsDto,
+    request: Request,
+    output_format: str = "wav",
+    profile: typing.Optional[str] = None
+):
+    """Synthesize audio and return in the specified format (wav, mp3, ogg, opus, flac).
+
+    `profile` selects an output profile (see /tts/profiles).
+    """
     if output_format not in SUPPORTED_FORMATS:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported format: {output_format}. Supported: {SUPPORTED_FORMATS}"
         )
+    resolve_profile(profile, output_format)
 
-    audio = synthesize_audio(dto)
+    audio = await synthesize_audio(dto, request)
     if not audio:
         raise HTTPException(status_code=500, detail="Failed to synthesize audio")
 
-    converted = convert_audio(audio, output_format)
+    converted = await encode_audio_async(audio, output_format, profile)
     buffer = io.BytesIO(converted)
     buffer.seek(0)
 
@@ -307,10 +471,11 @@ async def add_speaker(
             content = await audio_file.read()
             temp_file.write(content)
 
-        success = stream_manager.model.embedding_manager.add_speaker(
+        success = await asyncio.wrap_future(get_engine().submit_call(
+            stream_manager.model.embedding_manager.add_speaker,
             speaker_name=speaker_name,
             audio_path=temp_path
-        )
+        ))
 
         if success:
             dest_path = os.path.join(speakers_dir, f"{speaker_name.lower()}.wav")
@@ -327,7 +492,7 @@ async def add_speaker(
                 detail=f"Failed to process audio for speaker '{speaker_name}'"
             )
 
-    except HTTPException:
+    except (HTTPException, ExecutorSaturatedError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -336,6 +501,71 @@ async def add_speaker(
             os.unlink(temp_path)
 
 
+@router.post("/speakers/bulk", tags=swagger_tags, response_model=BulkAddSpeakersResponse)
+async def add_speakers_bulk(
+    audio_files: typing.List[UploadFile] = File(..., description="WAV audio files; each file name (without extension) is the speaker name")
+):
+    """Add many speakers/voices at once.
+
+    Reference files are read and resampled in parallel; the encoder passes
+    run one at a time on the inference engine worker that handles the request.
+    """
+    uploads: typing.Dict[str, UploadFile] = {}
+    for audio_file in audio_files:
+        name, ext = os.path.splitext(os.path.basename(audio_file.filename or ""))
+        if ext.lower() != '.wav' or not name:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only WAV files are supported: '{audio_file.filename}'"
+            )
+        uploads[name] = audio_file
+
+    speakers_dir = stream_manager.model.embedding_manager.get_speakers_dir()
+
+    temp_paths: typing.Dict[str, str] = {}
+    try:
+        for name, audio_file in uploads.items():
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+                temp_paths[name] = temp_file.name
+                temp_file.write(await audio_file.read())
+
+        added = await asyncio.wrap_future(get_engine().submit_call(
+            stream_manager.model.embedding_manager.add_speakers,
+            temp_paths
+        ))
+
+        results = []
+        for name, temp_path in temp_paths.items():
+            if added.get(name):
+                shutil.copy2(temp_path, os.path.join(speakers_dir, f"{name.lower()}.wav"))
+                results.append(AddSpeakerResponse(
+                    success=True,
+                    speaker_name=name,
+                    message=f"Speaker '{name}' added successfully"
+                ))
+            else:
+                results.append(AddSpeakerResponse(
+                    success=False,
+                    speaker_name=name,
+                    message=f"Failed to process audio for speaker '{name}'"
+                ))
+
+        return BulkAddSpeakersResponse(
+            total=len(results),
+            added=sum(1 for result in results if result.success),
+            results=results
+        )
+
+    except (HTTPException, ExecutorSaturatedError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
 @router.delete("/speakers/{speaker_name}", tags=swagger_tags)
 async def remove_speaker(speaker_name: str):
     """Remove a speaker/voice.
@@ -354,86 +584,126 @@ async def remove_speaker(speaker_name: str):
 
 
 @router.post("/speakers/reload", tags=swagger_tags)
-async def reload_speakers():
-    """Reload all speaker embeddings from the speakers directory."""
-    stream_manager.model.reload_all_speaker_embeddings()
+async def reload_speakers(full: bool = False):
+    """Reload speaker embeddings from the speakers directory.
+
+    Only added, changed and removed reference files are applied unless
+    `full=true`, which rebuilds every embedding.
+    """
+    changes = await asyncio.wrap_future(get_engine().submit_call(
+        stream_manager.model.reload_all_speaker_embeddings,
+        full=full
+    ))
     speakers = stream_manager.model.list_speakers()
 
     return {
         "success": True,
         "message": "Speakers reloaded successfully",
         "speakers_count": len(speakers),
-        "speakers": speakers
+        "speakers": speakers,
+        "changes": changes
     }
 
 
 @router.post("/batch/synthesize", tags=swagger_tags)
-async def batch_synthesize(request: BatchSynthesisRequest):
+async def batch_synthesize(request: BatchSynthesisRequest, http_request: Request):
     """Synthesize multiple texts in a single request.
 
-    Returns a ZIP file containing all generated audio files.
+    Returns a ZIP file containing all generated audio files, streamed entry by
+    entry as each item is synthesized, with `manifest.json` last. Once
+    `deadline_ms` passes, the remaining items are reported as failed in the
+    manifest and the archive is completed. The batch is abandoned when the
+    client disconnects. `profile` applies an output profile (see
+    /tts/profiles) to every item.
     """
-    import zipfile
-
-    results = []
-    audio_files = []
-
-    for idx, item in enumerate(request.items):
-        voice = item.voice or request.default_voice
-        lang_code = item.lang_code or request.default_lang_code
-
-        try:
-            dto = TtsDto(
-                text=item.text,
-                voice=voice,
-                lang_code=lang_code
-            )
-
-            audio = synthesize_audio(dto)
-            if audio:
-                converted = convert_audio(audio, request.output_format)
-                audio_files.append((f"audio_{idx:03d}.{request.output_format}", converted))
-
-                results.append(BatchSynthesisResult(
-                    index=idx,
-                    success=True,
-                    text=item.text[:50] + "..." if len(item.text) > 50 else item.text,
-                    duration_seconds=estimate_duration_seconds(item.text)
-                ))
-            else:
+    resolve_profile(request.profile, request.output_format)
+    token = CancellationToken.with_timeout_ms(request.deadline_ms)
+
+    async def archive_chunks() -> typing.AsyncIterator[bytes]:
+        results = []
+        archive = ZipStreamWriter()
+        # Seeded repeated items reuse the audio of a recent identical item instead of being synthesized again.
+        recent: "OrderedDict[str, typing.Tuple[bytes, float]]" = OrderedDict()
+
+        for idx, item in enumerate(request.items):
+            voice = item.voice or request.default_voice
+            lang_code = item.lang_code or request.default_lang_code
+
+            try:
+                dto = TtsDto(
+                    text=item.text,
+                    voice=voice,
+                    lang_code=lang_code,
+                    seed=request.seed
+                )
+
+                # Only deterministic items can reuse audio; unseeded ones are sampled anew.
+                key = synthesis_key(dto) if dto.is_deterministic() else f"item-{idx}"
+                if key in recent:
+                    recent.move_to_end(key)
+                else:
+                    audio = await synthesize_audio(dto, http_request, token)
+                    if audio:
+                        converted = await encode_audio_async(audio, request.output_format, request.profile)
+                        recent[key] = (converted, audio.duration_seconds)
+                        if len(recent) > BATCH_REUSE_ITEMS:
+                            recent.popitem(last=False)
+
+                if key in recent:
+                    converted, duration_seconds = recent[key]
+                    await asyncio.wrap_future(conversion_executor.submit(
+                        archive.write, f"audio_{idx:03d}.{request.output_format}", converted
+                    ))
+                    yield archive.drain()
+
+                    results.append(BatchSynthesisResult(
+                        index=idx,
+                        success=True,
+                        text=item.text[:50] + "..." if len(item.text) > 50 else item.text,
+                        duration_seconds=round(duration_seconds, 2)
+                    ))
+                else:
+                    results.append(BatchSynthesisResult(
+                        index=idx,
+                        success=False,
+                        text=item.text[:50] + "..." if len(item.text) > 50 else item.text,
+                        error="Synthesis returned empty audio"
+                    ))
+
+            except HTTPException as e:
+                if e.status_code != 504:
+                    # Client gone: nobody reads the archive, abandon it.
+                    app.logger.info("Batch synthesis abandoned at item %d: %s", idx, e.detail)
+                    return
+                # Deadline passed: fail the remaining items but still finish the archive.
+                app.logger.info("Batch synthesis deadline exceeded at item %d", idx)
+                for remaining in range(idx, len(request.items)):
+                    text = request.items[remaining].text
+                    results.append(BatchSynthesisResult(
+                        index=remaining,
+                        success=False,
+                        text=text[:50] + "..." if len(text) > 50 else text,
+                        error="deadline exceeded"
+                    ))
+                break
+            except Exception as e:
                 results.append(BatchSynthesisResult(
                     index=idx,
                     success=False,
                     text=item.text[:50] + "..." if len(item.text) > 50 else item.text,
-                    error="Synthesis returned empty audio"
+                    error=str(e)
                 ))
 
-        except Exception as e:
-            results.append(BatchSynthesisResult(
-                index=idx,
-                success=False,
-                text=item.text[:50] + "..." if len(item.text) > 50 else item.text,
-                error=str(e)
-            ))
-
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filename, audio_data in audio_files:
-            zip_file.writestr(filename, audio_data)
-
-        import json
-        manifest = {
+        archive.write_json("manifest.json", {
             "total": len(request.items),
             "successful": sum(1 for r in results if r.success),
             "failed": sum(1 for r in results if not r.success),
             "results": [r.dict() for r in results]
-        }
-        zip_file.writestr("manifest.json", json.dumps(manifest, indent=2))
-
-    zip_buffer.seek(0)
+        })
+        yield archive.close()
 
     return StreamingResponse(
-        zip_buffer,
+        archive_chunks(),
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="batch_synthesis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip"'
@@ -441,6 +711,25 @@ async def batch_synthesize(request: BatchSynthesisRequest):
     )
 
 
+@router.get("/engine/stats", tags=swagger_tags)
+async def engine_stats():
+    """Get inference engine statistics (workers, pending and active work items)."""
+    return get_engine().stats()
+
+
+@router.get("/cache/stats", tags=swagger_tags)
+async def sentence_cache_stats():
+    """Get sentence audio cache statistics (hits, misses, evictions, usage)."""
+    return get_sentence_cache().stats()
+
+
+@router.delete("/cache", tags=swagger_tags)
+async def clear_sentence_cache():
+    """Drop every entry from the sentence audio cache."""
+    get_sentence_cache().clear()
+    return {"success": True, "message": "Sentence cache cleared"}
+
+
 @router.get("/languages", tags=swagger_tags)
 async def list_languages():
     """List all supported languages with their codes and names."""
@@ -465,6 +754,22 @@ async def list_languages():
     return {"languages": languages, "count": len(languages)}
 
 
+@router.get("/profiles", tags=swagger_tags)
+async def list_profiles():
+    """List output profiles (sample rate and encoding applied after synthesis)."""
+    profiles = [
+        {
+            "profile": profile.name,
+            "sample_rate": profile.sample_rate,
+            "encoding": profile.companding or "pcm16",
+            "formats": [fmt for fmt in SUPPORTED_FORMATS if profile.supports(fmt)],
+            "description": profile.description,
+        }
+        for profile in PROFILES.values()
+    ]
+    return {"profiles": profiles, "count": len(profiles)}
+
+
 @router.get("/formats", tags=swagger_tags)
 async def list_formats():
     """List all supported audio output formats."""
@@ -472,6 +777,10 @@ async def list_formats():
         {"format": "wav", "mime_type": "audio/wav", "description": "Uncompressed, highest quality"},
         {"format": "mp3", "mime_type": "audio/mpeg", "description": "Compressed, good quality, small size"},
         {"format": "ogg", "mime_type": "audio/ogg", "description": "Open format, good compression"},
+        {"format": "opus", "mime_type": "audio/ogg", "description": "Opus in Ogg, best compression for speech"},
         {"format": "flac", "mime_type": "audio/flac", "description": "Lossless compression"},
     ]
+    backends = encoder_backends()
+    for entry in formats:
+        entry["encoder"] = backends.get(entry["format"])
     return {"formats": formats, "count": len(formats)}
@@ -0,0 +1,73 @@
+"""Packing of adjacent clauses into chunks that fit one inference call.
+
+Every `model.inference` call has a fixed overhead (conditioning, GPT warm-up,
+HiFi-GAN decode), so synthesizing a paragraph clause by clause is much slower
+than synthesizing it in a few larger pieces. Clauses are merged greedily, in
+order, while the chunk stays within the language's XTTS character limit
+(`VoiceBpeTokenizer.char_limits`), which is the length the model itself
+accepts without splitting the text again.
+
+A chunk always ends where one of its clauses ended, so the punctuation of
+that boundary (comma, period, question mark...) is kept as the last
+character of the chunk and still decides the pause inserted after it.
+Boundaries inside a chunk are spoken by the model with its own prosody.
+"""
+from dataclasses import dataclass
+from typing import Any, List
+
+DEFAULT_CHAR_LIMIT = 250
+
+# Full-width punctuation is not followed by a space.
+_NO_SPACE_AFTER = "。！？；，、"
+
+
+@dataclass
+class TextChunk:
+    """Consecutive clauses synthesized by a single inference call."""
+    text: str
+    clauses: int
+    # False for a single clause longer than the limit; the model may split it.
+    fits: bool = True
+
+
+def char_limit(model: Any, lang: str) -> int:
+    """The XTTS character limit of a language, from the model's tokenizer."""
+    tokenizer = getattr(model, "tokenizer", None)
+    limits = getattr(tokenizer, "char_limits", None) or {}
+    return limits.get(lang.split("-")[0], DEFAULT_CHAR_LIMIT)
+
+
+def _join(left: str, right: str) -> str:
+    return left + right if left.endswith(tuple(_NO_SPACE_AFTER)) else f"{left} {right}"
+
+
+def pack_clauses(clauses: List[str], max_chars: int) -> List[TextChunk]:
+    """Merge adjacent clauses into the fewest chunks of at most `max_chars` characters.
+
+    A clause longer than `max_chars` becomes a chunk of its own with
+    `fits=False`. Greedy packing is optimal here: chunks must stay in order,
+    and extending a chunk as far as possible never increases the count.
+    """
+    chunks: List[TextChunk] = []
+    current = None
+    for clause in clauses:
+        clause = clause.strip()
+        if not clause:
+            continue
+        if current is not None:
+            joined = _join(current.text, clause)
+            if len(joined) <= max_chars:
+                current.text = joined
+                current.clauses += 1
+                continue
+        current = TextChunk(text=clause, clauses=1, fits=len(clause) <= max_chars)
+        chunks.append(current)
+    return chunks
+
+
+def unpacked(clauses: List[str], max_chars: int) -> List[TextChunk]:
+    """One chunk per clause, i.e. no packing."""
+    return [
+        TextChunk(text=clause, clauses=1, fits=len(clause) <= max_chars)
+        for clause in clauses if clause.strip()
+    ]
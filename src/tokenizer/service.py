@@ -2,11 +2,17 @@ import spacy
 import logging
 import re
 from enum import Enum
+from functools import lru_cache
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-nlp = spacy.load("pt_core_news_sm")
-nlp.add_pipe("sentencizer")
+
+@lru_cache(maxsize=1)
+def nlp():
+    """Portuguese spaCy model, loaded on first use instead of at import time."""
+    model = spacy.load("pt_core_news_sm")
+    model.add_pipe("sentencizer")
+    return model
 
 class SplitType(Enum):
     COMMA = 'COMMA'
@@ -34,7 +40,7 @@ class Tokenizer:
             return [text]
         
         text_splits = []
-        doc = nlp(text)
+        doc = nlp()(text)
         
         for sent in doc.sents:
             sentence = str(sent).strip()
@@ -52,7 +58,7 @@ class Tokenizer:
 
     def is_grammatically_correct(self, sentence):
         """Verifica se a sentença é gramaticalmente correta usando o SpaCy."""
-        doc = nlp(sentence)
+        doc = nlp()(sentence)
         result = len(doc) > 1 and all(token.dep_ != 'punct' for token in doc)
         logger.info(f"Sentença '{sentence}' é gramaticalmente correta: {result}")
         return result
@@ -61,7 +67,7 @@ class Tokenizer:
         """Divisão inteligente considerando pausas naturais e terminando com vírgula."""
         logger.info(f"Iniciando divisão inteligente para: '{sentence}'")
         
-        doc = nlp(sentence)
+        doc = nlp()(sentence)
         current_part = ""
         text_splits = []
 
@@ -0,0 +1,119 @@
+"""Sentence splitting with one cached, lightweight spaCy pipeline per language.
+
+A pipeline is a blank `spacy.blank(lang)` tokenizer plus the rule-based
+`sentencizer`: no statistical model is loaded, and the language's tokenizer
+exceptions keep abbreviations such as "Dr." or "Sr." from ending a sentence.
+Pipelines are created on the first text of their language and reused.
+
+Texts that are short, or that hold a single sentence, take a pure-regex fast
+path and never touch spaCy. Languages spaCy cannot build a tokenizer for
+(missing optional dependencies) use the multi-language "xx" pipeline; without
+spaCy installed everything goes through the regex.
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.core.application import Application
+
+# XTTS language codes whose spaCy code differs.
+_SPACY_CODES = {"zh-cn": "zh"}
+
+_TERMINATORS = ".!?;。！？；…"
+# Full-width (CJK) punctuation is not followed by a space.
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;…])\s+|(?<=[。！？；])\s*")
+# Terminal punctuation followed by more text: the text has several sentences.
+_INNER_BOUNDARY = re.compile(rf"[{_TERMINATORS}]\s*\S")
+_CLAUSE_BREAK = re.compile(r"(?<=[,;])\s+|(?<=[，；、])")
+
+
+class SentenceSplitter:
+    """Registry of per-language sentence pipelines."""
+
+    def __init__(self, fast_path_chars: int = 200):
+        self.fast_path_chars = fast_path_chars
+        self._pipelines: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._spacy_missing = False
+
+    def split(self, text: str, lang: str = "en") -> List[str]:
+        """Split text into sentences, in order, without empty entries."""
+        text = text.strip()
+        if not text:
+            return []
+        if not _INNER_BOUNDARY.search(text.rstrip(_TERMINATORS)):
+            return [text]
+        if len(text) <= self.fast_path_chars:
+            return self._split_regex(text)
+
+        nlp = self.get_pipeline(lang)
+        if nlp is None:
+            return self._split_regex(text)
+        return [sentence.text.strip() for sentence in nlp(text).sents if sentence.text.strip()]
+
+    def split_clauses(self, text: str, lang: str = "en") -> List[str]:
+        """Split text into sentences, then each sentence at commas and semicolons."""
+        clauses = []
+        for sentence in self.split(text, lang):
+            clauses.extend(clause for clause in _CLAUSE_BREAK.split(sentence) if clause.strip())
+        return clauses
+
+    def get_pipeline(self, lang: str) -> Optional[Any]:
+        """The cached pipeline of a language, created on first use; None without spaCy."""
+        code = _SPACY_CODES.get(lang, lang)
+        nlp = self._pipelines.get(code)
+        if nlp is not None or self._spacy_missing:
+            return nlp
+
+        with self._lock:
+            nlp = self._pipelines.get(code)
+            if nlp is None and not self._spacy_missing:
+                nlp = self._create_pipeline(code)
+                if nlp is not None:
+                    self._pipelines[code] = nlp
+        return nlp
+
+    @property
+    def languages(self) -> List[str]:
+        """Languages whose pipeline has been created."""
+        return list(self._pipelines)
+
+    def _create_pipeline(self, code: str) -> Optional[Any]:
+        try:
+            import spacy
+        except ImportError:
+            print("[SentenceSplitter] spaCy not installed, using regex splitting")
+            self._spacy_missing = True
+            return None
+
+        try:
+            nlp = spacy.blank(code)
+        except Exception as e:
+            if code == "xx":
+                raise
+            print(f"[SentenceSplitter] No spaCy tokenizer for '{code}' ({e}), using the multi-language one")
+            fallback = self._pipelines.get("xx") or self._create_pipeline("xx")
+            self._pipelines["xx"] = fallback
+            return fallback
+
+        if "sentencizer" not in nlp.pipe_names:
+            nlp.add_pipe("sentencizer")
+        return nlp
+
+    @staticmethod
+    def _split_regex(text: str) -> List[str]:
+        return [sentence for sentence in _SENTENCE_BREAK.split(text) if sentence]
+
+
+_splitter_instance: Optional[SentenceSplitter] = None
+_splitter_lock = threading.Lock()
+
+
+def get_sentence_splitter() -> SentenceSplitter:
+    """Get or create the process-wide sentence splitter."""
+    global _splitter_instance
+    if _splitter_instance is None:
+        with _splitter_lock:
+            if _splitter_instance is None:
+                _splitter_instance = SentenceSplitter(Application().envs.SENTENCE_FAST_PATH_CHARS)
+    return _splitter_instance
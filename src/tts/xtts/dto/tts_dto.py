@@ -57,3 +57,18 @@ class TtsDto(BaseModel):
         default=True,
         description="Enable automatic text splitting for long sentences"
     )
+    seed: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=2**32 - 1,
+        description="Random seed. The same text, voice, parameters and seed give identical audio"
+    )
+    deadline_ms: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Give up after this many milliseconds; remaining sentences are not synthesized"
+    )
+
+    def is_deterministic(self) -> bool:
+        """Whether the audio is fully determined by the request: seeded, or sampling disabled."""
+        return self.seed is not None or not self.do_sample
@@ -0,0 +1,166 @@
+"""Cross-request micro-batching of sentence inference.
+
+Sentences submitted by concurrent synthesis requests are collected for up to
+`max_wait_ms`, grouped by language, sampling parameters and token length, and
+run through `infer_batch` in groups of at most `max_batch_size`. Each sentence
+gets its own future, so results are routed back to the request that sent it.
+
+There is no batching thread: a synthesis waiting for its sentences (on an
+inference engine worker) collects and runs the pending batches itself, one
+collector at a time. Batched model calls therefore run on engine workers and
+stay within the engine's concurrency bound.
+"""
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, wait as wait_futures
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.application import Application
+from src.tts.xtts.wrapper.model.model_manager import XttsModelManager
+from src.tts.xtts.wrapper.audio.batch_inference import (
+    SentenceJob, tokenize_job, infer_single, infer_batch
+)
+
+
+class SentenceBatchScheduler:
+    """Collects sentence jobs and runs them in batches on the threads waiting for them."""
+
+    # How long a waiter sleeps while another thread is collecting.
+    POLL_SECONDS = 0.01
+
+    def __init__(self, model_provider: Callable, max_batch_size: int, max_wait_ms: float):
+        self.app = Application()
+        self.model_provider = model_provider
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[SentenceJob]" = queue.Queue()
+        self._collector = threading.Lock()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+
+    def stop(self) -> None:
+        """Cancel the sentences still waiting to be batched."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            job.future.cancel()
+
+    def submit(self, job: SentenceJob) -> Future:
+        """Queue a sentence for batched inference; wait for it with `result`."""
+        self._queue.put(job)
+        return job.future
+
+    def result(self, future: Future) -> Any:
+        """Wait for a submitted sentence, running pending batches on this thread meanwhile."""
+        while not future.done():
+            if self._collector.acquire(blocking=False):
+                try:
+                    self._run_once()
+                finally:
+                    self._collector.release()
+            else:
+                wait_futures([future], timeout=self.POLL_SECONDS)
+        return future.result()
+
+    def stats(self) -> Dict[str, float]:
+        """Get batching statistics."""
+        with self._lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'batches': self._batches,
+                'items': self._items,
+                'avg_batch_size': round(self._items / self._batches, 2) if self._batches else 0.0,
+            }
+
+    def _run_once(self) -> None:
+        """Collect one round of queued sentences and run it. Collector lock must be held."""
+        try:
+            job = self._queue.get(timeout=self.POLL_SECONDS)
+        except queue.Empty:
+            return
+
+        model = self.model_provider()
+        groups: "OrderedDict[Optional[Tuple], List[SentenceJob]]" = OrderedDict()
+        solo: List[SentenceJob] = []
+        self._add(model, job, groups, solo)
+
+        deadline = time.monotonic() + self.max_wait
+        while not any(len(jobs) >= self.max_batch_size for jobs in groups.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._add(model, self._queue.get(timeout=remaining), groups, solo)
+            except queue.Empty:
+                break
+
+        for job in solo:
+            self._run(model, [job])
+        for jobs in groups.values():
+            for start in range(0, len(jobs), self.max_batch_size):
+                self._run(model, jobs[start:start + self.max_batch_size])
+
+    def _add(self, model, job: SentenceJob, groups: Dict, solo: List[SentenceJob]) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.text_tokens = tokenize_job(model, job)
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+
+        # Seeded jobs run alone so their sampling sees only their own RNG state.
+        if job.text_tokens is None or job.seed is not None or self.max_batch_size == 1:
+            solo.append(job)
+            return
+        key = job.sampling_key() + (job.text_tokens.shape[-1],)
+        groups.setdefault(key, []).append(job)
+
+    def _run(self, model, jobs: List[SentenceJob]) -> None:
+        try:
+            if len(jobs) == 1:
+                wavs = [infer_single(model, jobs[0])]
+            else:
+                wavs = infer_batch(model, jobs)
+        except Exception as e:
+            self.app.logger.error("[SentenceBatchScheduler] Batch of %d failed: %s", len(jobs), e)
+            for job in jobs:
+                job.future.set_exception(e)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(jobs)
+        for job, wav in zip(jobs, wavs):
+            job.future.set_result(wav)
+
+
+_scheduler_instance: Optional[SentenceBatchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_batch_scheduler() -> Optional[SentenceBatchScheduler]:
+    """Get the global batch scheduler, or None when batching is disabled.
+
+    Batching is enabled with INFERENCE_MAX_BATCH_SIZE > 1. Cross-request batches
+    only form when several requests run at once (INFERENCE_MAX_WORKERS > 1).
+    """
+    global _scheduler_instance
+    app = Application()
+    if app.envs.INFERENCE_MAX_BATCH_SIZE <= 1:
+        return None
+
+    with _scheduler_lock:
+        if _scheduler_instance is None:
+            _scheduler_instance = SentenceBatchScheduler(
+                model_provider=XttsModelManager().get_model,
+                max_batch_size=app.envs.INFERENCE_MAX_BATCH_SIZE,
+                max_wait_ms=app.envs.INFERENCE_MAX_WAIT_MS,
+            )
+        return _scheduler_instance
@@ -0,0 +1,333 @@
+"""Inference engine - single owner of the XTTS model for every front-end.
+
+The REST API, the queue consumer and the desktop service all submit work here
+instead of calling `ModelWrapper` directly. Work items are ordered by priority
+(then FIFO) and executed on a dedicated pool of worker threads, so concurrency
+on the model is bounded and scheduling policy lives in one place.
+"""
+import itertools
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.audio.buffer import AudioBuffer
+from src.core.application import Application
+from src.tts.xtts.dto.tts_dto import TtsDto
+from src.tts.xtts.manager.tts_manager import TtsManager
+from src.tts.xtts.wrapper.model_wrapper import ModelWrapper
+from src.tts.xtts.engine.batch_scheduler import get_batch_scheduler
+from src.tts.xtts.engine.single_flight import SingleFlight, synthesis_key
+from src.utils.bounded_executor import ExecutorSaturatedError
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a work item. Lower values run first."""
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+@dataclass(order=True)
+class _WorkItem:
+    priority: int
+    sequence: int
+    fn: Callable[..., Any] = field(compare=False)
+    future: Future = field(compare=False)
+
+
+# Sentinel used to close a streaming channel.
+_END_OF_STREAM = object()
+
+
+class InferenceEngine:
+    """Schedules all model work on a dedicated, bounded pool of worker threads.
+
+    Every call returns a `concurrent.futures.Future`; callers decide whether to
+    block on it (queue consumer, desktop) or await it (API). Interactive
+    submissions are rejected with ExecutorSaturatedError once `max_pending`
+    items are waiting; background work is throttled by its own consumer.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(InferenceEngine, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        if self._initialized:
+            return
+
+        self.app = Application()
+        self.max_workers = max(1, max_workers or self.app.envs.INFERENCE_MAX_WORKERS)
+        self.max_pending = max_pending if max_pending is not None else self.app.envs.INFERENCE_MAX_PENDING
+        self._queue: "queue.PriorityQueue[_WorkItem]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._state_lock = threading.Lock()
+        self._running = False
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._avg_seconds = 5.0
+        self._single_flight = SingleFlight() if self.app.envs.SYNTHESIS_COALESCING else None
+
+        self._initialized = True
+
+    @property
+    def model(self) -> ModelWrapper:
+        """The model wrapper owned by the engine."""
+        return TtsManager.get_instance().model
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the worker threads are running."""
+        return self._running and any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> bool:
+        """Start the worker threads."""
+        with self._state_lock:
+            if self._running:
+                return False
+
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._worker_loop, name=f"inference-worker-{i}", daemon=True)
+                for i in range(self.max_workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+        self.app.logger.info("[InferenceEngine] Started with %d worker(s)", self.max_workers)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker threads. Pending work items are cancelled."""
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            threads = self._threads
+            self._threads = []
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            item.future.cancel()
+
+        for thread in threads:
+            thread.join(timeout=timeout)
+        scheduler = get_batch_scheduler()
+        if scheduler:
+            scheduler.stop()
+        self.app.logger.info("[InferenceEngine] Stopped")
+
+    def submit_call(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        **kwargs: Any
+    ) -> Future:
+        """Schedule an arbitrary call against the model and return its future."""
+        if not self._running:
+            self.start()
+
+        if priority <= Priority.INTERACTIVE and self._queue.qsize() >= self.max_pending:
+            with self._state_lock:
+                self._rejected += 1
+            raise ExecutorSaturatedError(
+                "Inference engine is saturated, try again later",
+                retry_after=self.estimate_wait_seconds()
+            )
+
+        future: Future = Future()
+        item = _WorkItem(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            fn=lambda: fn(*args, **kwargs),
+            future=future,
+        )
+        self._queue.put(item)
+        return future
+
+    def submit(
+        self,
+        dto: TtsDto,
+        priority: Priority = Priority.INTERACTIVE,
+        token: Optional[CancellationToken] = None
+    ) -> Future:
+        """Schedule a synthesis. The future resolves to an AudioBuffer (float32 PCM),
+        or None if synthesis failed; callers encode it for their output.
+
+        Identical deterministic requests (seeded, or without sampling) already
+        in flight are coalesced: the caller attaches to the running synthesis
+        and shares its (read-only) result. Sampled requests without a seed
+        always run on their own.
+
+        The synthesis stops between sentences, failing with
+        OperationCancelledError, once `token` is cancelled (or, without a token,
+        once `dto.deadline_ms` has passed). Cancelling the future cancels the token.
+        """
+        if token is None:
+            token = CancellationToken.with_timeout_ms(dto.deadline_ms)
+        if self._single_flight is not None and dto.is_deterministic():
+            return self._single_flight.do(
+                synthesis_key(dto),
+                lambda shared: self.submit_call(self.model.synthesize_pcm, dto, shared, priority=priority),
+                token
+            )
+        future = self.submit_call(self.model.synthesize_pcm, dto, token, priority=priority)
+        future.add_done_callback(lambda f: token.cancel() if f.cancelled() else None)
+        return future
+
+    def synthesize(
+        self,
+        dto: TtsDto,
+        priority: Priority = Priority.INTERACTIVE,
+        token: Optional[CancellationToken] = None
+    ) -> Optional[AudioBuffer]:
+        """Schedule a synthesis and block until it completes."""
+        return self.submit(dto, priority=priority, token=token).result()
+
+    def submit_stream(
+        self,
+        dto: TtsDto,
+        priority: Priority = Priority.INTERACTIVE,
+        token: Optional[CancellationToken] = None
+    ) -> Iterator[np.ndarray]:
+        """Schedule a streaming synthesis and return an iterator over its chunks.
+
+        The sentence loop runs on an engine worker; chunks are handed over through
+        an unbounded channel, so the consumer never holds up the model. Cancel
+        `token` when the consumer goes away to stop at the next sentence.
+        """
+        if token is None:
+            token = CancellationToken.with_timeout_ms(dto.deadline_ms)
+        channel: "queue.Queue[Any]" = queue.Queue()
+
+        def produce() -> None:
+            try:
+                for chunk in self.model.synthesize_audio_stream(dto, token):
+                    channel.put(chunk)
+            except Exception as e:
+                channel.put(e)
+            finally:
+                channel.put(_END_OF_STREAM)
+
+        future = self.submit_call(produce, priority=priority)
+        future.add_done_callback(
+            lambda f: channel.put(_END_OF_STREAM) if f.cancelled() else None
+        )
+
+        def consume() -> Iterator[np.ndarray]:
+            try:
+                while True:
+                    chunk = channel.get()
+                    if chunk is _END_OF_STREAM:
+                        return
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+            except GeneratorExit:
+                # Closed before the end: the consumer went away.
+                token.cancel()
+                raise
+
+        return consume()
+
+    def estimate_wait_seconds(self) -> int:
+        """Estimate how long the current backlog takes to drain."""
+        with self._state_lock:
+            backlog = self._queue.qsize() + self._active
+            return math.ceil(self._avg_seconds * max(1, backlog) / self.max_workers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get engine statistics."""
+        scheduler = get_batch_scheduler()
+        embedding_manager = self.model.embedding_manager
+        with self._state_lock:
+            return {
+                'batching': scheduler.stats() if scheduler else None,
+                'coalescing': self._single_flight.stats() if self._single_flight else None,
+                'speakers': embedding_manager.stats() if embedding_manager else None,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._queue.qsize(),
+                'active': self._active,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'cancelled': self._cancelled,
+            }
+
+    def _worker_loop(self) -> None:
+        """Worker loop: run work items in priority order."""
+        while self._running:
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            if not item.future.set_running_or_notify_cancel():
+                continue
+
+            with self._state_lock:
+                self._active += 1
+            start = time.monotonic()
+            try:
+                result = item.fn()
+            except OperationCancelledError as e:
+                item.future.set_exception(e)
+                with self._state_lock:
+                    self._cancelled += 1
+            except Exception as e:
+                item.future.set_exception(e)
+                with self._state_lock:
+                    self._failed += 1
+            else:
+                item.future.set_result(result)
+                with self._state_lock:
+                    self._completed += 1
+            finally:
+                elapsed = time.monotonic() - start
+                with self._state_lock:
+                    self._active -= 1
+                    self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+
+_engine_instance: Optional[InferenceEngine] = None
+
+
+def get_engine() -> InferenceEngine:
+    """Get or create the global inference engine."""
+    global _engine_instance
+    if _engine_instance is None:
+        _engine_instance = InferenceEngine()
+    return _engine_instance
+
+
+def start_engine() -> bool:
+    """Start the global inference engine."""
+    return get_engine().start()
+
+
+def stop_engine() -> None:
+    """Stop the global inference engine."""
+    get_engine().stop()
@@ -0,0 +1,150 @@
+"""Single-flight coalescing of identical concurrent synthesis requests.
+
+While a synthesis for a given key is in flight, further requests with the same
+key attach to it instead of running their own inference. Every caller gets its
+own future and cancellation token, so one caller cancelling (e.g. a
+disconnected client) does not affect the others; the shared computation is
+only cancelled once every caller has cancelled.
+
+A caller whose own token is cancelled or passes its deadline is failed with
+OperationCancelledError right away, even while the shared computation keeps
+running for the others.
+"""
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.tts.xtts.dto.tts_dto import TtsDto
+from src.utils.cancellation import CancellationToken, OperationCancelledError, SharedCancellationToken
+
+
+def synthesis_key(dto: TtsDto) -> str:
+    """Deterministic key of everything that influences a synthesis result."""
+    payload = dto.dict(exclude={'deadline_ms'})
+    payload['text'] = " ".join(dto.text.split())
+    payload['voice'] = dto.voice.lower()
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.shared: Optional[Future] = None
+        self.token = SharedCancellationToken()
+        self.members: List[Tuple[Future, CancellationToken]] = []
+
+    @property
+    def waiters(self) -> List[Future]:
+        return [waiter for waiter, _ in self.members]
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time and fans its result out.
+
+    While flights are in progress a watcher thread checks the callers' tokens
+    every `poll_interval` seconds.
+    """
+
+    def __init__(self, poll_interval: float = 0.05):
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()
+        self._flights: Dict[str, _Flight] = {}
+        self._watcher: Optional[threading.Thread] = None
+        self._started = 0
+        self._coalesced = 0
+
+    def do(
+        self,
+        key: str,
+        start: Callable[[CancellationToken], Future],
+        token: Optional[CancellationToken] = None
+    ) -> Future:
+        """Return a future for the computation of key.
+
+        `start` is called with the shared cancellation token to launch the
+        computation, only when none is in flight for key. Results are shared
+        between callers and must be treated as read-only. Cancelling the
+        returned future cancels the caller's token; once the token is
+        cancelled (or its deadline passes) the future fails with
+        OperationCancelledError.
+        """
+        token = token or CancellationToken()
+        waiter: Future = Future()
+        with self._lock:
+            flight = self._flights.get(key)
+            # A flight every caller gave up on may already be stopping: start afresh.
+            if flight is not None and not flight.token.cancelled:
+                self._coalesced += 1
+                flight.token.add(token)
+                flight.members.append((waiter, token))
+            else:
+                flight = _Flight()
+                flight.token.add(token)
+                flight.shared = start(flight.token)
+                flight.members.append((waiter, token))
+                self._flights[key] = flight
+                self._started += 1
+                flight.shared.add_done_callback(lambda shared: self._finish(key, flight))
+            if self._watcher is None and self._flights:
+                self._watcher = threading.Thread(target=self._watch, name="single-flight-watcher", daemon=True)
+                self._watcher.start()
+        waiter.add_done_callback(lambda w: self._on_waiter_done(flight, token, w))
+        return waiter
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        with self._lock:
+            return {
+                'in_flight': len(self._flights),
+                'started': self._started,
+                'coalesced': self._coalesced,
+            }
+
+    def _finish(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            waiters = list(flight.waiters)
+        shared = flight.shared
+        for waiter in waiters:
+            try:
+                if shared.cancelled():
+                    waiter.cancel()
+                elif shared.exception() is not None:
+                    waiter.set_exception(shared.exception())
+                else:
+                    waiter.set_result(shared.result())
+            except InvalidStateError:
+                # The caller cancelled its own future meanwhile.
+                pass
+
+    def _watch(self) -> None:
+        """Fail the waiters whose caller token got cancelled; exits once no flight is left."""
+        while True:
+            with self._lock:
+                if not self._flights:
+                    self._watcher = None
+                    return
+                members = [member for flight in self._flights.values() for member in flight.members]
+            for waiter, token in members:
+                if not waiter.done() and token.cancelled:
+                    try:
+                        waiter.set_exception(OperationCancelledError(
+                            "Deadline exceeded" if token.deadline_exceeded else "Operation cancelled",
+                            deadline_exceeded=token.deadline_exceeded
+                        ))
+                    except InvalidStateError:
+                        pass
+            time.sleep(self.poll_interval)
+
+    def _on_waiter_done(self, flight: _Flight, token: CancellationToken, waiter: Future) -> None:
+        if not waiter.cancelled() and not token.cancelled:
+            return
+        token.cancel()
+        with self._lock:
+            # Cancelled under the lock, so no new caller attaches in between.
+            # Once running, the computation stops at its next check of the token.
+            if all(w.cancelled() or t.cancelled for w, t in flight.members):
+                flight.shared.cancel()
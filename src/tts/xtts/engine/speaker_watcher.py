@@ -0,0 +1,77 @@
+"""Polling watcher that applies speakers directory changes automatically.
+
+Every `interval` seconds the speakers directory is diffed against the
+embedding manager's file index (one `stat` per file when nothing changed).
+When something was added, changed or removed, an incremental reload is
+scheduled on the inference engine as background work.
+"""
+import threading
+from typing import Optional
+
+from src.core.application import Application
+from src.tts.xtts.engine.inference_engine import Priority, get_engine
+
+
+class SpeakerDirectoryWatcher:
+    """Background thread polling the speakers directory for changes."""
+
+    def __init__(self, interval: float):
+        self.app = Application()
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start polling."""
+        if self.is_running:
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="speaker-watcher", daemon=True)
+        self._thread.start()
+        self.app.logger.info("[SpeakerDirectoryWatcher] Watching speakers every %.1fs", self.interval)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._poll()
+            except Exception as e:
+                self.app.logger.error("[SpeakerDirectoryWatcher] Poll failed: %s", e)
+
+    def _poll(self) -> None:
+        engine = get_engine()
+        manager = engine.model.embedding_manager
+        if manager is None or manager.pending_changes().is_empty():
+            return
+        engine.submit_call(manager.reload_changed, priority=Priority.BACKGROUND).result()
+
+
+_watcher_instance: Optional[SpeakerDirectoryWatcher] = None
+
+
+def start_speaker_watcher() -> bool:
+    """Start the global watcher when SPEAKER_WATCH_INTERVAL is greater than zero."""
+    global _watcher_instance
+    interval = Application().envs.SPEAKER_WATCH_INTERVAL
+    if interval <= 0:
+        return False
+    if _watcher_instance is None:
+        _watcher_instance = SpeakerDirectoryWatcher(interval)
+    return _watcher_instance.start()
+
+
+def stop_speaker_watcher() -> None:
+    """Stop the global watcher if it is running."""
+    if _watcher_instance is not None:
+        _watcher_instance.stop()
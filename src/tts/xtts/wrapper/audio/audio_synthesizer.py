@@ -1,7 +1,6 @@
 import traceback
 import io
-import re
-from typing import Any
+from typing import Any, Iterator, Optional, Tuple
 import numpy as np
 import torch
 import torchaudio  # type: ignore
@@ -11,8 +10,16 @@ from datetime import datetime
 from src.tts.xtts.wrapper.model.model_manager import XttsModelManager
 from src.tts.xtts.wrapper.speaker_embedding import SpeakerEmbeddingManager
 from src.audio.processor import AudioProcessor
+from src.audio.buffer import AudioBuffer
+from src.audio.accumulator import AudioAccumulator, silence_block
 from src.tts.xtts.dto.tts_dto import TtsDto
+from src.tts.xtts.wrapper.audio.batch_inference import SentenceJob, infer_single
+from src.tts.xtts.wrapper.audio.sentence_cache import get_sentence_cache
+from src.tts.xtts.engine.batch_scheduler import get_batch_scheduler
 from src.core.application import Application
+from src.tokenizer.packing import TextChunk, char_limit, pack_clauses, unpacked
+from src.tokenizer.splitter import get_sentence_splitter
+from src.utils.cancellation import CancellationToken, OperationCancelledError
 from src.utils.clean_memory_after_synthesize import cleanup_memory_after_synthesize as clean_memory
 
 class AudioSynthesizer:
@@ -26,9 +33,16 @@ class AudioSynthesizer:
         self.embedding_manager = embedding_manager
         self.audio_processor = AudioProcessor()
         self.app = Application()
+        self.batch_scheduler = get_batch_scheduler()
+        self.sentence_cache = get_sentence_cache()
 
-    def synthesize(self, dto: TtsDto) -> np.ndarray:
-        """Synthesizes audio from text using the XTTS model"""
+    def synthesize(self, dto: TtsDto, token: Optional[CancellationToken] = None) -> Optional[AudioBuffer]:
+        """Synthesizes audio from text using the XTTS model.
+
+        Returns float32 PCM at 24 kHz, post-processed but not encoded. The
+        token is checked between sentences; once it is cancelled the remaining
+        sentences are skipped and OperationCancelledError is raised.
+        """
         voice = dto.voice.lower()
         model = self.tts_processor.get_model()
 
@@ -47,11 +61,14 @@ class AudioSynthesizer:
 
             print(f"!!! Speaker embedding and GPT latent obtained in {datetime.now() - start_loading}")
             start_synthesis = datetime.now()
-            audio_buffer = self._get_audio(dto, gpt_cond_latent, speaker_embedding)
+            audio_buffer = self._get_audio(dto, gpt_cond_latent, speaker_embedding, token)
             print(f"!!! Audio synthesized in {datetime.now() - start_synthesis}")
-            audio_buffer = self.apply_silence(audio_buffer, 150)
-            return audio_buffer
+            samples = self.audio_processor.process(audio_buffer, start_end_silence=150)
+            return AudioBuffer(samples, sample_rate=24000)
 
+        except OperationCancelledError as e:
+            print(f"Audio synthesis stopped: {e}")
+            raise
         except Exception as e:
             traceback.print_exc()
             print(f"Error during audio synthesis: {e}")
@@ -65,9 +82,21 @@ class AudioSynthesizer:
             text = text[:-1] + ','
         return text
 
-    def split_sentences(self, text: str) -> list[str]:
-        """Splits text into sentences."""
-        return re.split(r'(?<=[,\.!;])\s+', text)
+    def split_sentences(self, text: str, lang_code: str = "en") -> list[str]:
+        """Splits text into sentences, then sentences into clauses at commas and semicolons."""
+        return get_sentence_splitter().split_clauses(text, lang_code)
+
+    def pack_sentences(self, model: Any, text: str, lang_code: str = "en") -> list[TextChunk]:
+        """Splits text into clauses and merges adjacent ones up to the language's character limit.
+
+        One character of the limit is kept for the comma appended to each chunk.
+        With SENTENCE_PACKING disabled every clause is its own chunk.
+        """
+        clauses = self.split_sentences(text, lang_code) or [text]
+        max_chars = char_limit(model, lang_code) - 1
+        if not self.app.envs.SENTENCE_PACKING:
+            return unpacked(clauses, max_chars)
+        return pack_clauses(clauses, max_chars)
 
     def apply_silence(self, audio_buffer, audioStartEndTime) -> bytes:
         return self.audio_processor.apply_silences(
@@ -76,7 +105,43 @@ class AudioSynthesizer:
         )
         
 
-    def _get_audio(self, dto: TtsDto, gpt_cond_latent: Any, speaker_embedding: Any) -> np.ndarray:
+    def synthesize_stream(self, dto: TtsDto, token: Optional[CancellationToken] = None) -> Iterator[np.ndarray]:
+        """Synthesizes audio sentence by sentence, yielding each chunk as soon as it is ready.
+
+        Each chunk is the trimmed sentence audio followed by its pause, as float32.
+        Unlike `synthesize`, no whole-buffer post-processing is applied.
+        """
+        voice = dto.voice.lower()
+        model = self.tts_processor.get_model()
+
+        if model is None or not dto.voice:
+            message = "Model is not loaded or speaker audio file is missing"
+            raise Exception(message)
+
+        speaker_data = self.embedding_manager.get_embedding(voice)
+        if not speaker_data:
+            raise Exception(f"Speaker embedding not found for {voice}")
+
+        start_synthesis = datetime.now()
+        first_chunk = True
+        try:
+            for audio_trim, silence in self._iter_sentence_audio(
+                    dto, speaker_data.gpt_cond_latent, speaker_data.speaker_embedding, token):
+                if first_chunk:
+                    self.app.logger.info(
+                        "Time to first chunk: %s", datetime.now() - start_synthesis)
+                    first_chunk = False
+                yield np.concatenate((audio_trim, silence)).astype(np.float32, copy=False)
+            self.app.logger.info("Streaming synthesis finished in %s", datetime.now() - start_synthesis)
+        finally:
+            clean_memory()
+
+    def _get_audio(
+            self,
+            dto: TtsDto,
+            gpt_cond_latent: Any,
+            speaker_embedding: Any,
+            token: Optional[CancellationToken] = None) -> np.ndarray:
         """Generates audio from text by processing it sentence by sentence.
 
         Uses synthesis parameters from dto with sensible defaults:
@@ -89,27 +154,76 @@ class AudioSynthesizer:
         - do_sample: Enable sampling (default True)
         - enable_text_splitting: Enable text splitting (default True)
         """
+        outputs = AudioAccumulator(sample_rate=24000)
+        time_before_inference = datetime.now()
+
+        for audio_trim, silence in self._iter_sentence_audio(dto, gpt_cond_latent, speaker_embedding, token):
+            outputs.append(audio_trim)
+            outputs.append(silence)
+
+        print(f"\n\n ~ Inference time: {datetime.now() - time_before_inference}")
+        return outputs.to_array()
+
+    def _iter_sentence_audio(
+            self,
+            dto: TtsDto,
+            gpt_cond_latent: Any,
+            speaker_embedding: Any,
+            token: Optional[CancellationToken] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yields (trimmed audio, trailing silence) for each packed chunk of dto.text, in order."""
         model = self.tts_processor.get_model()
         if model is None:
             raise Exception("Model is not loaded")
-        sentences = self.split_sentences(dto.text)
-        if not sentences:
-            sentences = [dto.text]
+        chunks = self.pack_sentences(model, dto.text, dto.lang_code)
 
-        print("\n\ntext sentences:", sentences)
-        outputs = np.array([0], dtype=np.float32)  # Initialize as numpy array
+        print("\n\ntext chunks:", [chunk.text for chunk in chunks])
         padding = 0.98
         silence_comma = 150
         silence_punctuation = 200
-        time_before_inference = datetime.now()
 
-        for sentence in sentences:
-            print(f"$$$ ~ Synthesizing sentence: {sentence}")
+        prepared = []
+        for chunk in chunks:
+            sentence = chunk.text
             # if sentence not ends with ", or ." add a ,
             if not sentence.endswith((",")):
                 sentence += ","
-            sentence = self.replace_dot_from_sentence(sentence)
-            output = model.inference(
+            prepared.append(self.replace_dot_from_sentence(sentence))
+        # A chunk within the limit is never split by the model, so only
+        # oversized clauses keep the requested text splitting.
+        splitting = [dto.enable_text_splitting and not chunk.fits for chunk in chunks]
+
+        wavs = self._infer_sentences(model, dto, prepared, gpt_cond_latent, speaker_embedding, token, splitting)
+        for chunk, wav in zip(chunks, wavs):
+            # The pause follows the punctuation of the chunk's last boundary.
+            split_type = self.get_split_type(chunk.text)
+            silence_duration = silence_comma if split_type == "COMMA" else silence_punctuation
+            silence = silence_block(silence_duration * int(24000 / 1000 * padding))
+
+            audio_trim = librosa.effects.trim(wav, top_db=50)[0]
+            yield audio_trim, silence
+
+    def _infer_sentences(
+            self,
+            model: Any,
+            dto: TtsDto,
+            sentences: list[str],
+            gpt_cond_latent: Any,
+            speaker_embedding: Any,
+            token: Optional[CancellationToken] = None,
+            splitting: Optional[list[bool]] = None) -> Iterator[np.ndarray]:
+        """Yields the raw waveform of each sentence, in order.
+
+        Sentences found in the sentence cache skip inference; only deterministic
+        requests (seeded, or without sampling) use the cache. With batching
+        enabled every remaining sentence is queued up front, so they can share
+        batches with each other and with concurrent requests. The token is
+        checked before each sentence; queued sentences are withdrawn on cancel.
+        `splitting` overrides dto.enable_text_splitting per sentence.
+        """
+        if splitting is None:
+            splitting = [dto.enable_text_splitting] * len(sentences)
+        jobs = [
+            SentenceJob(
                 text=sentence,
                 language=dto.lang_code,
                 gpt_cond_latent=gpt_cond_latent,
@@ -121,18 +235,40 @@ class AudioSynthesizer:
                 top_p=dto.top_p,
                 do_sample=dto.do_sample,
                 speed=dto.speed,
-                enable_text_splitting=dto.enable_text_splitting
+                enable_text_splitting=split,
+                seed=dto.seed
             )
+            for sentence, split in zip(sentences, splitting)
+        ]
 
-            split_type = self.get_split_type(sentence)
-            silence_duration = silence_comma if split_type == "COMMA" else silence_punctuation
-            silence = np.zeros(silence_duration * int(24000 / 1000 * padding))
+        cache = self.sentence_cache if self.sentence_cache.enabled and dto.is_deterministic() else None
+        keys = [cache.key_for(dto, job.text) if cache else None for job in jobs]
+        cached = [cache.get(key) if cache else None for key in keys]
 
-            audio_trim = librosa.effects.trim(output["wav"], top_db=50)[0]
-            outputs = np.concatenate((outputs, audio_trim, silence))
+        futures = {}
+        if self.batch_scheduler is not None:
+            futures = {
+                i: self.batch_scheduler.submit(job)
+                for i, job in enumerate(jobs) if cached[i] is None
+            }
 
-        print(f"\n\n ~ Inference time: {datetime.now() - time_before_inference}")
-        return outputs
+        try:
+            for i, job in enumerate(jobs):
+                if token is not None:
+                    token.raise_if_cancelled()
+                if cached[i] is not None:
+                    print(f"$$$ ~ Sentence cache hit: {job.text}")
+                    yield cached[i]
+                    continue
+
+                print(f"$$$ ~ Synthesizing sentence: {job.text}")
+                wav = self.batch_scheduler.result(futures[i]) if i in futures else infer_single(model, job)
+                if cache:
+                    cache.put(keys[i], wav)
+                yield wav
+        finally:
+            for future in futures.values():
+                future.cancel()
 
     def get_split_type(self, text: str) -> str:
         """Determines the split type for the given text."""
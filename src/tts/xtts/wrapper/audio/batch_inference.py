@@ -0,0 +1,165 @@
+"""Batched XTTS inference for sentences that share sampling parameters.
+
+Mirrors `Xtts.inference` for a single sentence, but runs the GPT generation,
+the GPT latent pass and the HiFiGAN decode once for a whole batch. Speakers
+may differ inside a batch: `gpt_cond_latent` ([1, 32, 1024]) and
+`speaker_embedding` ([1, 512, 1]) have fixed shapes and are simply stacked.
+"""
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from TTS.tts.models.xtts import Xtts  # type: ignore
+
+from src.modules.system.torch_util import rng_context
+
+
+@dataclass
+class SentenceJob:
+    """A single sentence waiting for inference, with the parameters it needs."""
+    text: str
+    language: str
+    gpt_cond_latent: Any
+    speaker_embedding: Any
+    temperature: float
+    length_penalty: float
+    repetition_penalty: float
+    top_k: int
+    top_p: float
+    do_sample: bool
+    speed: float
+    enable_text_splitting: bool
+    seed: Optional[int] = None
+    future: Future = field(default_factory=Future)
+    text_tokens: Optional[torch.Tensor] = None
+
+    def sampling_key(self) -> Tuple:
+        """Parameters that must be identical for jobs to share a batch."""
+        return (
+            self.language.split("-")[0],
+            self.temperature,
+            self.length_penalty,
+            self.repetition_penalty,
+            self.top_k,
+            self.top_p,
+            self.do_sample,
+            self.speed,
+        )
+
+
+def tokenize_job(model: Xtts, job: SentenceJob) -> Optional[torch.Tensor]:
+    """Tokenize a job the same way `Xtts.inference` does.
+
+    Returns None when the job cannot be batched, i.e. when the model would split
+    the text itself (`enable_text_splitting` and text over the language limit).
+    """
+    language = job.language.split("-")[0]
+    if job.enable_text_splitting and len(job.text) > model.tokenizer.char_limits.get(language, 250):
+        return None
+    tokens = model.tokenizer.encode(job.text.strip().lower(), lang=language)
+    return torch.IntTensor(tokens)
+
+
+def infer_single(model: Xtts, job: SentenceJob) -> np.ndarray:
+    """Run one job through the regular `Xtts.inference` path.
+
+    A seeded job reseeds the RNG before the sentence, so its audio does not
+    depend on what ran before it or concurrently with it.
+    """
+    with rng_context(job.seed):
+        output = model.inference(
+            text=job.text,
+            language=job.language,
+            gpt_cond_latent=job.gpt_cond_latent,
+            speaker_embedding=job.speaker_embedding,
+            temperature=job.temperature,
+            length_penalty=job.length_penalty,
+            repetition_penalty=job.repetition_penalty,
+            top_k=job.top_k,
+            top_p=job.top_p,
+            do_sample=job.do_sample,
+            speed=job.speed,
+            enable_text_splitting=job.enable_text_splitting
+        )
+    return output["wav"]
+
+
+@torch.inference_mode()
+def infer_batch(model: Xtts, jobs: List[SentenceJob]) -> List[np.ndarray]:
+    """Run a batch of tokenized, unseeded jobs with identical sampling key and token length.
+
+    GPT generation is causal, so each row's latents match what a solo run would
+    produce for the same sampled codes. HiFiGAN runs on right-padded latents and
+    each waveform is cut back to its own length.
+    """
+    if len(jobs) == 1:
+        return [infer_single(model, jobs[0])]
+
+    first = jobs[0]
+    device = model.device
+    length_scale = 1.0 / max(first.speed, 0.05)
+
+    text_tokens = torch.stack([job.text_tokens for job in jobs]).to(device)
+    gpt_cond_latent = torch.cat([job.gpt_cond_latent for job in jobs], dim=0).to(device)
+    speaker_embedding = torch.cat([job.speaker_embedding for job in jobs], dim=0).to(device)
+
+    with rng_context():
+        gpt_codes = model.gpt.generate(
+            cond_latents=gpt_cond_latent,
+            text_inputs=text_tokens,
+            do_sample=first.do_sample,
+            top_p=first.top_p,
+            top_k=first.top_k,
+            temperature=first.temperature,
+            num_return_sequences=1,
+            num_beams=1,
+            length_penalty=first.length_penalty,
+            repetition_penalty=first.repetition_penalty,
+            output_attentions=False,
+        )
+
+    # Finished rows are padded with the stop token; each row's length includes
+    # its own stop token, matching what a solo generate returns.
+    stop_token = model.gpt.stop_audio_token
+    code_lengths = []
+    for row in gpt_codes:
+        stops = (row == stop_token).nonzero(as_tuple=True)[0]
+        code_lengths.append(int(stops[0]) + 1 if len(stops) else row.shape[-1])
+
+    expected_output_len = torch.tensor(
+        [length * model.gpt.code_stride_len for length in code_lengths], device=device
+    )
+    text_len = torch.full((len(jobs),), text_tokens.shape[-1], device=device)
+    gpt_latents = model.gpt(
+        text_tokens,
+        text_len,
+        gpt_codes,
+        expected_output_len,
+        cond_latents=gpt_cond_latent,
+        return_attentions=False,
+        return_latent=True,
+    )
+
+    # A solo forward pass over n codes yields n + 3 latent frames.
+    latents = []
+    for row, length in enumerate(code_lengths):
+        item = gpt_latents[row:row + 1, :length + 3]
+        if length_scale != 1.0:
+            item = F.interpolate(
+                item.transpose(1, 2), scale_factor=length_scale, mode="linear"
+            ).transpose(1, 2)
+        latents.append(item)
+
+    max_len = max(item.shape[1] for item in latents)
+    padded = torch.cat([F.pad(item, (0, 0, 0, max_len - item.shape[1])) for item in latents], dim=0)
+    wavs = model.hifigan_decoder(padded, g=speaker_embedding).cpu()
+
+    samples_per_frame = wavs.shape[-1] / max_len
+    return [
+        wavs[row].squeeze()[: int(round(item.shape[1] * samples_per_frame))].numpy()
+        for row, item in enumerate(latents)
+    ]
@@ -0,0 +1,269 @@
+"""Content-addressed cache of per-sentence model output.
+
+Entries are keyed by a hash of everything that influences a sentence's audio
+(normalized text, voice, language, sampling parameters, seed and model
+version) and hold the raw float waveform returned by `model.inference`.
+
+Only deterministic requests (seeded, or with sampling disabled) are cached:
+an unseeded sampled request must not replay the audio of an earlier one.
+
+Two tiers are used: a byte-bounded in-memory LRU and an optional size-capped
+disk tier storing float16 `.npy` files, one sub-directory per voice.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.application import Application
+from src.tts.xtts.dto.tts_dto import TtsDto
+
+
+class SentenceAudioCache:
+    """Two-tier (memory LRU + disk) cache of sentence waveforms."""
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        disk_bytes: int,
+        disk_dir: Optional[Path] = None,
+        model_version: str = ""
+    ):
+        self.app = Application()
+        self.memory_bytes = max(0, memory_bytes)
+        self.disk_bytes = max(0, disk_bytes)
+        self.disk_dir = disk_dir
+        self.model_version = model_version
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, np.ndarray]]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_index: "OrderedDict[Path, int]" = OrderedDict()
+        self._disk_used = 0
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+        }
+
+        if self.disk_bytes and self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._scan_disk()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether at least one tier is active."""
+        return bool(self.memory_bytes) or bool(self.disk_bytes and self.disk_dir is not None)
+
+    def key_for(self, dto: TtsDto, sentence: str) -> str:
+        """Build the cache key of a sentence synthesized with the parameters of dto."""
+        payload = {
+            'text': " ".join(sentence.split()).lower(),
+            'voice': dto.voice.lower(),
+            'lang_code': dto.lang_code,
+            'temperature': dto.temperature,
+            'top_k': dto.top_k,
+            'top_p': dto.top_p,
+            'repetition_penalty': dto.repetition_penalty,
+            'length_penalty': dto.length_penalty,
+            'speed': dto.speed,
+            'do_sample': dto.do_sample,
+            'enable_text_splitting': dto.enable_text_splitting,
+            'seed': dto.seed,
+            'model_version': self.model_version,
+        }
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{_voice_slug(dto.voice)}/{digest}"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached waveform for key, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return entry[1]
+
+        audio = self._disk_get(key)
+        with self._lock:
+            if audio is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+        audio.setflags(write=False)
+        self._memory_put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        """Store a waveform in every enabled tier. Cached arrays are read-only."""
+        audio = np.array(audio, dtype=np.float32)
+        audio.setflags(write=False)
+        with self._lock:
+            self._counters['stores'] += 1
+        self._memory_put(key, audio)
+        self._disk_put(key, audio)
+
+    def invalidate_voice(self, voice: str) -> None:
+        """Drop every entry produced with the given voice."""
+        voice = _voice_slug(voice)
+        with self._lock:
+            for key in [k for k, (v, _) in self._memory.items() if v == voice]:
+                _, audio = self._memory.pop(key)
+                self._memory_used -= audio.nbytes
+
+            if self.disk_dir is not None:
+                voice_dir = self.disk_dir / voice
+                for path in [p for p in self._disk_index if p.parent == voice_dir]:
+                    self._disk_used -= self._disk_index.pop(path)
+                shutil.rmtree(voice_dir, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            for path in list(self._disk_index):
+                self._remove_file(path)
+            self._disk_index.clear()
+            self._disk_used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and tier usage."""
+        with self._lock:
+            lookups = self._counters['memory_hits'] + self._counters['disk_hits'] + self._counters['misses']
+            hits = self._counters['memory_hits'] + self._counters['disk_hits']
+            return {
+                **self._counters,
+                'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_used,
+                'memory_limit_bytes': self.memory_bytes,
+                'disk_entries': len(self._disk_index),
+                'disk_bytes': self._disk_used,
+                'disk_limit_bytes': self.disk_bytes,
+            }
+
+    def _memory_put(self, key: str, audio: np.ndarray) -> None:
+        if not self.memory_bytes or audio.nbytes > self.memory_bytes:
+            return
+        voice = key.split("/", 1)[0]
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= previous[1].nbytes
+            self._memory[key] = (voice, audio)
+            self._memory_used += audio.nbytes
+            while self._memory_used > self.memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_used -= evicted.nbytes
+                self._counters['memory_evictions'] += 1
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if not self.disk_bytes or self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{key}.npy"
+
+    def _disk_get(self, key: str) -> Optional[np.ndarray]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        with self._lock:
+            if path not in self._disk_index:
+                return None
+            self._disk_index.move_to_end(path)
+        try:
+            audio = np.load(path).astype(np.float32)
+            os.utime(path)
+            return audio
+        except (OSError, ValueError) as e:
+            self.app.logger.warning("Discarding unreadable cache entry %s: %s", path, e)
+            with self._lock:
+                self._disk_used -= self._disk_index.pop(path, 0)
+            self._remove_file(path)
+            return None
+
+    def _disk_put(self, key: str, audio: np.ndarray) -> None:
+        path = self._disk_path(key)
+        if path is None or audio.nbytes // 2 > self.disk_bytes:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, audio.astype(np.float16))
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except OSError as e:
+            self.app.logger.warning("Could not write cache entry %s: %s", path, e)
+            return
+
+        with self._lock:
+            self._disk_used -= self._disk_index.pop(path, 0)
+            self._disk_index[path] = size
+            self._disk_used += size
+            while self._disk_used > self.disk_bytes and self._disk_index:
+                evicted, evicted_size = self._disk_index.popitem(last=False)
+                self._disk_used -= evicted_size
+                self._remove_file(evicted)
+                self._counters['disk_evictions'] += 1
+
+    def _scan_disk(self) -> None:
+        """Rebuild the disk index, oldest access first."""
+        entries = []
+        for path in self.disk_dir.glob("*/*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, path, stat.st_size))
+        for _, path, size in sorted(entries):
+            self._disk_index[path] = size
+            self._disk_used += size
+
+    def _remove_file(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _voice_slug(voice: str) -> str:
+    """Voice name made safe for use as a key prefix and directory name.
+
+    The readable part drops unsafe characters, so a hash of the name keeps
+    distinct voices (e.g. "a.b" and "ab") in distinct directories.
+    """
+    voice = voice.lower()
+    readable = "".join(c for c in voice if c.isalnum() or c in "_-")[:32]
+    digest = hashlib.sha256(voice.encode("utf-8")).hexdigest()[:12]
+    return f"{readable}-{digest}"
+
+
+_cache_instance: Optional[SentenceAudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sentence_cache() -> SentenceAudioCache:
+    """Get the global sentence cache, configured from environment variables."""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            envs = Application().envs
+            disk_dir = Path(envs.SENTENCE_CACHE_DIR) if envs.SENTENCE_CACHE_DIR else (
+                Path(__file__).parents[5] / "data" / "cache" / "sentences"
+            )
+            _cache_instance = SentenceAudioCache(
+                memory_bytes=int(envs.SENTENCE_CACHE_MEMORY_MB * 1024 * 1024),
+                disk_bytes=int(envs.SENTENCE_CACHE_DISK_MB * 1024 * 1024),
+                disk_dir=disk_dir,
+                model_version=envs.MODEL_FOLDER.strip("/"),
+            )
+        return _cache_instance
@@ -1,12 +1,15 @@
 import numpy as np
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Iterator
 from src.tts.xtts.wrapper.audio.audio_synthesizer import AudioSynthesizer
+from src.audio.buffer import AudioBuffer
+from src.audio.converter import encode_audio
 from src.tts.xtts.wrapper.types.speaker_embedding_type import SpeakerEmbedding
 from src.tts.xtts.dto.tts_dto import TtsDto
 from src.tts.xtts.wrapper.speaker_embedding import SpeakerEmbeddingFactory, SpeakerEmbeddingManager
 from src.tts.xtts.wrapper.model.model_manager import XttsModelManager
 from src.observers.observable import Observable
 from src.core.application import Application
+from src.utils.cancellation import CancellationToken
 
 class ModelWrapper(Observable):
     """
@@ -39,7 +42,7 @@ class ModelWrapper(Observable):
         if not self.model_manager.load_model():
             return False
         self.embedding_manager = SpeakerEmbeddingFactory.create_manager(
-            "default",
+            self.app.envs.SPEAKER_RESIDENCY,
             self.model_manager.get_model(),
             self.model_manager.model_paths
         )
@@ -67,14 +70,35 @@ class ModelWrapper(Observable):
         if self.embedding_manager is None:
             self.app.logger.warning("Embedding manager not initialized")
             return []
-        # Return speaker names from loaded embeddings
-        return list(self.embedding_manager._embeddings.keys())
+        return self.embedding_manager.speaker_names()
 
-    def synthesize_audio(self, dto: TtsDto) -> np.ndarray:
-        """Synthesizes audio from text"""
-        return self._audio_synthesizer.synthesize(dto)
+    def synthesize_audio(self, dto: TtsDto) -> Optional[bytes]:
+        """Synthesizes audio from text, returned as WAV bytes"""
+        audio = self.synthesize_pcm(dto)
+        if audio is None:
+            return None
+        return encode_audio(audio, "wav")
 
-    def reload_all_speaker_embeddings(self) -> None:
-        """Reloads all speaker embeddings"""
-        if self.embedding_manager:
+    def synthesize_pcm(self, dto: TtsDto, token: Optional[CancellationToken] = None) -> Optional[AudioBuffer]:
+        """Synthesizes audio from text, returned as float32 PCM"""
+        return self._audio_synthesizer.synthesize(dto, token)
+
+    def synthesize_audio_stream(
+            self,
+            dto: TtsDto,
+            token: Optional[CancellationToken] = None) -> Iterator[np.ndarray]:
+        """Synthesizes audio from text, yielding one float32 chunk per sentence"""
+        return self._audio_synthesizer.synthesize_stream(dto, token)
+
+    def reload_all_speaker_embeddings(self, full: bool = False) -> Dict[str, List[str]]:
+        """Reloads speaker embeddings.
+
+        By default only speakers whose reference audio was added, changed or
+        removed are reloaded; `full=True` rebuilds every embedding.
+        """
+        if self.embedding_manager is None:
+            return {}
+        if full:
             self.embedding_manager.load_embeddings()
+            return {}
+        return self.embedding_manager.reload_changed().to_dict()
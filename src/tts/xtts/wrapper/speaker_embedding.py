@@ -1,9 +1,28 @@
 import os
-from typing import Dict, Optional
-from TTS.tts.models.xtts import Xtts #type: ignore
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+import torch
+from TTS.tts.models.xtts import Xtts, load_audio #type: ignore
 from src.tts.xtts.wrapper.types.speaker_embedding_type import SpeakerEmbedding
 from src.tts.xtts.wrapper.model_wrapper_paths import ModelWrapperPaths
 from src.core.application import Application
+from src.tts.xtts.wrapper.audio.sentence_cache import get_sentence_cache
+from src.tts.xtts.wrapper.speaker_store import create_latent_store, file_sha256
+from src.tts.xtts.wrapper.speaker_index import (
+    SpeakerFile, SpeakerIndexDiff, scan_speaker_files, diff_speaker_files
+)
+
+# Sample rate and GPT conditioning chunk length used by Xtts.get_conditioning_latents.
+REFERENCE_SAMPLE_RATE = 22050
+GPT_COND_CHUNK_LEN = 6
+
+
+class ReferenceAudio(NamedTuple):
+    """A reference file read and resampled for the speaker encoders."""
+    audio: Any
+    sha256: str
 
 class SpeakerEmbeddingManager():
     """Default implementation of the speaker embedding manager."""
@@ -12,34 +31,193 @@ class SpeakerEmbeddingManager():
         self.model_paths = model_paths
         self.app = Application()
         self._embeddings: Dict[str, SpeakerEmbedding] = {}
+        self.latent_store = create_latent_store(model.config)
+        self._file_index: Dict[str, SpeakerFile] = {}
+        self._uploaded_hashes: Dict[str, str] = {}
+        self._reload_lock = threading.Lock()
 
     def get_embedding(self, speaker: str) -> Optional[SpeakerEmbedding]:
         """Returns the speaker embedding for the given speaker."""
         return self._embeddings.get(speaker.lower())
 
+    def has_speaker(self, speaker: str) -> bool:
+        """Checks if a speaker is available, without loading its embedding."""
+        return speaker.lower() in self._embeddings
+
+    def speaker_names(self) -> List[str]:
+        """Returns the names of all available speakers."""
+        return list(self._embeddings.keys())
+
+    def stats(self) -> Dict[str, int]:
+        """Returns residency statistics."""
+        return {
+            'speakers': len(self._embeddings),
+            'resident': len(self._embeddings),
+        }
+
     def load_embeddings(self) -> None:
         """Loads all speaker embeddings."""
         print("\n\n\nLoading speaker embeddings")
-        self._embeddings = self.get_all_embeddings()
+        with self._reload_lock:
+            self._file_index = scan_speaker_files(self.get_speakers_dir())
+            self._uploaded_hashes.clear()
+            self._embeddings = self.get_all_embeddings()
 
-    def get_all_embeddings(self) -> Dict[str, SpeakerEmbedding]:
-        """Returns all speaker embeddings."""
-        embeddings = {}
-        speakers_files = self.list_speakers()
-        for speaker_path in speakers_files:
-            speaker = os.path.splitext(os.path.basename(speaker_path))[0].lower()
-            gpt_cond_latent, speaker_embedding = self.model.get_conditioning_latents(
-                audio_path=speaker_path,
-                gpt_cond_len=self.model.config.gpt_cond_len,
-                max_ref_length=self.model.config.max_ref_len,
-                sound_norm_refs=self.model.config.sound_norm_refs
-            )
-            embeddings[speaker] = SpeakerEmbedding(
-                gpt_cond_latent=gpt_cond_latent,
-                speaker_embedding=speaker_embedding
+    def pending_changes(self) -> SpeakerIndexDiff:
+        """Diffs the speakers directory against the file index without applying anything."""
+        with self._reload_lock:
+            current = scan_speaker_files(self.get_speakers_dir())
+            return diff_speaker_files(self._file_index, current, self._uploaded_hashes)
+
+    def reload_changed(self) -> SpeakerIndexDiff:
+        """Applies only what changed in the speakers directory since the last scan.
+
+        Added and changed speakers are (re)loaded, removed ones are dropped;
+        every other voice stays live throughout.
+        """
+        with self._reload_lock:
+            current = scan_speaker_files(self.get_speakers_dir())
+            diff = diff_speaker_files(self._file_index, current, self._uploaded_hashes)
+
+            applied = self._apply_speaker_files({
+                speaker: current[speaker].path for speaker in diff.added + diff.changed
+            })
+            for speaker in diff.added + diff.changed:
+                if speaker not in applied:
+                    # Retry on the next reload.
+                    if speaker in self._file_index:
+                        current[speaker] = self._file_index[speaker]
+                    else:
+                        del current[speaker]
+                    continue
+                if speaker in diff.changed:
+                    get_sentence_cache().invalidate_voice(speaker)
+
+            for speaker in diff.removed:
+                self._drop_speaker(speaker)
+                get_sentence_cache().invalidate_voice(speaker)
+                if self.latent_store is not None:
+                    self.latent_store.remove(speaker)
+
+            for speaker in current:
+                self._uploaded_hashes.pop(speaker, None)
+            self._file_index = current
+
+        if not diff.is_empty():
+            print(
+                f"Speakers reloaded: {len(diff.added)} added, "
+                f"{len(diff.changed)} changed, {len(diff.removed)} removed"
             )
+        return diff
+
+    def _apply_speaker_files(self, files: Dict[str, str]) -> Set[str]:
+        """Loads the embeddings of new or changed reference files. Returns the speakers applied."""
+        results = self.load_embeddings_parallel(files)
+        for speaker, (embedding, _) in results.items():
+            self._embeddings[speaker] = embedding
+        return set(results)
+
+    def _drop_speaker(self, speaker: str) -> None:
+        """Forgets a speaker whose reference file was removed."""
+        self._embeddings.pop(speaker, None)
+
+    def get_all_embeddings(self) -> Dict[str, SpeakerEmbedding]:
+        """Returns all speaker embeddings.
+
+        Latents found in the latent store for unchanged reference audio are
+        loaded from disk; only new or stale speakers are recomputed.
+        """
+        files = {
+            os.path.splitext(os.path.basename(path))[0].lower(): path
+            for path in self.list_speakers()
+        }
+        results = self.load_embeddings_parallel(files)
+        embeddings = {speaker: embedding for speaker, (embedding, _) in results.items()}
+        recomputed = sum(1 for _, computed in results.values() if computed)
+
+        if self.latent_store is not None:
+            self.latent_store.prune(files.keys())
+        print(f"Loaded {len(embeddings)} speaker embeddings ({recomputed} recomputed)")
         return embeddings
 
+    def load_embeddings_parallel(self, files: Dict[str, str]) -> Dict[str, Tuple[SpeakerEmbedding, bool]]:
+        """Loads or computes the embeddings of many reference files.
+
+        Loading stored latents and reading, resampling and hashing the
+        reference audio is CPU/IO bound and runs on a worker pool. The encoder
+        passes run one at a time on the calling thread, which at runtime is an
+        inference engine worker, so model concurrency stays bounded by the
+        engine. Returns speaker -> (embedding, recomputed); speakers that fail
+        are logged and left out.
+        """
+        def prepare(speaker: str, audio_path: str) -> Tuple[Optional[SpeakerEmbedding], Optional[ReferenceAudio]]:
+            embedding = self._load_stored_embedding(speaker, audio_path)
+            if embedding is not None:
+                return embedding, None
+            return None, self.read_reference(audio_path)
+
+        results: Dict[str, Tuple[SpeakerEmbedding, bool]] = {}
+        if not files:
+            return results
+        workers = min(len(files), _embedding_workers())
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speaker-loader") as pool:
+            futures = {pool.submit(prepare, speaker, path): speaker for speaker, path in files.items()}
+            for future, speaker in futures.items():
+                try:
+                    embedding, reference = future.result()
+                    if embedding is not None:
+                        results[speaker] = embedding, False
+                    else:
+                        results[speaker] = self._encode_and_store(speaker, files[speaker], reference), True
+                except Exception as e:
+                    self.app.logger.error("Could not load speaker '%s': %s", speaker, e)
+        return results
+
+    def compute_embedding(self, audio_path: str) -> SpeakerEmbedding:
+        """Computes the conditioning latents of a reference audio file."""
+        return self.encode_reference(self.read_reference(audio_path).audio)
+
+    def read_reference(self, audio_path: str) -> ReferenceAudio:
+        """Reads, resamples and hashes a reference file, without touching the model."""
+        audio = load_audio(audio_path, REFERENCE_SAMPLE_RATE)
+        audio = audio[:, : REFERENCE_SAMPLE_RATE * self.model.config.max_ref_len]
+        if self.model.config.sound_norm_refs:
+            audio = (audio / torch.abs(audio).max()) * 0.75
+        return ReferenceAudio(audio=audio, sha256=file_sha256(audio_path))
+
+    @torch.inference_mode()
+    def encode_reference(self, audio: Any) -> SpeakerEmbedding:
+        """Runs the speaker and GPT conditioning encoders on prepared reference audio.
+
+        Same computation as `Xtts.get_conditioning_latents` for a single file.
+        """
+        audio = audio.to(self.model.device)
+        speaker_embedding = self.model.get_speaker_embedding(audio, REFERENCE_SAMPLE_RATE)
+        gpt_cond_latent = self.model.get_gpt_cond_latents(
+            audio,
+            REFERENCE_SAMPLE_RATE,
+            length=self.model.config.gpt_cond_len,
+            chunk_length=GPT_COND_CHUNK_LEN
+        )
+        return SpeakerEmbedding(
+            gpt_cond_latent=gpt_cond_latent,
+            speaker_embedding=speaker_embedding
+        )
+
+    def _load_stored_embedding(self, speaker: str, audio_path: str) -> Optional[SpeakerEmbedding]:
+        if self.latent_store is None:
+            return None
+        return self.latent_store.load(speaker, audio_path, device=self.model.device)
+
+    def _compute_and_store_embedding(self, speaker: str, audio_path: str) -> SpeakerEmbedding:
+        return self._encode_and_store(speaker, audio_path, self.read_reference(audio_path))
+
+    def _encode_and_store(self, speaker: str, audio_path: str, reference: ReferenceAudio) -> SpeakerEmbedding:
+        embedding = self.encode_reference(reference.audio)
+        if self.latent_store is not None:
+            self.latent_store.save(speaker, audio_path, embedding, sha256=reference.sha256)
+        return embedding
+
     def list_speakers(self) -> list[str]:
         """Lists all speakers."""
         speakers: list[str] = []
@@ -63,26 +241,53 @@ class SpeakerEmbeddingManager():
         """
         speaker_key = speaker_name.lower()
 
-        if speaker_key in self._embeddings:
-            print(f"Speaker '{speaker_name}' already exists, updating embedding...")
-
         try:
-            gpt_cond_latent, speaker_embedding = self.model.get_conditioning_latents(
-                audio_path=audio_path,
-                gpt_cond_len=self.model.config.gpt_cond_len,
-                max_ref_length=self.model.config.max_ref_len,
-                sound_norm_refs=self.model.config.sound_norm_refs
-            )
-            self._embeddings[speaker_key] = SpeakerEmbedding(
-                gpt_cond_latent=gpt_cond_latent,
-                speaker_embedding=speaker_embedding
-            )
-            print(f"Speaker '{speaker_name}' added successfully")
-            return True
+            embedding = self._compute_and_store_embedding(speaker_key, audio_path)
         except Exception as e:
             print(f"Error adding speaker '{speaker_name}': {e}")
             return False
 
+        self._register_speaker(speaker_key, audio_path, embedding)
+        print(f"Speaker '{speaker_name}' added successfully")
+        return True
+
+    def add_speakers(self, speakers: Dict[str, str]) -> Dict[str, bool]:
+        """Adds many speakers at once, reading their reference files in parallel.
+
+        Args:
+            speakers: Mapping of speaker name to WAV audio path
+
+        Returns:
+            Mapping of speaker name to whether it was added
+        """
+        files = {name.lower(): path for name, path in speakers.items()}
+        workers = min(len(files), _embedding_workers()) or 1
+        added = {}
+        # Reference files are read on the pool; the encoder passes run here, one at a time.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speaker-loader") as pool:
+            futures = {speaker: pool.submit(self.read_reference, path) for speaker, path in files.items()}
+            for name in speakers:
+                speaker_key = name.lower()
+                try:
+                    reference = futures[speaker_key].result()
+                    embedding = self._encode_and_store(speaker_key, files[speaker_key], reference)
+                except Exception as e:
+                    print(f"Error adding speaker '{name}': {e}")
+                    added[name] = False
+                    continue
+                self._register_speaker(speaker_key, files[speaker_key], embedding)
+                added[name] = True
+        print(f"Added {sum(added.values())} of {len(added)} speakers")
+        return added
+
+    def _register_speaker(self, speaker: str, audio_path: str, embedding: SpeakerEmbedding) -> None:
+        """Makes a freshly computed speaker available."""
+        if speaker in self._embeddings:
+            print(f"Speaker '{speaker}' already exists, updating embedding...")
+            get_sentence_cache().invalidate_voice(speaker)
+        self._embeddings[speaker] = embedding
+        self._remember_upload(speaker, audio_path)
+
     def remove_speaker(self, speaker_name: str) -> bool:
         """Removes a speaker embedding.
 
@@ -95,6 +300,7 @@ class SpeakerEmbeddingManager():
         speaker_key = speaker_name.lower()
         if speaker_key in self._embeddings:
             del self._embeddings[speaker_key]
+            get_sentence_cache().invalidate_voice(speaker_key)
             return True
         return False
 
@@ -102,6 +308,192 @@ class SpeakerEmbeddingManager():
         """Returns the speakers directory path."""
         return self.model_paths.speakers_dir_path
 
+    def _remember_upload(self, speaker: str, audio_path: str) -> None:
+        """Records the hash of an uploaded reference so its copy in the
+        speakers directory is not reloaded again."""
+        try:
+            self._uploaded_hashes[speaker] = file_sha256(audio_path)
+        except OSError:
+            pass
+
+class LazySpeakerEmbeddingManager(SpeakerEmbeddingManager):
+    """Speaker embedding manager that keeps only hot voices resident.
+
+    Speakers are listed from the speakers directory without loading them. An
+    embedding is loaded from the latent store, or computed, on its first
+    `get_embedding` and kept in an LRU bounded by entry count and tensor bytes.
+    Pinned speakers are loaded up front and never evicted.
+    """
+    def __init__(
+        self,
+        model: Xtts,
+        model_paths: ModelWrapperPaths,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        pinned: Optional[Set[str]] = None
+    ):
+        super().__init__(model, model_paths)
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.pinned = {name.lower() for name in (pinned or set())}
+        self._paths: Dict[str, str] = {}
+        self._resident: "OrderedDict[str, SpeakerEmbedding]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._evictions = 0
+
+    def get_embedding(self, speaker: str) -> Optional[SpeakerEmbedding]:
+        """Returns the speaker embedding, loading it on first use."""
+        speaker_key = speaker.lower()
+        with self._lock:
+            embedding = self._resident.get(speaker_key)
+            if embedding is not None:
+                self._resident.move_to_end(speaker_key)
+                return embedding
+            audio_path = self._paths.get(speaker_key)
+            if audio_path is None:
+                return None
+            loading = self._loading.setdefault(speaker_key, threading.Lock())
+
+        # One loader per speaker; concurrent callers wait for it.
+        with loading:
+            with self._lock:
+                embedding = self._resident.get(speaker_key)
+            if embedding is not None:
+                return embedding
+            embedding = self._load_stored_embedding(speaker_key, audio_path)
+            if embedding is None:
+                embedding = self._compute_and_store_embedding(speaker_key, audio_path)
+            with self._lock:
+                if speaker_key in self._paths:
+                    self._make_resident(speaker_key, embedding)
+                self._loading.pop(speaker_key, None)
+            return embedding
+
+    def has_speaker(self, speaker: str) -> bool:
+        """Checks if a speaker is available, without loading its embedding."""
+        with self._lock:
+            return speaker.lower() in self._paths
+
+    def speaker_names(self) -> List[str]:
+        """Returns the names of all available speakers."""
+        with self._lock:
+            return list(self._paths.keys())
+
+    def load_embeddings(self) -> None:
+        """Indexes the speakers directory and preloads pinned speakers."""
+        with self._reload_lock:
+            self._file_index = scan_speaker_files(self.get_speakers_dir())
+            self._uploaded_hashes.clear()
+        paths = {speaker: file.path for speaker, file in self._file_index.items()}
+        with self._lock:
+            self._paths = paths
+            self._resident.clear()
+            self._resident_bytes = 0
+        if self.latent_store is not None:
+            self.latent_store.prune(paths.keys())
+
+        for speaker in self.pinned:
+            if speaker in paths:
+                self.get_embedding(speaker)
+        print(f"Indexed {len(paths)} speakers ({len(self._resident)} resident)")
+
+    def _register_speaker(self, speaker: str, audio_path: str, embedding: SpeakerEmbedding) -> None:
+        """Makes a new speaker available and keeps its embedding resident.
+
+        The reference audio is expected to be copied to the speakers directory
+        as `<speaker>.wav`, which is where it is reloaded from after eviction.
+        """
+        with self._lock:
+            exists = speaker in self._paths
+            self._paths[speaker] = os.path.join(self.get_speakers_dir(), f"{speaker}.wav")
+            self._make_resident(speaker, embedding)
+        if exists:
+            print(f"Speaker '{speaker}' already exists, updating embedding...")
+            get_sentence_cache().invalidate_voice(speaker)
+        self._remember_upload(speaker, audio_path)
+
+    def remove_speaker(self, speaker_name: str) -> bool:
+        """Removes a speaker and its resident embedding."""
+        speaker_key = speaker_name.lower()
+        with self._lock:
+            if self._paths.pop(speaker_key, None) is None:
+                return False
+            self._drop_resident(speaker_key)
+        get_sentence_cache().invalidate_voice(speaker_key)
+        return True
+
+    def _apply_speaker_files(self, files: Dict[str, str]) -> Set[str]:
+        """Re-points speakers at their reference files; they are loaded again on next use."""
+        with self._lock:
+            for speaker, audio_path in files.items():
+                self._paths[speaker] = audio_path
+                self._drop_resident(speaker)
+        for speaker in self.pinned & set(files):
+            self.get_embedding(speaker)
+        return set(files)
+
+    def _drop_speaker(self, speaker: str) -> None:
+        with self._lock:
+            self._paths.pop(speaker, None)
+            self._drop_resident(speaker)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns residency statistics."""
+        with self._lock:
+            return {
+                'speakers': len(self._paths),
+                'resident': len(self._resident),
+                'resident_bytes': self._resident_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'pinned': len(self.pinned),
+                'evictions': self._evictions,
+            }
+
+    def _make_resident(self, speaker: str, embedding: SpeakerEmbedding) -> None:
+        """Inserts an embedding and evicts the least recently used ones. Lock must be held."""
+        self._drop_resident(speaker)
+        self._resident[speaker] = embedding
+        self._resident_bytes += _embedding_bytes(embedding)
+
+        for candidate in list(self._resident):
+            if not self._over_budget():
+                break
+            if candidate in self.pinned or candidate == speaker:
+                continue
+            self._drop_resident(candidate)
+            self._evictions += 1
+
+    def _drop_resident(self, speaker: str) -> None:
+        embedding = self._resident.pop(speaker, None)
+        if embedding is not None:
+            self._resident_bytes -= _embedding_bytes(embedding)
+
+    def _over_budget(self) -> bool:
+        return bool(
+            (self.max_entries and len(self._resident) > self.max_entries)
+            or (self.max_bytes and self._resident_bytes > self.max_bytes)
+        )
+
+
+def _embedding_workers() -> int:
+    """Size of the pool used to load reference audio (SPEAKER_LOAD_WORKERS, 0 = auto)."""
+    workers = Application().envs.SPEAKER_LOAD_WORKERS
+    if workers > 0:
+        return workers
+    return min(8, os.cpu_count() or 1)
+
+
+def _embedding_bytes(embedding: SpeakerEmbedding) -> int:
+    """Memory held by an embedding's tensors."""
+    return sum(
+        tensor.element_size() * tensor.nelement()
+        for tensor in (embedding.gpt_cond_latent, embedding.speaker_embedding)
+    )
+
+
 class SpeakerEmbeddingFactory:
     """Factory for creating speaker embedding managers."""
     @staticmethod
@@ -112,4 +504,13 @@ class SpeakerEmbeddingFactory:
         print(f"Creating speaker embedding manager of type: {manager_type}")
         if manager_type == "default":
             return SpeakerEmbeddingManager(model, model_paths)
+        if manager_type == "lazy":
+            envs = Application().envs
+            return LazySpeakerEmbeddingManager(
+                model,
+                model_paths,
+                max_entries=envs.SPEAKER_RESIDENT_MAX,
+                max_bytes=int(envs.SPEAKER_RESIDENT_MB * 1024 * 1024),
+                pinned={name.strip() for name in envs.SPEAKER_PINNED.split(",") if name.strip()}
+            )
         raise ValueError(f"Unknown manager type: {manager_type}")
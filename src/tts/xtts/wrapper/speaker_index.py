@@ -0,0 +1,94 @@
+"""File index of the speakers directory, used for incremental reloads.
+
+Each reference WAV is tracked by (path, size, mtime, hash). Diffing a fresh
+scan against the previous index tells which speakers were added, changed or
+removed; the content hash is only computed when size or mtime moved, so a
+scan of an unchanged directory costs one `stat` per file.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+
+from src.tts.xtts.wrapper.speaker_store import file_sha256
+
+
+class SpeakerFile(NamedTuple):
+    """A reference audio file as seen by the last scan."""
+    path: str
+    size: int
+    mtime: int
+    sha256: Optional[str] = None
+
+
+@dataclass
+class SpeakerIndexDiff:
+    """Speakers whose reference audio was added, changed or removed."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {'added': self.added, 'changed': self.changed, 'removed': self.removed}
+
+
+def scan_speaker_files(speakers_dir: str) -> Dict[str, SpeakerFile]:
+    """Stat every WAV in the speakers directory, keyed by lower-cased speaker name."""
+    files: Dict[str, SpeakerFile] = {}
+    if not os.path.isdir(speakers_dir):
+        return files
+    with os.scandir(speakers_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".wav") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            speaker = os.path.splitext(entry.name)[0].lower()
+            files[speaker] = SpeakerFile(entry.path, stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def diff_speaker_files(
+    previous: Dict[str, SpeakerFile],
+    current: Dict[str, SpeakerFile],
+    known_hashes: Optional[Dict[str, str]] = None
+) -> SpeakerIndexDiff:
+    """Compare a fresh scan against the previous index.
+
+    Hashes are filled into `current` in place as they are computed or carried
+    over. `known_hashes` holds content hashes of speakers already loaded from
+    elsewhere (e.g. an upload); such a file showing up is not reported as added.
+    """
+    known_hashes = known_hashes or {}
+    diff = SpeakerIndexDiff()
+
+    for speaker, file in list(current.items()):
+        old = previous.get(speaker)
+        if old is not None and (old.path, old.size, old.mtime) == (file.path, file.size, file.mtime):
+            current[speaker] = file._replace(sha256=old.sha256)
+            continue
+
+        try:
+            sha256 = file_sha256(file.path)
+        except OSError:
+            # Vanished or unreadable mid-scan: keep the previous state for now.
+            if old is not None:
+                current[speaker] = old
+            else:
+                del current[speaker]
+            continue
+        current[speaker] = file._replace(sha256=sha256)
+
+        if known_hashes.get(speaker) == sha256:
+            continue
+        if old is None:
+            diff.added.append(speaker)
+        elif old.sha256 != sha256:
+            diff.changed.append(speaker)
+
+    diff.removed = [speaker for speaker in previous if speaker not in current]
+    return diff
@@ -0,0 +1,188 @@
+"""Persistent store of speaker conditioning latents.
+
+Computing `get_conditioning_latents` for every reference WAV dominates startup
+with many voices. The store keeps one `.pt` file per speaker plus an
+`index.json` describing, for each entry, the reference audio it came from
+(SHA-256, size, mtime) and the settings that produced it (model version,
+`gpt_cond_len`, `max_ref_len`, `sound_norm_refs`). An entry is reused only when
+all of them still match; otherwise the caller recomputes and saves it again.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import torch
+
+from src.core.application import Application
+from src.tts.xtts.wrapper.types.speaker_embedding_type import SpeakerEmbedding
+
+INDEX_FILE = "index.json"
+
+
+class SpeakerLatentStore:
+    """On-disk cache of speaker latents keyed by reference-audio hash."""
+
+    def __init__(self, store_dir: Path, settings: Dict[str, Any]):
+        self.app = Application()
+        self.store_dir = store_dir
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._load_index()
+
+    def load(self, speaker: str, audio_path: str, device: Any = "cpu") -> Optional[SpeakerEmbedding]:
+        """Return the stored latents of speaker if they match audio_path and the current settings."""
+        with self._lock:
+            entry = self._index.get(speaker)
+        if entry is None or entry.get('settings') != self.settings:
+            return None
+
+        try:
+            stat = os.stat(audio_path)
+        except OSError:
+            return None
+        if (entry.get('size'), entry.get('mtime')) != (stat.st_size, stat.st_mtime_ns):
+            # Touched or replaced: only the content hash can tell.
+            if entry.get('sha256') != file_sha256(audio_path):
+                return None
+            self._update_entry(speaker, size=stat.st_size, mtime=stat.st_mtime_ns)
+
+        try:
+            data = torch.load(self.store_dir / entry['file'], map_location=device, weights_only=True)
+            return SpeakerEmbedding(
+                gpt_cond_latent=data['gpt_cond_latent'],
+                speaker_embedding=data['speaker_embedding']
+            )
+        except Exception as e:
+            self.app.logger.warning("Discarding unreadable latents of '%s': %s", speaker, e)
+            self.remove(speaker)
+            return None
+
+    def save(
+        self,
+        speaker: str,
+        audio_path: str,
+        embedding: SpeakerEmbedding,
+        sha256: Optional[str] = None
+    ) -> None:
+        """Persist the latents computed for speaker from audio_path.
+
+        `sha256` is the hash of audio_path when the caller already computed it.
+        """
+        try:
+            stat = os.stat(audio_path)
+            sha256 = sha256 or file_sha256(audio_path)
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            file_name = f"{sha256[:16]}_{_file_slug(speaker)}.pt"
+            tmp_path = self.store_dir / f"{file_name}.tmp"
+            torch.save({
+                'gpt_cond_latent': embedding.gpt_cond_latent.detach().cpu(),
+                'speaker_embedding': embedding.speaker_embedding.detach().cpu(),
+            }, tmp_path)
+            os.replace(tmp_path, self.store_dir / file_name)
+        except Exception as e:
+            self.app.logger.warning("Could not persist latents of '%s': %s", speaker, e)
+            return
+
+        with self._lock:
+            previous = self._index.get(speaker)
+            self._index[speaker] = {
+                'file': file_name,
+                'sha256': sha256,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'settings': self.settings,
+            }
+            if previous and previous['file'] != file_name:
+                self._remove_file(previous['file'])
+            self._save_index()
+
+    def remove(self, speaker: str) -> None:
+        """Drop the stored latents of speaker."""
+        with self._lock:
+            entry = self._index.pop(speaker, None)
+            if entry is None:
+                return
+            self._remove_file(entry['file'])
+            self._save_index()
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Drop every entry whose speaker is not in keep."""
+        keep = set(keep)
+        with self._lock:
+            stale = [speaker for speaker in self._index if speaker not in keep]
+            for speaker in stale:
+                self._remove_file(self._index.pop(speaker)['file'])
+            if stale:
+                self._save_index()
+
+    def _update_entry(self, speaker: str, **values: Any) -> None:
+        with self._lock:
+            if speaker in self._index:
+                self._index[speaker].update(values)
+                self._save_index()
+
+    def _load_index(self) -> None:
+        path = self.store_dir / INDEX_FILE
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f).get('entries', {})
+        except (OSError, ValueError) as e:
+            self.app.logger.warning("Ignoring unreadable latent index %s: %s", path, e)
+            self._index = {}
+
+    def _save_index(self) -> None:
+        """Write the index atomically. Must be called with the lock held."""
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            path = self.store_dir / INDEX_FILE
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'entries': self._index}, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.app.logger.warning("Could not write latent index: %s", e)
+
+    def _remove_file(self, file_name: str) -> None:
+        try:
+            (self.store_dir / file_name).unlink()
+        except OSError:
+            pass
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_slug(speaker: str) -> str:
+    return "".join(c for c in speaker.lower() if c.isalnum() or c in "_-") or "_"
+
+
+def create_latent_store(model_config: Any) -> Optional[SpeakerLatentStore]:
+    """Create the latent store for the loaded model, or None when disabled.
+
+    The store lives in SPEAKER_LATENT_DIR (default `data/cache/latents`) and is
+    disabled with SPEAKER_LATENT_STORE=False.
+    """
+    envs = Application().envs
+    if not envs.SPEAKER_LATENT_STORE:
+        return None
+    store_dir = Path(envs.SPEAKER_LATENT_DIR) if envs.SPEAKER_LATENT_DIR else (
+        Path(__file__).parents[4] / "data" / "cache" / "latents"
+    )
+    return SpeakerLatentStore(store_dir, settings={
+        'model_version': envs.MODEL_FOLDER.strip("/"),
+        'gpt_cond_len': model_config.gpt_cond_len,
+        'max_ref_len': model_config.max_ref_len,
+        'sound_norm_refs': model_config.sound_norm_refs,
+    })
@@ -0,0 +1,80 @@
+"""Thread pool executor with a bounded backlog."""
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when an executor refuses new work because its backlog is full.
+
+    `retry_after` is a hint, in whole seconds, for when capacity should be available.
+    """
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after))
+
+
+class BoundedExecutor:
+    """ThreadPoolExecutor that rejects work instead of queueing it without limit.
+
+    At most `max_workers + max_pending` calls may be in flight; `submit` raises
+    ExecutorSaturatedError beyond that.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str = ""):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+        self._avg_seconds = 1.0
+        self._in_flight = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule a call. Raises ExecutorSaturatedError when the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorSaturatedError(
+                "Server is busy, try again later",
+                retry_after=self.estimate_wait_seconds()
+            )
+
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            future = self._executor.submit(self._timed, fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def estimate_wait_seconds(self) -> int:
+        """Estimate how long until a slot frees up, from the average call duration."""
+        with self._lock:
+            backlog = max(1, self._in_flight - self.max_workers + 1)
+            return math.ceil(self._avg_seconds * backlog / self.max_workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying pool."""
+        self._executor.shutdown(wait=wait)
+
+    def _timed(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
@@ -0,0 +1,90 @@
+"""Cooperative cancellation of long-running work."""
+import threading
+import time
+from typing import Iterable, List, Optional
+
+
+class OperationCancelledError(RuntimeError):
+    """Raised by `CancellationToken.raise_if_cancelled` once the token is cancelled.
+
+    `deadline_exceeded` tells a missed deadline apart from an explicit cancel.
+    """
+
+    def __init__(self, message: str = "Operation cancelled", deadline_exceeded: bool = False):
+        super().__init__(message)
+        self.deadline_exceeded = deadline_exceeded
+
+
+class CancellationToken:
+    """Flag checked between units of work (e.g. sentences) to stop early.
+
+    A token is cancelled explicitly with `cancel()` or implicitly once its
+    optional deadline, a `time.monotonic()` timestamp, has passed.
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self._event = threading.Event()
+
+    @classmethod
+    def with_timeout_ms(cls, timeout_ms: Optional[float]) -> "CancellationToken":
+        """Token whose deadline is timeout_ms from now (no deadline if None)."""
+        if timeout_ms is None:
+            return cls()
+        return cls(deadline=time.monotonic() + timeout_ms / 1000)
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def deadline_exceeded(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or self.deadline_exceeded
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelledError if the token is cancelled."""
+        if self._event.is_set():
+            raise OperationCancelledError()
+        if self.deadline_exceeded:
+            raise OperationCancelledError("Deadline exceeded", deadline_exceeded=True)
+
+
+class SharedCancellationToken(CancellationToken):
+    """Token for work shared by several callers.
+
+    It is only cancelled once every member token is, and its deadline is the
+    latest of the members'.
+    """
+
+    def __init__(self, tokens: Iterable[CancellationToken] = ()):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._tokens: List[CancellationToken] = []
+        for token in tokens:
+            self.add(token)
+
+    def add(self, token: CancellationToken) -> None:
+        """Add a caller's token."""
+        with self._lock:
+            self._tokens.append(token)
+            deadlines = [t.deadline for t in self._tokens]
+            self.deadline = None if None in deadlines else max(deadlines)
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        with self._lock:
+            tokens = list(self._tokens)
+        return bool(tokens) and all(t.cancelled for t in tokens)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise OperationCancelledError(
+                "Deadline exceeded" if self.deadline_exceeded else "Operation cancelled",
+                deadline_exceeded=self.deadline_exceeded
+            )
@@ -0,0 +1,75 @@
+"""Incremental ZIP writing for batch results.
+
+Entries are written to the archive as soon as they are added, either straight
+into a file or into a small in-memory sink that the caller drains after each
+entry (e.g. into an HTTP response), so only one entry is held in memory at a
+time. Audio formats that are already compressed are stored as is; deflating
+them costs CPU for no gain.
+"""
+import io
+import json
+import zipfile
+from typing import Any, BinaryIO, List, Optional
+
+# Extensions whose content does not shrink further under deflate.
+STORED_EXTENSIONS = frozenset({"mp3", "ogg", "opus", "flac", "aac", "m4a", "webm", "zip"})
+
+
+def compression_for(filename: str) -> int:
+    """ZIP compression method for an entry, chosen from its extension."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable stream that collects written bytes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """Writes a ZIP archive entry by entry.
+
+    With `target`, entries go straight into that file object. Without it the
+    archive is produced as chunks: call `drain` after each `write` and
+    `close`'s return value to get the bytes written so far.
+    """
+
+    def __init__(self, target: Optional[BinaryIO] = None, compresslevel: int = 1):
+        self._sink = _ChunkSink() if target is None else None
+        self._zip = zipfile.ZipFile(
+            target if target is not None else self._sink, "w", zipfile.ZIP_DEFLATED
+        )
+        self._compresslevel = compresslevel
+
+    def write(self, name: str, data: bytes) -> None:
+        """Add an entry to the archive."""
+        self._zip.writestr(
+            name, data, compress_type=compression_for(name), compresslevel=self._compresslevel
+        )
+
+    def write_json(self, name: str, value: Any) -> None:
+        """Add a JSON entry to the archive."""
+        self.write(name, json.dumps(value, indent=2).encode("utf-8"))
+
+    def drain(self) -> bytes:
+        """Bytes produced since the last drain (always empty when writing to a file)."""
+        return self._sink.drain() if self._sink is not None else b""
+
+    def close(self) -> bytes:
+        """Write the central directory and return the remaining bytes."""
+        self._zip.close()
+        return self.drain()
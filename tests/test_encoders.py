@@ -0,0 +1,56 @@
+"""Tests for the streaming encoder sink."""
+import io
+
+import pytest
+
+from src.audio.encoders import _ForwardSink
+
+pytestmark = pytest.mark.unit
+
+
+def test_appends_are_handed_out_once():
+    sink = _ForwardSink()
+    sink.write(b"abc")
+    assert sink.drain() == b"abc"
+    sink.write(b"de")
+    assert sink.drain() == b"de"
+    assert sink.drain() == b""
+
+
+def test_rewrite_across_the_drained_point_keeps_pending_bytes():
+    sink = _ForwardSink()
+    sink.write(b"HEADER")
+    assert sink.drain() == b"HEADER"
+    sink.write(b"0123456789")
+
+    # Patch a field that straddles the drained point, as libsndfile does on close.
+    sink.seek(4)
+    sink.write(b"xxyy")
+    sink.seek(0, io.SEEK_END)
+    sink.write(b"!")
+
+    assert sink.drain() == b"yy23456789!"
+    assert sink.tell() == 17
+
+
+def test_rewrite_of_drained_bytes_only_is_dropped():
+    sink = _ForwardSink()
+    sink.write(b"abcdef")
+    sink.drain()
+    sink.seek(1)
+    sink.write(b"ZZ")
+    sink.seek(0, io.SEEK_END)
+    sink.write(b"g")
+
+    assert sink.drain() == b"g"
+
+
+def test_write_past_the_end_is_zero_padded():
+    sink = _ForwardSink()
+    sink.write(b"ab")
+    sink.drain()
+    sink.write(b"cd")
+    sink.seek(6)
+    sink.write(b"ef")
+
+    assert sink.drain() == b"cd\x00\x00ef"
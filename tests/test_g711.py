@@ -0,0 +1,67 @@
+"""Tests for the G.711 companding tables and WAV header."""
+import struct
+
+import numpy as np
+import pytest
+
+from src.audio.g711 import encode_g711, g711_wav_header
+
+pytestmark = pytest.mark.unit
+
+ALL_SAMPLES = np.arange(-32768, 32768, dtype=np.int16)
+
+
+@pytest.mark.parametrize("companding, codes", [
+    # Reference codes for 0, 1000, -1000, 32767 and -32768 (ITU-T G.711, even bits inverted for A-law).
+    ("alaw", [0xD5, 0xFA, 0x7A, 0xAA, 0x2A]),
+    ("ulaw", [0xFF, 0xCE, 0x4E, 0x80, 0x00]),
+])
+def test_reference_codes(companding, codes):
+    samples = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+
+    assert list(encode_g711(samples, companding)) == codes
+
+
+@pytest.mark.parametrize("companding", ["alaw", "ulaw"])
+def test_codes_are_monotonic_in_the_input(companding):
+    codes = np.frombuffer(encode_g711(ALL_SAMPLES, companding), dtype=np.uint8)
+    # Undo the transmission inversion to get sign-magnitude codes, then order them.
+    if companding == "alaw":
+        magnitude = (codes ^ 0x55) & 0x7F
+        positive = (codes ^ 0x55) & 0x80 != 0
+    else:
+        magnitude = ~codes & 0x7F
+        positive = ~codes & 0x80 == 0
+    ordered = np.where(positive, magnitude.astype(np.int16), -magnitude.astype(np.int16) - 1)
+
+    assert np.all(np.diff(ordered) >= 0)
+
+
+@pytest.mark.parametrize("companding", ["alaw", "ulaw"])
+def test_matches_audioop(companding):
+    audioop = pytest.importorskip("audioop")
+    convert = audioop.lin2alaw if companding == "alaw" else audioop.lin2ulaw
+
+    assert encode_g711(ALL_SAMPLES, companding) == convert(ALL_SAMPLES.tobytes(), 2)
+
+
+def test_wav_header_sizes():
+    frames = 801
+    header = g711_wav_header(8000, "alaw", frames)
+    riff_size, = struct.unpack_from("<I", header, 4)
+    format_tag, channels, sample_rate = struct.unpack_from("<HHI", header, 20)
+    fact_frames, = struct.unpack_from("<I", header, len(header) - 12)
+    data_size, = struct.unpack_from("<I", header, len(header) - 4)
+
+    assert header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+    assert (format_tag, channels, sample_rate) == (6, 1, 8000)
+    assert fact_frames == data_size == frames
+    # The odd-sized data chunk is padded with one byte.
+    assert riff_size == len(header) - 8 + frames + 1
+
+
+def test_unknown_law_is_rejected():
+    with pytest.raises(ValueError):
+        encode_g711(np.zeros(4, dtype=np.int16), "pcm")
+    with pytest.raises(ValueError):
+        g711_wav_header(8000, "pcm")
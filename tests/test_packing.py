@@ -0,0 +1,61 @@
+"""Tests for packing clauses into inference-sized chunks."""
+import pytest
+
+from src.tokenizer.packing import TextChunk, pack_clauses, unpacked
+
+pytestmark = pytest.mark.unit
+
+
+def test_merges_adjacent_clauses_up_to_the_limit():
+    clauses = ["Hello,", "how are you?", "Fine,", "thanks."]
+
+    assert pack_clauses(clauses, 20) == [
+        TextChunk(text="Hello, how are you?", clauses=2),
+        TextChunk(text="Fine, thanks.", clauses=2),
+    ]
+
+
+def test_chunks_never_exceed_the_limit():
+    clauses = [f"clause number {i}," for i in range(20)]
+
+    chunks = pack_clauses(clauses, 50)
+
+    assert all(len(chunk.text) <= 50 for chunk in chunks)
+    assert sum(chunk.clauses for chunk in chunks) == len(clauses)
+    assert " ".join(chunk.text for chunk in chunks) == " ".join(clauses)
+
+
+def test_chunk_keeps_the_punctuation_of_its_last_boundary():
+    chunks = pack_clauses(["One,", "two.", "Three,", "four;"], 10)
+
+    assert [chunk.text for chunk in chunks] == ["One, two.", "Three,", "four;"]
+
+
+def test_oversized_clause_stays_alone():
+    long_clause = "x" * 30 + ","
+
+    chunks = pack_clauses(["a,", long_clause, "b."], 10)
+
+    assert chunks == [
+        TextChunk(text="a,", clauses=1),
+        TextChunk(text=long_clause, clauses=1, fits=False),
+        TextChunk(text="b.", clauses=1),
+    ]
+
+
+def test_full_width_punctuation_is_joined_without_space():
+    chunks = pack_clauses(["你好，", "世界。", "再见。"], 82)
+
+    assert chunks == [TextChunk(text="你好，世界。再见。", clauses=3)]
+
+
+def test_blank_clauses_are_skipped():
+    assert pack_clauses(["", "  ", "Hi."], 10) == [TextChunk(text="Hi.", clauses=1)]
+    assert pack_clauses([], 10) == []
+
+
+def test_unpacked_keeps_one_chunk_per_clause():
+    assert unpacked(["Hello,", " ", "x" * 12], 10) == [
+        TextChunk(text="Hello,", clauses=1),
+        TextChunk(text="x" * 12, clauses=1, fits=False),
+    ]
@@ -0,0 +1,41 @@
+"""Tests for the per-sentence audio cache."""
+import numpy as np
+import pytest
+
+from src.tts.xtts.dto.tts_dto import TtsDto
+from src.tts.xtts.wrapper.audio.sentence_cache import SentenceAudioCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SentenceAudioCache(memory_bytes=1 << 20, disk_bytes=1 << 20, disk_dir=tmp_path)
+
+
+def test_invalidating_a_voice_keeps_voices_with_a_similar_name(cache, tmp_path):
+    dotted = cache.key_for(TtsDto(text="hi", voice="a.b", seed=1), "hi")
+    plain = cache.key_for(TtsDto(text="hi", voice="ab", seed=1), "hi")
+    cache.put(dotted, np.ones(10))
+    cache.put(plain, np.zeros(10))
+
+    cache.invalidate_voice("a.b")
+
+    assert cache.get(dotted) is None
+    assert cache.get(plain) is not None
+    # The disk entry of the other voice survives a fresh start.
+    reloaded = SentenceAudioCache(memory_bytes=0, disk_bytes=1 << 20, disk_dir=tmp_path)
+    assert reloaded.get(plain) is not None
+
+
+def test_voice_names_are_case_insensitive(cache):
+    assert cache.key_for(TtsDto(text="hi", voice="Voice"), "hi") == cache.key_for(TtsDto(text="hi", voice="voice"), "hi")
+
+
+@pytest.mark.parametrize("params, deterministic", [
+    ({}, False),
+    ({'seed': 7}, True),
+    ({'do_sample': False}, True),
+])
+def test_only_deterministic_requests_are_cacheable(params, deterministic):
+    assert TtsDto(text="hi", voice="v", **params).is_deterministic() is deterministic
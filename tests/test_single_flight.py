@@ -0,0 +1,79 @@
+"""Tests for the single-flight coalescing of synthesis requests."""
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from src.tts.xtts.engine.single_flight import SingleFlight
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+
+pytestmark = pytest.mark.unit
+
+
+def _flight():
+    single_flight = SingleFlight(poll_interval=0.01)
+    shared = Future()
+    started = []
+
+    def start(token):
+        started.append(token)
+        return shared
+
+    return single_flight, shared, started, start
+
+
+def test_callers_with_different_deadlines():
+    single_flight, shared, started, start = _flight()
+    short = single_flight.do("key", start, CancellationToken.with_timeout_ms(50))
+    long = single_flight.do("key", start, CancellationToken.with_timeout_ms(60_000))
+    assert len(started) == 1
+
+    with pytest.raises(OperationCancelledError) as error:
+        short.result(timeout=2)
+    assert error.value.deadline_exceeded
+    # The other caller still waits for the shared computation.
+    assert not long.done()
+    assert not shared.cancelled()
+    assert not started[0].cancelled
+
+    shared.set_result("audio")
+    assert long.result(timeout=2) == "audio"
+
+
+def test_caller_without_deadline_does_not_extend_the_others():
+    single_flight, shared, _, start = _flight()
+    timed = single_flight.do("key", start, CancellationToken.with_timeout_ms(50))
+    untimed = single_flight.do("key", start, CancellationToken())
+
+    with pytest.raises(OperationCancelledError):
+        timed.result(timeout=2)
+    shared.set_result("audio")
+    assert untimed.result(timeout=2) == "audio"
+
+
+def test_cancelled_token_fails_only_its_caller():
+    single_flight, shared, _, start = _flight()
+    token = CancellationToken()
+    first = single_flight.do("key", start, token)
+    second = single_flight.do("key", start, CancellationToken())
+
+    token.cancel()
+    with pytest.raises(OperationCancelledError) as error:
+        first.result(timeout=2)
+    assert not error.value.deadline_exceeded
+    assert not second.done()
+    shared.set_result("audio")
+    assert second.result(timeout=2) == "audio"
+
+
+def test_shared_computation_cancelled_once_every_caller_gave_up():
+    single_flight, shared, started, start = _flight()
+    single_flight.do("key", start, CancellationToken.with_timeout_ms(20))
+    waiter = single_flight.do("key", start, CancellationToken())
+    waiter.cancel()
+
+    deadline = time.monotonic() + 2
+    while not shared.cancelled() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert shared.cancelled()
+    assert started[0].cancelled
@@ -0,0 +1,104 @@
+"""Tests for the lease handling of the SQLite queue backend."""
+import pytest
+
+from src.queue import notifier
+from src.queue.models import QueueTask, TaskStatus, TaskType
+from src.queue.sqlite_queue import SqliteQueue
+
+pytestmark = pytest.mark.unit
+
+# A negative lease is already expired when it is granted.
+EXPIRED = -1.0
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(notifier, "_notifier_instance", notifier.QueueNotifier(tmp_path / "notify"))
+    monkeypatch.setattr(SqliteQueue, "_instance", None)
+    return SqliteQueue(str(tmp_path / "tasks.db"))
+
+
+def add(queue: SqliteQueue, text: str, parent_id: str = None) -> str:
+    task_type = TaskType.SYNTHESIS_PART if parent_id else TaskType.SYNTHESIS
+    return queue.add_task(QueueTask(task_type=task_type, payload={'text': text}, parent_id=parent_id))
+
+
+def test_claims_in_fifo_order(queue):
+    ids = [add(queue, f"task {i}") for i in range(3)]
+
+    claimed = [queue.claim_next_pending("worker", 60).id for _ in ids]
+
+    assert claimed == ids
+    assert queue.claim_next_pending("worker", 60) is None
+
+
+def test_claim_leases_and_counts_attempts(queue):
+    task_id = add(queue, "hello")
+
+    task = queue.claim_next_pending("worker-a", EXPIRED)
+    assert task.status == TaskStatus.PROCESSING.value
+    assert task.lease_owner == "worker-a"
+    assert task.attempts == 1
+
+    assert queue.reclaim_expired(max_attempts=3) == (1, 0)
+    task = queue.claim_next_pending("worker-b", 60)
+    assert task.id == task_id
+    assert task.attempts == 2
+
+
+def test_updates_of_a_stale_owner_are_rejected(queue):
+    task_id = add(queue, "hello")
+    queue.claim_next_pending("worker-a", EXPIRED)
+    queue.reclaim_expired(max_attempts=3)
+    queue.claim_next_pending("worker-b", 60)
+
+    assert not queue.heartbeat(task_id, "worker-a", 60)
+    assert not queue.update_task_status(task_id, TaskStatus.COMPLETED, owner="worker-a")
+    assert not queue.update_task_status(task_id, TaskStatus.PROCESSING, progress=50.0, owner="worker-a")
+    assert queue.get_task(task_id).lease_owner == "worker-b"
+
+    assert queue.heartbeat(task_id, "worker-b", 60)
+    assert queue.update_task_status(task_id, TaskStatus.COMPLETED, result_file="out.wav", owner="worker-b")
+    task = queue.get_task(task_id)
+    assert task.status == TaskStatus.COMPLETED.value
+    assert task.result_file == "out.wav"
+    # A finished task has no lease left to extend.
+    assert not queue.heartbeat(task_id, "worker-b", 60)
+
+
+def test_reclaim_requeues_or_dead_letters_expired_leases(queue):
+    exhausted = add(queue, "exhausted")
+    retried = add(queue, "retried")
+    leased = add(queue, "leased")
+
+    assert queue.claim_next_pending("worker", EXPIRED).id == exhausted
+    assert queue.reclaim_expired(max_attempts=2) == (1, 0)
+    assert queue.claim_next_pending("worker", EXPIRED).id == exhausted
+    assert queue.claim_next_pending("worker", EXPIRED).id == retried
+    assert queue.claim_next_pending("worker", 60).id == leased
+
+    assert queue.reclaim_expired(max_attempts=2) == (1, 1)
+
+    task = queue.get_task(exhausted)
+    assert task.status == TaskStatus.DEAD_LETTER.value
+    assert task.attempts == 2
+    assert "2 attempt(s)" in task.error_message
+    task = queue.get_task(retried)
+    assert task.status == TaskStatus.PENDING.value
+    assert task.lease_owner is None
+    # A live lease is left alone.
+    assert queue.get_task(leased).status == TaskStatus.PROCESSING.value
+    assert queue.reclaim_expired(max_attempts=2) == (0, 0)
+
+
+def test_claim_restricted_to_subtasks_of_a_parent(queue):
+    other = add(queue, "other")
+    parent = add(queue, "parent")
+    parts = [add(queue, f"part {i}", parent_id=parent) for i in range(2)]
+
+    claimed = [queue.claim_next_pending("worker", 60, parent_id=parent).id for _ in parts]
+
+    assert claimed == parts
+    assert queue.claim_next_pending("worker", 60, parent_id=parent) is None
+    assert [task.id for task in queue.get_subtasks(parent)] == parts
+    assert queue.claim_next_pending("worker", 60).id == other